@@ -0,0 +1 @@
+"""Performance benchmarks for the bot's screen detection code."""
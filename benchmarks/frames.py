@@ -0,0 +1,81 @@
+"""Synthetic screen frames for benchmarking template matching."""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+# Common capture resolutions (width, height)
+RESOLUTIONS = {
+    "1080p": (1920, 1080),
+    "1440p": (2560, 1440),
+    "4k": (3840, 2160),
+}
+
+
+def make_background(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """
+    Build a game-like background: smooth color gradients plus flat panels.
+
+    Pure noise would make every template trivially unique, so the frame is
+    made of low-frequency structure similar to a rendered UI.
+
+    Args:
+        width: Frame width in pixels
+        height: Frame height in pixels
+        seed: Random seed for reproducible frames
+
+    Returns:
+        BGR frame
+    """
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 256, size=(height // 64 + 2, width // 64 + 2, 3), dtype=np.uint8)
+    frame = cv2.resize(coarse, (width, height), interpolation=cv2.INTER_CUBIC)
+
+    for _ in range(40):
+        x, y = int(rng.integers(0, width - 50)), int(rng.integers(0, height - 50))
+        w, h = int(rng.integers(40, 400)), int(rng.integers(20, 200))
+        color = tuple(int(c) for c in rng.integers(0, 256, size=3))
+        cv2.rectangle(frame, (x, y), (min(x + w, width - 1), min(y + h, height - 1)), color, -1)
+
+    noise = rng.integers(-6, 7, size=frame.shape, dtype=np.int16)
+    return np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def place(frame: np.ndarray, template: np.ndarray, position: Tuple[int, int]) -> np.ndarray:
+    """
+    Paste a template into a frame (in place).
+
+    Args:
+        frame: BGR frame to modify
+        template: BGR template pixels
+        position: Top-left (x, y) of the pasted template
+
+    Returns:
+        The same frame, for chaining
+    """
+    x, y = position
+    height, width = template.shape[:2]
+    frame[y:y + height, x:x + width] = template
+    return frame
+
+
+def random_position(frame_size: Tuple[int, int], template: np.ndarray, seed: int = 0) -> Tuple[int, int]:
+    """
+    Pick a random top-left position where a template fits inside a frame.
+
+    Args:
+        frame_size: Frame (width, height)
+        template: Template pixels
+        seed: Random seed
+
+    Returns:
+        (x, y) position
+    """
+    rng = np.random.default_rng(seed)
+    width, height = frame_size
+    return (
+        int(rng.integers(0, width - template.shape[1])),
+        int(rng.integers(0, height - template.shape[0])),
+    )
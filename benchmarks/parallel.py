@@ -0,0 +1,103 @@
+"""
+Benchmark serial vs thread-pool template search.
+
+Compares, on synthetic frames, a single search split into bands across the
+pool and a find_many() over several templates. The parallel results must be
+identical to the serial ones; if any differs, the benchmark exits with
+status 1.
+
+Usage:
+    python -m benchmarks.parallel [--resolution 4k] [--workers 4] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+
+from benchmarks.frames import RESOLUTIONS, make_background, place, random_position
+from benchmarks.pyramid import time_call
+from benchmarks.templates import StaticCapture
+from src.utils.input import RecordingInput
+from src.utils.screen import ScreenDetector
+from src.utils.templates import TemplateBank
+
+
+# Templates looked up together by the training flow
+BATCH = ("speedup", "auto_speedup", "confirmbox", "cancel_confirm")
+
+
+def make_detector(bank: TemplateBank, frame, workers: int) -> ScreenDetector:
+    """
+    Build a detector searching a fixed frame at a locked scale, without hints.
+
+    Args:
+        bank: Template bank to use
+        frame: Frame every capture returns
+        workers: Search thread count (0 = serial)
+
+    Returns:
+        Configured ScreenDetector
+    """
+    detector = ScreenDetector(
+        templates=bank,
+        capture_backend=StaticCapture(frame),
+        input_sink=RecordingInput(),
+        search_workers=workers
+    )
+    detector.scale = 1.0
+    detector.calibration = None  # Time the search itself, not a calibrated region
+    return detector
+
+
+def main() -> int:
+    """Run the benchmark and print one row per case."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolution', choices=sorted(RESOLUTIONS), default='4k')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    size = RESOLUTIONS[args.resolution]
+    bank = TemplateBank.from_settings()
+
+    frame = make_background(*size, seed=7)
+    for index, name in enumerate(BATCH[::2]):
+        template = bank.get(name)
+        place(frame, template.color, random_position(size, template.color, seed=index))
+
+    serial = make_detector(bank, frame, 0)
+    parallel = make_detector(bank, frame, args.workers)
+
+    print(f"{args.resolution}, {args.workers} workers")
+    print(f"{'case':<24} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8} {'identical':>9}")
+
+    def run(detector, func):
+        # Forget hints so every run is a full search
+        detector.clear_hints()
+        return func(detector)
+
+    cases = [("find_many " + "+".join(BATCH), lambda d: d.find_many({name: name for name in BATCH}))]
+    for name in BATCH:
+        cases.append((f"banded {name}", lambda d, name=name: d._search(bank.get(name), 0.8, None, False)))
+
+    mismatches = []
+    for label, func in cases:
+        expected = run(serial, func)
+        actual = run(parallel, func)
+        if expected != actual:
+            mismatches.append(f"{label}: serial {expected}, parallel {actual}")
+        serial_ms = time_call(lambda: run(serial, func), args.repeat)
+        parallel_ms = time_call(lambda: run(parallel, func), args.repeat)
+        print(
+            f"{label[:24]:<24} {serial_ms:>10.1f} {parallel_ms:>12.1f} "
+            f"{serial_ms / parallel_ms:>7.1f}x {str(expected == actual):>9}"
+        )
+
+    parallel.close()
+    for mismatch in mismatches:
+        print(f"Parallel result differs from serial, {mismatch}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
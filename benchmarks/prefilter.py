@@ -0,0 +1,90 @@
+"""
+Benchmark template misses with and without the average-grid prefilter.
+
+For every Settings template, times a lookup on a synthetic frame where the
+template is absent (the common case for optional dialogs and buttons) with
+the prefilter off and on, and checks that the prefilter never hides a
+template that is present.
+
+Usage:
+    python -m benchmarks.prefilter [--resolution 1440p] [--repeat 3] [--confidence 0.8]
+"""
+
+import argparse
+import sys
+
+from benchmarks.frames import RESOLUTIONS, make_background, place, random_position
+from benchmarks.pyramid import time_call
+from benchmarks.templates import StaticCapture
+from src.utils.input import RecordingInput
+from src.utils.screen import ScreenDetector
+from src.utils.templates import TemplateBank
+
+
+def make_detector(bank: TemplateBank, frame, prefilter: bool) -> ScreenDetector:
+    """
+    Build a detector searching a fixed frame at a locked scale.
+
+    Args:
+        bank: Template bank to use
+        frame: Frame every capture returns
+        prefilter: Whether to keep the prefilter
+
+    Returns:
+        Configured ScreenDetector
+    """
+    detector = ScreenDetector(templates=bank, capture_backend=StaticCapture(frame), input_sink=RecordingInput())
+    detector.scale = 1.0
+    detector.calibration = None  # Time the search itself, not a calibrated region
+    if not prefilter:
+        detector.prefilter = None
+    return detector
+
+
+def main() -> int:
+    """Run the benchmark and print one row per template."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolution', choices=sorted(RESOLUTIONS), default='1440p')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--confidence', type=float, default=0.8)
+    args = parser.parse_args()
+
+    size = RESOLUTIONS[args.resolution]
+    bank = TemplateBank.from_settings()
+    background = make_background(*size, seed=5)
+
+    print(f"{args.resolution}, confidence {args.confidence}")
+    print(f"{'template':<16} {'miss ms':>8} {'filtered':>9} {'ratio':>6} {'skipped':>8} {'found':>6}")
+
+    missed = []
+    for index, template in enumerate(bank):
+        plain = make_detector(bank, background, prefilter=False)
+        filtered = make_detector(bank, background, prefilter=True)
+
+        def lookup(detector):
+            detector.invalidate()
+            return detector.find_on_screen(template.name, confidence=args.confidence)
+
+        plain_ms = time_call(lambda: lookup(plain), args.repeat)
+        filtered_ms = time_call(lambda: lookup(filtered), args.repeat)
+        skipped = filtered.prefilter.stats["rejected"] == filtered.prefilter.stats["checked"] > 0
+
+        # The same template pasted in must still be found
+        frame = place(background.copy(), template.color, random_position(size, template.color, seed=index))
+        found = make_detector(bank, frame, prefilter=True).find_on_screen(template.name, confidence=args.confidence)
+        if found is None:
+            missed.append(template.name)
+
+        print(
+            f"{template.name:<16} {plain_ms:>8.1f} {filtered_ms:>9.1f} "
+            f"{filtered_ms / plain_ms:>6.2f} {str(skipped):>8} {str(found is not None):>6}"
+        )
+
+    if missed:
+        print(f"Prefilter hid present templates: {', '.join(missed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
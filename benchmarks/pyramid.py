@@ -0,0 +1,70 @@
+"""
+Benchmark full-scale vs coarse-to-fine matching for large templates.
+
+Usage:
+    python -m benchmarks.pyramid [--resolution 4k] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+
+from benchmarks.frames import RESOLUTIONS, make_background, place, random_position
+from src.utils.screen import match_full, match_pyramid, pyramid_factor
+from src.utils.templates import TemplateBank
+
+
+def time_call(func, repeat: int) -> float:
+    """
+    Time a callable.
+
+    Args:
+        func: Callable to time
+        repeat: Number of runs
+
+    Returns:
+        Median run time in milliseconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    """Run the benchmark and print one row per large template."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--resolution', choices=sorted(RESOLUTIONS), default='1440p')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    size = RESOLUTIONS[args.resolution]
+    bank = TemplateBank.from_settings()
+    large = [template for template in bank if pyramid_factor(template) > 1]
+
+    print(f"{'template':<16} {'size':>9} {'factor':>6} {'full ms':>9} {'pyramid ms':>10} {'speedup':>8} {'same box':>8}")
+    for index, template in enumerate(large):
+        frame = make_background(*size, seed=index)
+        position = random_position(size, template.color, seed=index)
+        place(frame, template.color, position)
+        factor = pyramid_factor(template)
+
+        full = match_full(frame, template)
+        pyramid = match_pyramid(frame, template, factor=factor)
+        full_ms = time_call(lambda: match_full(frame, template), args.repeat)
+        pyramid_ms = time_call(lambda: match_pyramid(frame, template, factor=factor), args.repeat)
+
+        print(
+            f"{template.name:<16} {template.width:>4}x{template.height:<4} {factor:>6} "
+            f"{full_ms:>9.1f} {pyramid_ms:>10.1f} {full_ms / pyramid_ms:>7.1f}x "
+            f"{str(full[1:] == pyramid[1:] == position):>8}"
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Benchmark how long main.py takes to start, and guard its lazy imports.
+
+Each command runs in a fresh interpreter, the way cron launches the bot.
+Parsing the command line must not import OpenCV, numpy, the GUI libraries,
+asyncio, the bot or any action module; if it does, or the median of
+`main.py --help` exceeds --max-ms, the benchmark exits with status 1.
+
+Usage:
+    python -m benchmarks.startup [--repeat 10] [--max-ms 500]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Modules that only the actions themselves may load
+HEAVY_MODULES = (
+    'cv2', 'numpy', 'pyautogui', 'pygetwindow', 'pyscreeze', 'PIL', 'mss', 'asyncio',
+    'src.bot', 'src.utils.screen', 'src.actions.training', 'src.actions.healing',
+    'src.actions.helping', 'src.actions.gathering', 'src.actions.async_actions',
+)
+
+COMMANDS = {
+    'python': [sys.executable, '-c', 'pass'],
+    'import main': [sys.executable, '-c', 'import main'],
+    'main.py --help': [sys.executable, 'main.py', '--help'],
+    'import src.bot': [sys.executable, '-c', 'import src.bot'],
+}
+
+GUARD = f"""
+import sys
+import main
+main.create_parser().parse_args(['--action', 'check'])
+print(' '.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+
+def time_command(command, repeat: int) -> float:
+    """
+    Time a command in fresh processes.
+
+    Args:
+        command: Command line to run from the repository root
+        repeat: Number of runs
+
+    Returns:
+        Median wall time in milliseconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    """Run the benchmark and print one row per command."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--max-ms', type=float, default=500.0, help='Budget for the median of main.py --help')
+    args = parser.parse_args()
+
+    print(f"{'command':<16} {'median ms':>10}")
+    timings = {}
+    for name, command in COMMANDS.items():
+        timings[name] = time_command(command, args.repeat)
+        print(f"{name:<16} {timings[name]:>10.1f}")
+
+    failed = False
+    loaded = subprocess.run(
+        [sys.executable, '-c', GUARD], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.split()
+    if loaded:
+        print(f"Parsing the command line imported: {', '.join(loaded)}")
+        failed = True
+    if timings['main.py --help'] > args.max_ms:
+        print(f"main.py --help took {timings['main.py --help']:.1f} ms (budget {args.max_ms:.0f} ms)")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""
+Time template lookups for every asset in images/ on synthetic frames.
+
+Each template is pasted into a generated frame at 1080p, 1440p and 4K and
+looked up through ScreenDetector across confidence levels, grayscale on/off
+and full-window vs region search. Results are written as JSON so reports
+from different releases can be diffed.
+
+Usage:
+    python -m benchmarks.templates [--output report.json] [--repeat 3]
+        [--resolutions 1080p 4k] [--templates train confirmbox]
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from benchmarks.frames import RESOLUTIONS, make_background, place, random_position
+from config.settings import Settings
+from src.utils.capture import CaptureBackend
+from src.utils.input import RecordingInput
+from src.utils.replay import ReplayWindow, ReplayWindowManager
+from src.utils.screen import ScreenDetector
+from src.utils.templates import Template, TemplateBank
+
+
+CONFIDENCES = (0.6, 0.7, 0.8, 0.9)
+REGION_PADDING = 100
+
+
+class StaticCapture(CaptureBackend):
+    """Capture backend that always returns the same in-memory frame."""
+
+    name = "static"
+
+    def __init__(self, image: np.ndarray):
+        """Serve `image` for every grab."""
+        self.image = image
+
+    def grab(self, region=None) -> Tuple[np.ndarray, int, int]:
+        """Return the stored frame; lookups crop it themselves."""
+        return self.image, 0, 0
+
+
+def load_assets(names: Optional[List[str]] = None) -> List[Tuple[str, Template]]:
+    """
+    Load every PNG under images/ as a template.
+
+    Args:
+        names: Optional file stems to keep
+
+    Returns:
+        List of (category, template) pairs
+    """
+    bank = TemplateBank()
+    assets = []
+    for directory in (Settings.BUTTONS_DIR, Settings.DIALOGS_DIR, Settings.INDICATORS_DIR):
+        for path in sorted(Path(directory).glob("*.png")):
+            if names and path.stem not in names:
+                continue
+            assets.append((directory.name, bank.load(str(path))))
+    return assets
+
+
+def time_lookup(detector: ScreenDetector, lookup, repeat: int) -> Tuple[List[float], object]:
+    """
+    Time a lookup from a cold state (fresh frame, no location hints).
+
+    Args:
+        detector: Detector the lookup runs on
+        lookup: Callable performing one lookup
+        repeat: Number of runs
+
+    Returns:
+        Tuple of (run times in milliseconds, result of the last run)
+    """
+    samples = []
+    result = None
+    for _ in range(repeat):
+        detector.invalidate()
+        detector.clear_hints()
+        start = time.perf_counter()
+        result = lookup()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples, result
+
+
+def run(resolutions: List[str], names: Optional[List[str]], confidences: List[float], repeat: int) -> dict:
+    """
+    Run the benchmark matrix.
+
+    Args:
+        resolutions: Resolution keys from RESOLUTIONS
+        names: Optional template file stems to restrict the run to
+        confidences: Confidence levels to test
+        repeat: Runs per case
+
+    Returns:
+        Report dictionary
+    """
+    results = []
+    assets = load_assets(names)
+    for resolution in resolutions:
+        width, height = RESOLUTIONS[resolution]
+        for index, (category, template) in enumerate(assets):
+            frame = make_background(width, height, seed=index)
+            x, y = random_position((width, height), template.color, seed=index)
+            place(frame, template.color, (x, y))
+
+            window = ReplayWindowManager(ReplayWindow("benchmark", 0, 0, width, height))
+            detector = ScreenDetector(window, TemplateBank(), StaticCapture(frame), RecordingInput())
+            detector.scale = 1.0
+            detector.calibration = None  # Templates sit at random positions, outside any calibrated region
+            region = (
+                max(x - REGION_PADDING, 0),
+                max(y - REGION_PADDING, 0),
+                template.width + 2 * REGION_PADDING,
+                template.height + 2 * REGION_PADDING,
+            )
+
+            for confidence in confidences:
+                for grayscale in (False, True):
+                    lookups = {
+                        "window": (
+                            (lambda: detector.find_on_screen(template, confidence, grayscale=True))
+                            if grayscale else
+                            (lambda: detector.find_on_window(template, confidence))
+                        ),
+                        "region": lambda: detector.find_on_screen(template, confidence, region, grayscale),
+                    }
+                    for scope, lookup in lookups.items():
+                        samples, box = time_lookup(detector, lookup, repeat)
+                        results.append({
+                            "template": f"{category}/{template.name}",
+                            "size": [template.width, template.height],
+                            "resolution": resolution,
+                            "confidence": confidence,
+                            "grayscale": grayscale,
+                            "scope": scope,
+                            "median_ms": round(statistics.median(samples), 3),
+                            "min_ms": round(min(samples), 3),
+                            "found": box is not None,
+                            "correct": box is not None and (box.left, box.top) == (x, y),
+                        })
+
+            print(f"{resolution:>6} {category + '/' + template.name:<40} done", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "repeat": repeat,
+            "pyramid_enabled": Settings.PYRAMID_ENABLED,
+        },
+        "results": results,
+    }
+
+
+def main() -> int:
+    """Parse arguments, run the benchmark and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', type=str, default=None, help='Write the JSON report here (default: stdout)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case (default: 3)')
+    parser.add_argument('--resolutions', nargs='+', choices=sorted(RESOLUTIONS), default=list(RESOLUTIONS))
+    parser.add_argument('--templates', nargs='+', default=None, help='Template file stems to benchmark')
+    parser.add_argument('--confidences', nargs='+', type=float, default=list(CONFIDENCES))
+    args = parser.parse_args()
+
+    report = run(args.resolutions, args.templates, args.confidences, args.repeat)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
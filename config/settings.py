@@ -16,6 +16,7 @@ class Settings:
 
     # Game window settings
     GAME_WINDOW_TITLE = "Puzzles & Survival"
+    WINDOW_RECT_TTL = 1.0  # Seconds a cached window rect is trusted before it is re-read
 
     # Image detection confidence levels
     CONFIDENCE_HIGH = 0.9
@@ -23,11 +24,71 @@ class Settings:
     CONFIDENCE_LOW = 0.6
     CONFIDENCE_VERY_LOW = 0.4
 
-    # Timing settings (in seconds)
+    # Timing settings (in seconds), used as upper bounds for ScreenDetector.settle()
     DELAY_SHORT = 1.0
     DELAY_MEDIUM = 2.0
     DELAY_LONG = 4.0
 
+    # Screen capture settings
+    CAPTURE_BACKEND = "pyautogui"  # One of: pyautogui, mss, xshm, replay
+    CAPTURE_SOURCE = None  # Image file or directory of frames for the replay backend
+    SNAPSHOT_TTL = 0.15  # Seconds a captured frame is reused by back-to-back lookups
+    CAPTURE_WINDOW_ONLY = True  # Capture just the game window rect instead of the whole desktop
+
+    # Parallel template search on a thread pool (OpenCV releases the GIL while matching)
+    SEARCH_WORKERS = 0  # Worker threads; 0 keeps every search on the calling thread
+    SEARCH_TILE_MIN_AREA = 2_000_000  # Regions with more pixels than this are split into bands
+    SEARCH_TILES = 4  # Bands per large region, with or without workers, so results never depend on the pool
+
+    # Coarse-to-fine (pyramid) matching for large templates
+    PYRAMID_ENABLED = True
+    PYRAMID_MIN_AREA = 20000  # Templates smaller than this (in pixels) are matched at full scale
+    PYRAMID_FACTORS = (2, 4, 8)  # Candidate downscale factors for the coarse pass
+    PYRAMID_MIN_SIDE = 16  # Template short side must stay at least this long when downscaled
+    PYRAMID_CANDIDATES = 3  # Coarse positions refined at full scale
+
+    # Multi-scale templates: the window scale is detected once by a probe, then locked
+    MULTI_SCALE_ENABLED = True
+    TEMPLATE_SCALES = (0.75, 0.8, 0.9, 1.0, 1.1, 1.25, 1.5)  # Relative to the size the assets were captured at
+    SCALE_LOCK_CONFIDENCE = 0.85  # Minimum score for a match to lock the detected scale
+    SCALE_PROBE_IMAGES = None  # Templates the one-off scale probe looks for (None: every SCENES marker)
+    SCALE_PROBE_FACTOR = 2  # Downscale factor of the probe's coarse pass
+    SCALE_PROBE_RETRY = 30.0  # Seconds before a probe that found nothing is repeated
+
+    # Prefilter: coarse average-grid check that skips exact searches for absent templates
+    PREFILTER_ENABLED = True
+    PREFILTER_CELL = 4  # Cell side in pixels of the compared average grids
+    PREFILTER_THRESHOLD = 0.7  # Coarse score a template needs before it is matched exactly
+    PREFILTER_MIN_CONFIDENCE = 0.7  # Lookups with a lower confidence are never prefiltered
+    PREFILTER_MIN_CELLS = 4  # Templates with fewer cells per side are never prefiltered
+
+    # Calibration profile written by `main.py --action calibrate --frames DIR`:
+    # a search region and confidence per template, used by every ScreenDetector
+    CALIBRATION_ENABLED = True
+    CALIBRATION_PROFILE = str(BASE_DIR / "config" / "calibration.json")
+    CALIBRATION_HIT_SCORE = 0.9  # Unlabelled peaks scoring at least this count as true hits
+    CALIBRATION_MIN_HITS = 3  # Templates seen fewer times keep their default region and confidence
+    CALIBRATION_FALLBACK_MISSES = 10  # Misses in a row in a calibrated region before one lookup searches the whole window
+    CALIBRATION_MARGIN = 40  # Pixels of slack around the region a template was seen in
+
+    # Location hints: search around where a template was last found first
+    HINTS_ENABLED = True
+    HINT_HISTORY = 3  # Remembered locations per template
+    HINT_PADDING = 24  # Pixels of slack around a remembered location
+
+    # Change-driven waiting: re-match only when the watched region changes
+    CHANGE_POLL_INTERVAL = 0.05  # Seconds between cheap change checks
+    CHANGE_MIN_MATCH_INTERVAL = 0.1  # Minimum seconds between full matches on a busy screen
+    CHANGE_THUMBNAIL_FACTOR = 4  # Downscale factor of the compared thumbnails
+    CHANGE_PIXEL_DELTA = 12  # Gray-level difference that counts as a changed pixel
+    CHANGE_MIN_PIXELS = 4  # Changed thumbnail pixels needed to trigger a match
+    SETTLE_STABLE_TIME = 0.3  # settle() returns once the screen has stopped changing for this long
+    SETTLE_QUIET_TIME = 0.6  # Time settle() allows a click to change anything at all
+
+    # Multi-match search (find_all)
+    FIND_ALL_LIMIT = 50  # Maximum matches returned from one search
+    NMS_OVERLAP = 0.3  # Matches overlapping a better one by more than this (IoU) are dropped
+
     # Image file paths - Buttons
     IMAGE_TRAIN = str(BUTTONS_DIR / "train.png")
     IMAGE_CONFIRM = str(BUTTONS_DIR / "confirm.png")
@@ -61,15 +122,89 @@ class Settings:
     FIVE_MIN_CONFIDENCE = CONFIDENCE_LOW
     USE_BUTTON_CONFIDENCE = CONFIDENCE_LOW
     HELP_FULL_CONFIDENCE = CONFIDENCE_HIGH
+    HELP_ICON_CONFIDENCE = 0.8
     CLEAR_CONFIDENCE = 0.8
     PLUS_CONFIDENCE = 0.8
     HEAL_CONFIDENCE = 0.8
     LOW_LEVEL_CONFIDENCE = CONFIDENCE_VERY_LOW
 
+    # Window-relative positions, measured from the window's top-left corner
+    # at the scale the images were captured at. These used to be absolute
+    # screen coordinates; the defaults below are unchanged, which is right for
+    # a window at the desktop's top-left corner. For a window elsewhere,
+    # subtract its left edge from x and its top edge from y.
+    HELP_BUTTON_POSITION = (1229, 1317)  # Fallback click when the help button is not found
+    WORLD_BUTTON_REGION = (950, 1250, 500, 500)  # Area searched for the world map button
+
+    # World map gathering. Each dispatch step must show its effect on screen,
+    # which needs images of the tile popup's gather button and of the march
+    # screen's quick select and dispatch buttons. There are none yet: until
+    # all three are captured and set below, gather only opens the map and
+    # reports the tiles in view.
+    GATHER_TARGETS = [IMAGE_LVL6_FOOD, IMAGE_LOW_LEVEL]  # Tiles the map scanner looks for
+    GATHER_CONFIDENCE = CONFIDENCE_MEDIUM  # Minimum score of a scanned tile
+    GATHER_BUTTON_IMAGE = None  # Gather button of the tile popup, e.g. str(BUTTONS_DIR / "gather.png")
+    MARCH_QUICK_SELECT_IMAGE = None  # Quick select button of the march screen, e.g. str(BUTTONS_DIR / "quick_select.png")
+    MARCH_DISPATCH_IMAGE = None  # Dispatch button of the march screen, e.g. str(BUTTONS_DIR / "dispatch.png")
+    GATHER_PAN_DISTANCE = 600  # Pixels the map is dragged per pan (at the capture scale)
+    GATHER_MAX_PANS = 8  # Pans per run before the scanner gives up (8 covers a 3x3 block of views)
+
+    # Scene classification: markers are matched as small grayscale fingerprints
+    # in one downsampled frame. Scenes are tried in order (dialogs first, since
+    # they are drawn over the city); the first one with a visible marker wins.
+    SCENES = {
+        "confirm_box": [IMAGE_CONFIRMBOX, IMAGE_CANCEL_CONFIRM],
+        "speedup_dialog": [IMAGE_AUTO_SPEEDUP, IMAGE_FIVE_MIN],
+        "training_panel": [IMAGE_SPEEDUP],
+        "world_map": [IMAGE_LVL6_FOOD, IMAGE_LOW_LEVEL],
+        "city": [IMAGE_HELP_FULL, IMAGE_HELP, IMAGE_WORLD],
+    }
+    SCENE_FACTOR = 4  # Downscale factor of the classified frame and fingerprints
+    SCENE_CONFIDENCE = 0.8  # Fingerprint score that counts a marker as visible
+    SCENE_MIN_SIDE = 6  # Markers whose fingerprint would be smaller than this are skipped
+    SCENE_RULE_OUT_SCORE = 0.9  # A scene rules out other scenes' markers only when recognized this strongly
+    SCENE_MARGIN = 0.2  # A ruled-out marker scores this far below the confidence of its lookup
+
+    # Daemon mode (main.py --daemon): recurring jobs run from one long-lived process.
+    # 'every' is in seconds; 'when' lists templates that must be visible for the
+    # job to run (checked in one frame), otherwise it is retried next interval.
+    DAEMON_JOBS = [
+        {"action": "help", "every": 300, "priority": 1},
+        {"action": "heal", "every": 120, "priority": 2, "when": ["plus"]},
+        {"action": "train", "every": 180, "priority": 3, "when": ["train"]},
+    ]
+
+    # OCR (optional: needs pytesseract and the tesseract binary). Each region is
+    # either window-relative ("region": x, y, width, height) or relative to an
+    # anchor template's top-left corner ("anchor", "offset"), at the capture
+    # scale; "chars" restricts what tesseract may read, and "max_seconds" rejects
+    # countdowns longer than the queue can plausibly take. The offsets below are
+    # estimates of the game layout, adjust them if the reads come back empty.
+    TESSERACT_CMD = None  # Path to the tesseract binary if it is not on PATH
+    OCR_UPSCALE = 3  # Regions are enlarged this much before recognition
+    OCR_BATCH_GAP = 20  # White rows between regions stacked into one tesseract call
+    OCR_CACHE_SIZE = 256  # Recognized regions remembered by pixel hash
+    OCR_REGIONS = {
+        "training_timer": {
+            "anchor": "speedup", "offset": (-320, 0, 300, 45), "chars": "0123456789:d", "max_seconds": 24 * 3600,
+        },
+        "healing_timer": {
+            "anchor": "heal", "offset": (-320, -5, 300, 40), "chars": "0123456789:d", "max_seconds": 8 * 3600,
+        },
+    }
+    TIMER_MARGIN = 1.0  # Seconds added to a read countdown before the queue is used again
+    TIMER_RECHECK = 300  # Longest wait on a single countdown reading before it is read again
+    TIMER_TOLERANCE = 5  # Seconds a re-read countdown may differ from the first reading's projection
+    TIMER_MAX_WAIT = 4 * 3600  # Longest wait for a countdown between iterations, even once confirmed
+
     # Retry settings
     MAX_RETRIES = 3
     RETRY_DELAY = 0.5
 
+    # Timing instrumentation (capture/match/click/sleep spans per iteration)
+    PROFILE_ENABLED = False
+    PROFILE_FILE = None  # JSON-lines file each action's timing summary is appended to
+
     # Logging settings
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
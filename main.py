@@ -6,11 +6,17 @@ A game automation bot for Puzzles & Survival.
 
 import argparse
 import sys
-from typing import Optional
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
 
-from src.bot import PuzzlesSurvivalBot
+from src.actions import ACTIONS
 from src.logger import get_logger
 
+# The bot pulls in OpenCV, the capture backends and the action modules, so it
+# is only imported once an action that needs it was chosen
+if TYPE_CHECKING:
+    from src.bot import PuzzlesSurvivalBot
+
 
 def create_parser() -> argparse.ArgumentParser:
     """
@@ -28,20 +34,22 @@ Examples:
   python main.py --action help --times 3
   python main.py --action heal --times 2
   python main.py --debug
+  python main.py --action help --capture mss
+  python main.py --action train --replay recordings/train
+  python main.py --action heal --with train --watch-help
+  python main.py --action help --all-windows
+  python main.py --daemon
+  python main.py --daemon --jobs jobs.json --duration 3600
+  python main.py --action calibrate --frames recordings/train
 
 Actions:
-  train    - Train troops with speedup
-  heal     - Heal wounded troops
-  help     - Help alliance members
-  gather   - Gather resources (food)
-  check    - Check if game window is available
-        """
+""" + "\n".join(f"  {name:<10} - {description}" for name, description in ACTIONS.items())
     )
 
     parser.add_argument(
         '--action',
         type=str,
-        choices=['train', 'heal', 'help', 'gather', 'check'],
+        choices=list(ACTIONS),
         help='Action to perform'
     )
 
@@ -65,10 +73,161 @@ Actions:
         help='Game window title (default: "Puzzles & Survival")'
     )
 
+    parser.add_argument(
+        '--capture',
+        type=str,
+        default=None,
+        help='Screen capture backend: pyautogui, mss, xshm or replay (default: Settings.CAPTURE_BACKEND)'
+    )
+
+    parser.add_argument(
+        '--profile',
+        type=str,
+        nargs='?',
+        const='',
+        default=None,
+        metavar='FILE',
+        help='Record capture/match/click/sleep timings; optionally append them to FILE'
+    )
+
+    parser.add_argument(
+        '--replay',
+        type=str,
+        metavar='DIR',
+        default=None,
+        help='Run headless against recorded frames in DIR instead of the game'
+    )
+
+    parser.add_argument(
+        '--with',
+        dest='with_actions',
+        type=str,
+        nargs='+',
+        choices=['train', 'heal', 'help'],
+        default=[],
+        metavar='ACTION',
+        help='Run these actions at the same time as --action (train, heal, help)'
+    )
+
+    parser.add_argument(
+        '--windows',
+        type=str,
+        nargs='+',
+        default=None,
+        metavar='TITLE',
+        help='Drive several game windows (one title each) from this process'
+    )
+
+    parser.add_argument(
+        '--all-windows',
+        action='store_true',
+        help='Drive every window titled --window-title (e.g. several accounts)'
+    )
+
+    parser.add_argument(
+        '--watch-help',
+        action='store_true',
+        help='Click the help all button whenever it lights up while the actions run'
+    )
+
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running the recurring jobs in Settings.DAEMON_JOBS (or --jobs) instead of one action'
+    )
+
+    parser.add_argument(
+        '--jobs',
+        type=str,
+        metavar='FILE',
+        default=None,
+        help='JSON list of daemon jobs, e.g. [{"action": "help", "every": 300}]'
+    )
+
+    parser.add_argument(
+        '--duration',
+        type=float,
+        metavar='SECONDS',
+        default=None,
+        help='Stop the daemon after this many seconds (default: run until Ctrl+C)'
+    )
+
+    parser.add_argument(
+        '--frames',
+        type=str,
+        metavar='DIR',
+        default=None,
+        help='Recorded frames (PNG files) to calibrate against'
+    )
+
+    parser.add_argument(
+        '--output',
+        type=str,
+        metavar='FILE',
+        default=None,
+        help='Where to write the calibration profile (default: Settings.CALIBRATION_PROFILE)'
+    )
+
     return parser
 
 
-def run_action(bot: PuzzlesSurvivalBot, action: str, times: int) -> Optional[dict]:
+def run_daemon(bot: 'PuzzlesSurvivalBot', args) -> Dict[str, Optional[dict]]:
+    """
+    Run the configured jobs in daemon mode and report how often each ran.
+
+    Args:
+        bot: Bot instance
+        args: Parsed command-line arguments
+
+    Returns:
+        Empty dictionary (job statistics are printed here)
+    """
+    from src.utils.scheduler import load_jobs
+
+    stats = bot.run_daemon(load_jobs(args.jobs), args.duration)
+    print("\n" + "=" * 50)
+    print("Daemon jobs")
+    print("=" * 50)
+    width = max([20, *map(len, stats)])
+    print(f"{'Job':<{width}} {'Runs':>6} {'Skipped':>8} {'Failed':>7}")
+    for name, job_stats in stats.items():
+        print(f"{name:<{width}} {job_stats['runs']:>6} {job_stats['skips']:>8} {job_stats['failures']:>7}")
+    print("=" * 50 + "\n")
+    return {}
+
+
+def run_actions(bot: 'PuzzlesSurvivalBot', args) -> Dict[str, Optional[dict]]:
+    """
+    Execute the requested action, several at once on the asyncio runtime,
+    or the daemon's recurring jobs.
+
+    Args:
+        bot: Bot instance
+        args: Parsed command-line arguments
+
+    Returns:
+        Dictionary of action name (suffixed with the window name when
+        several windows are driven) to result dictionary (or None)
+    """
+    if args.daemon:
+        return run_daemon(bot, args)
+
+    actions = {name: args.times for name in [args.action, *args.with_actions]}
+    if len(bot.window_managers) > 1:
+        by_window = bot.run_on_windows(actions, watch_help=args.watch_help)
+        return {
+            f"{action} @ {window}": result
+            for window, results in by_window.items()
+            for action, result in results.items()
+        }
+
+    if not args.with_actions and not args.watch_help:
+        return {args.action: run_action(bot, args.action, args.times)}
+
+    return bot.run_concurrently(actions, watch_help=args.watch_help)
+
+
+def run_action(bot: 'PuzzlesSurvivalBot', action: str, times: int) -> Optional[dict]:
     """
     Execute a bot action.
 
@@ -114,27 +273,170 @@ def print_results(action: str, results: Optional[dict]):
     print(f"Status: {'SUCCESS' if results.get('success') else 'FAILED'}")
     print(f"Completed: {results.get('completed', 0)}")
     print(f"Failed: {results.get('failed', 0)}")
+    if 'dispatches_per_minute' in results:
+        print(f"Scans: {results['scans']}, pans: {results['pans']}")
+        if 'tiles' in results:
+            print(f"Tiles in view (no marches sent): {results['tiles']}")
+        print(f"Dispatches per minute: {results['dispatches_per_minute']:.2f}")
+
+    timings = results.get('timings')
+    if timings:
+        print("-" * 50)
+        print(f"{'Phase':<10} {'Count':>6} {'Total s':>9} {'p50 ms':>9} {'p90 ms':>9}")
+        for phase, data in sorted(timings['phases'].items()):
+            print(f"{phase:<10} {data['count']:>6} {data['total_s']:>9.2f} {data['p50_ms']:>9.1f} {data['p90_ms']:>9.1f}")
+        print(f"Iteration p50: {timings['iteration_p50_s']:.2f}s, p90: {timings['iteration_p90_s']:.2f}s")
+
     print("=" * 50 + "\n")
 
 
+def run_replay(args) -> int:
+    """
+    Run an action against a replay directory and report timing and clicks.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    from src.bot import PuzzlesSurvivalBot
+    from src.utils.replay import ReplaySession
+
+    session = ReplaySession(args.replay)
+    bot = PuzzlesSurvivalBot(
+        debug=args.debug,
+        capture_backend=session.capture,
+        window_manager=session.window_manager,
+        input_sink=session.input,
+        profile=args.profile is not None or None,
+        profile_file=args.profile or None
+    )
+
+    start = time.perf_counter()
+    results = run_actions(bot, args)
+    wall_time = time.perf_counter() - start
+    bot.shutdown()
+
+    for action, result in results.items():
+        print_results(action, result)
+    print(f"Wall time: {wall_time:.2f}s")
+    print(f"Clicks: {len(session.input.clicks)}")
+    for click in session.input.clicks:
+        print(f"  {click.time:8.3f}s  ({click.x}, {click.y})  x{click.clicks} {click.button}")
+    print(f"Frames: {' -> '.join(name for _, name in session.script.history)}")
+    return 0
+
+
+def run_calibration(args) -> int:
+    """
+    Calibrate every template against recorded frames and write the profile.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    from src.utils.calibration import calibrate
+
+    frames = args.frames or args.replay
+    if not frames:
+        print("Error: --action calibrate needs --frames DIR")
+        return 1
+
+    profile, report = calibrate(frames)
+    profile.save(args.output)
+
+    print("\n" + "=" * 72)
+    print(f"Calibration: {profile.frames} frames at scale {profile.scale}")
+    print("=" * 72)
+    print(f"{'Template':<16} {'Hits':>5} {'True min':>9} {'False max':>10} {'Confidence':>11} {'Area':>7}")
+    for row in report:
+        if not row['hits']:
+            print(f"{row['name']:<16} {0:>5} {'-':>9} {row['false_max']:>10.3f} {'not seen':>11} {'-':>7}")
+            continue
+        confidence = f"{row['confidence']:.3f}" if row['confidence'] is not None else 'overlap'
+        print(
+            f"{row['name']:<16} {row['hits']:>5} {row['true_min']:>9.3f} {row['false_max']:>10.3f} "
+            f"{confidence:>11} {row['area']:>6.1%}"
+        )
+    print("=" * 72 + "\n")
+    return 0
+
+
+def run_check(args) -> int:
+    """
+    Report whether the game window(s) can be found, without starting the bot.
+
+    Only the window utilities are imported, so a cron job polling for the
+    game stays cheap.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code (1 if a window is missing)
+    """
+    from src.utils.window import WindowManager
+
+    if args.all_windows:
+        managers: List[WindowManager] = WindowManager.for_all_windows(args.window_title)
+    else:
+        managers = [WindowManager(title) for title in args.windows or [args.window_title]]
+
+    missing = [manager.name for manager in managers if not manager.get_window()]
+    if missing or not managers:
+        print("\nError: Game window not found. Please ensure Puzzles & Survival is running.")
+        return 1
+    for manager in managers:
+        print(f"Game window found: {manager.name}")
+    return 0
+
+
 def main():
     """Main entry point for the bot."""
     parser = create_parser()
     args = parser.parse_args()
 
     # If no action specified, print help
-    if not args.action:
+    if not args.action and not args.daemon:
         parser.print_help()
         return 0
 
+    if args.capture:
+        from src.utils.capture import CAPTURE_BACKENDS
+
+        if args.capture not in CAPTURE_BACKENDS:
+            parser.error(f"argument --capture: invalid choice: '{args.capture}' (choose from {sorted(CAPTURE_BACKENDS)})")
+
     logger = get_logger()
 
     try:
+        if args.action == 'calibrate':
+            return run_calibration(args)
+
+        if args.replay:
+            return run_replay(args)
+
+        if args.action == 'check' and not args.daemon:
+            return run_check(args)
+
+        from src.bot import PuzzlesSurvivalBot
+        from src.utils.window import WindowManager
+
         # Initialize bot
         logger.info("Starting Puzzles & Survival Bot")
+        windows = args.windows
+        if args.all_windows:
+            windows = WindowManager.for_all_windows(args.window_title)
         bot = PuzzlesSurvivalBot(
             window_title=args.window_title,
-            debug=args.debug
+            debug=args.debug,
+            capture_backend=args.capture,
+            profile=args.profile is not None or None,
+            profile_file=args.profile or None,
+            windows=windows
         )
 
         # Check window availability first
@@ -143,11 +445,12 @@ def main():
             print("\nError: Game window not found. Please ensure Puzzles & Survival is running.")
             return 1
 
-        # Run the action
-        results = run_action(bot, args.action, args.times)
+        # Run the action(s)
+        results = run_actions(bot, args)
 
         # Print results
-        print_results(args.action, results)
+        for action, result in results.items():
+            print_results(action, result)
 
         # Shutdown
         bot.shutdown()
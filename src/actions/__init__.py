@@ -1,8 +1,46 @@
-"""Action modules for bot operations."""
+"""
+Action modules for bot operations.
 
-from .training import TrainingActions
-from .healing import HealingActions
-from .helping import HelpingActions
-from .gathering import GatheringActions
+The action classes are imported on first access (e.g. `from src.actions
+import TrainingActions`), so running one action never loads the others.
+ACTIONS lists the command-line actions without importing any of them.
+"""
 
-__all__ = ['TrainingActions', 'HealingActions', 'HelpingActions', 'GatheringActions']
+import importlib
+from typing import Dict
+
+# Command-line action name to description, for argument parsing and help
+ACTIONS: Dict[str, str] = {
+    'train': 'Train troops with speedup',
+    'heal': 'Heal wounded troops',
+    'help': 'Help alliance members',
+    'gather': 'Gather resources (food)',
+    'check': 'Check if game window is available',
+    'calibrate': 'Derive search regions and confidences from recorded frames',
+}
+
+# Exported class name to the module defining it
+_MODULES: Dict[str, str] = {
+    'TrainingActions': 'training',
+    'HealingActions': 'healing',
+    'HelpingActions': 'helping',
+    'GatheringActions': 'gathering',
+    'AsyncTrainingActions': 'async_actions',
+    'AsyncHealingActions': 'async_actions',
+    'AsyncHelpingActions': 'async_actions',
+}
+
+__all__ = ['ACTIONS', *_MODULES]
+
+
+def __getattr__(name: str):
+    """Import an action class the first time it is used."""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
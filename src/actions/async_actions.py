@@ -0,0 +1,144 @@
+"""
+Asyncio variants of the action classes.
+
+Each class extends its synchronous counterpart and drives the very same
+step generators (training_steps(), healing_steps(), help_steps()) on the
+AsyncScreen thread. A step (lookups, clicks and the settles after them)
+holds the input lock from start to end, so concurrent actions never click
+into each other's half-finished UI; the waits between steps are plain
+awaits, so one action can work while another waits for its queue.
+
+Timings from concurrent actions overlap, so these variants do not split
+the profiler into iterations; the runner summarizes the whole run instead.
+"""
+
+import asyncio
+
+from config.settings import Settings
+from src.logger import get_logger
+from src.utils import AsyncScreen, WindowManager
+from .healing import HealingActions
+from .helping import HelpingActions
+from .training import TrainingActions
+
+
+logger = get_logger(__name__)
+
+
+class AsyncTrainingActions(TrainingActions):
+    """Troop training on the asyncio runtime."""
+
+    def __init__(self, window_manager: WindowManager, screen: AsyncScreen):
+        """
+        Initialize async training actions.
+
+        Args:
+            window_manager: WindowManager instance
+            screen: AsyncScreen wrapping the shared ScreenDetector
+        """
+        super().__init__(window_manager, screen.screen)
+        self.aio = screen
+
+    async def train_troops(self, times: int = 1) -> dict:
+        """
+        Execute the full troop training sequence.
+
+        Args:
+            times: Number of times to repeat the training sequence
+
+        Returns:
+            Dictionary with execution statistics
+        """
+        logger.info(f"Starting troop training sequence (iterations: {times})")
+        stats = {"success": True, "completed": 0, "failed": 0}
+        await self.aio.run_steps(self.training_steps(times, stats))
+        return stats
+
+
+class AsyncHealingActions(HealingActions):
+    """Troop healing on the asyncio runtime."""
+
+    def __init__(self, window_manager: WindowManager, screen: AsyncScreen):
+        """
+        Initialize async healing actions.
+
+        Args:
+            window_manager: WindowManager instance
+            screen: AsyncScreen wrapping the shared ScreenDetector
+        """
+        super().__init__(window_manager, screen.screen)
+        self.aio = screen
+
+    async def heal_troops(self, times: int = 1) -> dict:
+        """
+        Execute the full troop healing sequence.
+
+        Args:
+            times: Number of times to repeat the healing sequence
+
+        Returns:
+            Dictionary with execution statistics
+        """
+        logger.info(f"Starting troop healing sequence (iterations: {times})")
+        stats = {"success": True, "completed": 0, "failed": 0}
+        await self.aio.run_steps(self.healing_steps(times, stats))
+        return stats
+
+
+class AsyncHelpingActions(HelpingActions):
+    """Alliance helping on the asyncio runtime."""
+
+    def __init__(self, window_manager: WindowManager, screen: AsyncScreen):
+        """
+        Initialize async helping actions.
+
+        Args:
+            window_manager: WindowManager instance
+            screen: AsyncScreen wrapping the shared ScreenDetector
+        """
+        super().__init__(window_manager, screen.screen)
+        self.aio = screen
+
+    async def complete_helps(self, times: int = 1) -> dict:
+        """
+        Click the help all button to help alliance members.
+
+        Args:
+            times: Number of times to click the help button
+
+        Returns:
+            Dictionary with execution statistics
+        """
+        logger.info(f"Starting help sequence (clicks: {times})")
+        stats = {"success": True, "completed": 0, "failed": 0}
+        await self.aio.run_steps(self.help_steps(times, stats))
+        return stats
+
+    async def watch_help_button(self, stop: asyncio.Event, interval: float = None) -> dict:
+        """
+        Click the help all button whenever it lights up, until stop is set.
+
+        Meant to run next to other actions: each check is a step of its own,
+        so it only clicks between their steps, and between checks it only
+        sleeps.
+
+        Args:
+            stop: Event that ends the watch
+            interval: Seconds between checks (defaults to Settings.DELAY_MEDIUM)
+
+        Returns:
+            Dictionary with execution statistics
+        """
+        interval = interval or Settings.DELAY_MEDIUM
+        stats = {"success": True, "completed": 0, "failed": 0}
+
+        while not stop.is_set():
+            if await self.aio.step(self.click_lit_help_button):
+                stats["completed"] += 1
+
+            try:
+                await asyncio.wait_for(stop.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+
+        return stats
@@ -1,15 +1,144 @@
 """Gathering-related actions for the bot."""
 
+import math
 import time
+from typing import Iterator, List, NamedTuple, Tuple
 
 from config.settings import Settings
 from src.logger import get_logger
-from src.utils import ScreenDetector, WindowManager
+from src.utils import Match, ScreenDetector, WindowManager
 
 
 logger = get_logger(__name__)
 
 
+class Tile(NamedTuple):
+    """A resource tile found by WorldMapScanner."""
+
+    kind: str  # Image path of the template that matched
+    match: Match
+    distance: float  # Pixels from the center of the view
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        """Screen position of the tile's center."""
+        box = self.match.box
+        return box.left + box.width // 2, box.top + box.height // 2
+
+
+def spiral_steps(count: int) -> Iterator[Tuple[int, int]]:
+    """
+    Generate unit pan directions that walk outwards in a square spiral.
+
+    Args:
+        count: Number of steps
+
+    Yields:
+        (dx, dy) steps: right, down, left, left, up, up, right, right, ...
+    """
+    directions = ((1, 0), (0, 1), (-1, 0), (0, -1))
+    produced = 0
+    leg = 1
+    turn = 0
+    while produced < count:
+        for _ in range(2):
+            dx, dy = directions[turn % 4]
+            turn += 1
+            for _ in range(leg):
+                if produced == count:
+                    return
+                yield dx, dy
+                produced += 1
+        leg += 1
+
+
+class WorldMapScanner:
+    """
+    Finds gatherable tiles in the visible part of the world map.
+
+    Each scan runs one multi-match search per Settings.GATHER_TARGETS
+    template on a single frame and returns every tile, closest to the
+    center of the view first, so several marches can be sent from one scan.
+    """
+
+    def __init__(self, screen_detector: ScreenDetector):
+        """
+        Initialize the scanner.
+
+        Args:
+            screen_detector: ScreenDetector instance
+        """
+        self.screen = screen_detector
+        self.scans = 0
+
+    def view_center(self) -> Tuple[int, int]:
+        """
+        Get the screen position of the center of the map view.
+
+        Returns:
+            Center of the game window (or of the last frame without a window)
+        """
+        rect = self.screen.window_manager.rect if self.screen.window_manager else None
+        if rect is not None:
+            return rect[0] + rect[2] // 2, rect[1] + rect[3] // 2
+        frame = self.screen.get_frame()
+        height, width = frame.raw.shape[:2]
+        return frame.left + width // 2, frame.top + height // 2
+
+    def scan(self) -> List[Tile]:
+        """
+        Find every target tile in the current view.
+
+        Tiles matched by more than one template are reported once, by the
+        best-scoring one.
+
+        Returns:
+            Tiles ranked by distance from the view center, nearest first
+        """
+        self.scans += 1
+        center_x, center_y = self.view_center()
+        tiles: List[Tile] = []
+        with self.screen.snapshot():
+            for target in Settings.GATHER_TARGETS:
+                for match in self.screen.find_all(target, confidence=Settings.GATHER_CONFIDENCE):
+                    box = match.box
+                    distance = math.hypot(box.left + box.width / 2 - center_x, box.top + box.height / 2 - center_y)
+                    tiles.append(Tile(str(target), match, distance))
+
+        kept: List[Tile] = []
+        for tile in sorted(tiles, key=lambda tile: -tile.match.score):
+            x, y = tile.center
+            if not any(_contains(other.match.box, x, y) for other in kept):
+                kept.append(tile)
+
+        kept.sort(key=lambda tile: tile.distance)
+        logger.info(f"Scan {self.scans}: {len(kept)} tiles in view")
+        return kept
+
+    def pan(self, step: Tuple[int, int]) -> bool:
+        """
+        Drag the map so the view moves one pan in a direction.
+
+        Args:
+            step: Unit direction (dx, dy) the view should move
+
+        Returns:
+            True if the drag was sent
+        """
+        scale = self.screen.scale or 1.0
+        distance = int(round(Settings.GATHER_PAN_DISTANCE * scale))
+        center_x, center_y = self.view_center()
+        # Dragging the map left moves the view right
+        end = (center_x - step[0] * distance, center_y - step[1] * distance)
+        logger.debug(f"Panning the map by {step}")
+        return self.screen.drag((center_x, center_y), end)
+
+
+def _contains(box, x: int, y: int) -> bool:
+    """Check whether a point lies inside a box."""
+    return box.left <= x < box.left + box.width and box.top <= y < box.top + box.height
+
+
 class GatheringActions:
     """Handles resource gathering operations."""
 
@@ -23,6 +152,8 @@ class GatheringActions:
         """
         self.window_manager = window_manager
         self.screen = screen_detector
+        self.profiler = screen_detector.profiler
+        self.scanner = WorldMapScanner(screen_detector)
 
     def click_world_button(self) -> bool:
         """
@@ -35,7 +166,7 @@ class GatheringActions:
         world = self.screen.find_on_screen(
             Settings.IMAGE_WORLD,
             confidence=Settings.CONFIDENCE_MEDIUM,
-            region=(950, 1250, 500, 500)  # Region from original code
+            region=self.screen.window_region(Settings.WORLD_BUTTON_REGION)
         )
 
         if world:
@@ -66,49 +197,171 @@ class GatheringActions:
             logger.warning("Low-level resource not found")
             return False
 
+    @staticmethod
+    def can_dispatch() -> bool:
+        """
+        Check whether dispatches can be confirmed.
+
+        Returns:
+            True if Settings.GATHER_BUTTON_IMAGE, MARCH_QUICK_SELECT_IMAGE and
+            MARCH_DISPATCH_IMAGE are all set
+        """
+        return bool(Settings.GATHER_BUTTON_IMAGE and Settings.MARCH_QUICK_SELECT_IMAGE and Settings.MARCH_DISPATCH_IMAGE)
+
+    def dispatch(self, tile: Tile) -> bool:
+        """
+        Send a gathering march to a tile.
+
+        Clicks the tile, the gather button in its popup, then quick select
+        and dispatch on the march screen. Every step has to show its effect:
+        the popup's gather button appears, the march screen's dispatch
+        button appears, and after dispatching the march screen is gone. The
+        map coming back alone proves nothing (closing the popup does that
+        too), so a step without a visible effect fails the dispatch.
+
+        Args:
+            tile: Tile from WorldMapScanner.scan()
+
+        Returns:
+            True if the march was sent, False otherwise (including when
+            can_dispatch() is False)
+        """
+        if not self.can_dispatch():
+            logger.error(
+                "Cannot confirm dispatches: set Settings.GATHER_BUTTON_IMAGE, "
+                "MARCH_QUICK_SELECT_IMAGE and MARCH_DISPATCH_IMAGE"
+            )
+            return False
+
+        x, y = tile.center
+        logger.info(f"Dispatching to tile at ({x}, {y}), {tile.distance:.0f}px from the center")
+        self.screen.click_position(x, y)
+        gather_button = self.screen.settle(Settings.DELAY_SHORT, expect=Settings.GATHER_BUTTON_IMAGE)
+        if gather_button is None:
+            logger.warning("Tile popup did not open")
+            return False
+
+        self.screen.click_position(
+            gather_button.left + gather_button.width // 2,
+            gather_button.top + gather_button.height // 2
+        )
+        dispatch_button = self.screen.settle(Settings.DELAY_SHORT, expect=Settings.MARCH_DISPATCH_IMAGE)
+        if dispatch_button is None:
+            logger.warning("March screen did not open (no free march?)")
+            return False
+
+        quick_select = self.screen.find_on_window(Settings.MARCH_QUICK_SELECT_IMAGE)
+        if quick_select is None:
+            logger.warning("Quick select button not found on the march screen")
+            return False
+        self.screen.click_position(
+            quick_select.left + quick_select.width // 2,
+            quick_select.top + quick_select.height // 2
+        )
+        self.screen.settle(Settings.DELAY_SHORT)
+
+        self.screen.click_position(
+            dispatch_button.left + dispatch_button.width // 2,
+            dispatch_button.top + dispatch_button.height // 2
+        )
+        self.screen.settle(Settings.DELAY_MEDIUM)
+        if self.screen.find_on_window(Settings.MARCH_DISPATCH_IMAGE) is not None:
+            logger.warning("March screen still open after dispatch (no troops selected?)")
+            return False
+        return True
+
     def gather_food(self, times: int = 1) -> dict:
         """
         Execute the food gathering sequence.
 
-        Note: This is a stub implementation. The original code had incomplete
-        logic. This method provides the framework for completing the feature.
+        Opens the world map and sends up to `times` marches. Every march
+        found in one scan is dispatched before the map is scanned again;
+        when the view has no more tiles, the map is panned outwards in a
+        spiral, up to Settings.GATHER_MAX_PANS times. While can_dispatch()
+        is False, the map is opened and scanned once, and no march is sent.
 
         Args:
-            times: Number of times to send gathering parties
+            times: Number of gathering parties to send
 
         Returns:
-            Dictionary with execution statistics
+            Dictionary with execution statistics, including scans, pans and
+            dispatches per minute (and the tiles in view when scanning only)
         """
         logger.info(f"Starting food gathering sequence (iterations: {times})")
-        logger.warning("Food gathering is not fully implemented yet")
+        self.profiler.reset()
+        dispatching = self.can_dispatch()
+        if not dispatching:
+            logger.warning(
+                "Settings.GATHER_BUTTON_IMAGE, MARCH_QUICK_SELECT_IMAGE and MARCH_DISPATCH_IMAGE "
+                "are not all set; scanning the map without sending marches"
+            )
 
         # Activate game window
         if not self.window_manager.activate_window():
             logger.error("Failed to activate game window")
             return {"success": False, "completed": 0, "failed": times}
 
-        time.sleep(Settings.DELAY_MEDIUM)
-
-        stats = {"success": False, "completed": 0, "failed": times}
-
-        # TODO: Complete implementation with the following steps:
-        # 1. Click on world map button
-        # 2. Click on magnifying glass (search)
-        # 3. Click on food icon
-        # 4. Select level
-        # 5. Click search
-        # 6. Click on the food spot
-        # 7. Click on gather button
-        # 8. Click on Quick Select
-        # 9. Click Dispatch
-
-        if self.click_world_button():
-            time.sleep(Settings.DELAY_MEDIUM)
-            logger.info("World map opened - further implementation needed")
-            # Implementation would continue here
-            stats["success"] = False
-            stats["completed"] = 0
-        else:
+        self.screen.settle(Settings.DELAY_MEDIUM)
+
+        stats = {"success": True, "completed": 0, "failed": 0, "scans": 0, "pans": 0}
+
+        if not self.click_world_button():
             logger.error("Failed to open world map")
+            return {"success": False, "completed": 0, "failed": times}
+
+        self.screen.settle(
+            Settings.DELAY_MEDIUM,
+            expect=Settings.GATHER_TARGETS,
+            confidence=Settings.GATHER_CONFIDENCE
+        )
+
+        if not dispatching:
+            tiles = self.scanner.scan()
+            for tile in tiles:
+                logger.info(f"Tile '{tile.kind}' at {tile.center}, {tile.distance:.0f}px from the center")
+            stats.update(success=False, failed=times, scans=1, tiles=len(tiles), dispatches_per_minute=0.0)
+            return stats
+
+        start = time.perf_counter()
+        pans = spiral_steps(Settings.GATHER_MAX_PANS)
+        blocked = False
+        try:
+            while stats["completed"] < times and not blocked:
+                # Every tile in this view is used before the map moves on
+                tiles = self.scanner.scan()
+                stats["scans"] += 1
+                for tile in tiles[:times - stats["completed"]]:
+                    self.profiler.begin_iteration()
+                    if self.dispatch(tile):
+                        stats["completed"] += 1
+                    else:
+                        stats["failed"] += 1
+                        blocked = True
+                        break
+
+                if stats["completed"] >= times or blocked:
+                    break
+                step = next(pans, None)
+                if step is None:
+                    logger.warning(f"No more tiles within {Settings.GATHER_MAX_PANS} pans")
+                    break
+                self.scanner.pan(step)
+                stats["pans"] += 1
+                self.screen.settle(Settings.DELAY_SHORT)
+
+        except Exception as e:
+            logger.error(f"Error during gathering: {e}")
+            stats["failed"] += 1
+
+        elapsed = time.perf_counter() - start
+        stats["dispatches_per_minute"] = round(stats["completed"] * 60 / elapsed, 2) if elapsed > 0 else 0.0
+        stats["success"] = stats["completed"] > 0
+        logger.info(
+            f"Gathering complete. Dispatched: {stats['completed']}/{times}, "
+            f"scans: {stats['scans']}, pans: {stats['pans']}, "
+            f"{stats['dispatches_per_minute']} dispatches/min"
+        )
 
+        if self.profiler.enabled:
+            stats["timings"] = self.profiler.summary()
         return stats
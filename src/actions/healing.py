@@ -1,10 +1,11 @@
 """Healing-related actions for the bot."""
 
-import time
+from typing import Iterator, Optional
 
 from config.settings import Settings
 from src.logger import get_logger
 from src.utils import ScreenDetector, WindowManager
+from src.utils.ocr import create_reader, read_duration, wait_for_timer
 
 
 logger = get_logger(__name__)
@@ -23,6 +24,8 @@ class HealingActions:
         """
         self.window_manager = window_manager
         self.screen = screen_detector
+        self.profiler = screen_detector.profiler
+        self.ocr = create_reader(screen_detector)
 
     def click_clear_button(self) -> bool:
         """
@@ -104,38 +107,53 @@ class HealingActions:
             return True
         else:
             logger.warning("Help button not found, using fallback coordinates")
-            # Fallback to hardcoded coordinates from original code
-            self.screen.click_position(1229, 1317)
+            x, y = self.screen.window_point(*Settings.HELP_BUTTON_POSITION)
+            self.screen.click_position(x, y)
             return True
 
-    def heal_troops(self, times: int = 1) -> dict:
+    def healing_time_left(self) -> Optional[int]:
         """
-        Execute the full troop healing sequence.
-
-        Args:
-            times: Number of times to repeat the healing sequence
+        Read the remaining time of the healing queue.
 
         Returns:
-            Dictionary with execution statistics
+            Remaining seconds, or None if the timer could not be read
         """
-        logger.info(f"Starting troop healing sequence (iterations: {times})")
+        return read_duration(self.ocr, "healing_timer")
 
-        # Activate game window
-        if not self.window_manager.activate_window():
-            logger.error("Failed to activate game window")
-            return {"success": False, "completed": 0, "failed": times}
+    def healing_steps(self, times: int, stats: dict) -> Iterator[float]:
+        """
+        Run the healing iterations, pausing between them.
 
-        time.sleep(Settings.DELAY_MEDIUM)
+        Every click is followed by its settle before the generator is
+        suspended, so heal_troops() and the asyncio runtime can both drive
+        it (see TrainingActions.training_steps()).
 
-        stats = {"success": True, "completed": 0, "failed": 0}
+        Args:
+            times: Number of times to repeat the healing sequence
+            stats: Statistics dictionary to update ('completed', 'failed',
+                and 'ready_in' when the last timer read succeeded)
+
+        Yields:
+            Seconds to wait while the queue is busy, then 0 as the next
+            iteration starts
+        """
+        ready_in = None
 
         for iteration in range(times):
+            if iteration:
+                if ready_in:
+                    ready_in = yield from wait_for_timer(self.healing_time_left, ready_in)
+                yield 0.0
             logger.info(f"Healing iteration {iteration + 1}/{times}")
 
             try:
                 # Click clear button (optional)
-                self.click_clear_button()
-                time.sleep(Settings.DELAY_SHORT)
+                if self.click_clear_button():
+                    self.screen.settle(
+                        Settings.DELAY_SHORT,
+                        expect=Settings.IMAGE_PLUS,
+                        confidence=Settings.PLUS_CONFIDENCE
+                    )
 
                 # Click plus button to add troops
                 if not self.click_plus_button():
@@ -143,7 +161,11 @@ class HealingActions:
                     stats["failed"] += 1
                     continue
 
-                time.sleep(Settings.DELAY_SHORT)
+                self.screen.settle(
+                    Settings.DELAY_SHORT,
+                    expect=Settings.IMAGE_HEAL,
+                    confidence=Settings.HEAL_CONFIDENCE
+                )
 
                 # Click heal button
                 if not self.click_heal_button():
@@ -151,20 +173,63 @@ class HealingActions:
                     stats["failed"] += 1
                     continue
 
-                time.sleep(Settings.DELAY_SHORT)
+                self.screen.settle(Settings.DELAY_SHORT, expect=Settings.IMAGE_HELP)
 
                 # Click help button
                 self.click_help_button()
 
-                # Wait for healing to process
-                time.sleep(Settings.DELAY_LONG)
+                # Wait for healing to process (until the screen stops changing)
+                self.screen.settle(Settings.DELAY_LONG)
 
                 stats["completed"] += 1
                 logger.info(f"Completed healing iteration {iteration + 1}/{times}")
 
+                ready_in = self.healing_time_left()
+                if ready_in and iteration + 1 < times:
+                    logger.info(f"Healing queue busy for {ready_in}s, waiting")
+
             except Exception as e:
                 logger.error(f"Error during healing iteration {iteration + 1}: {e}")
                 stats["failed"] += 1
 
+        if ready_in is not None:
+            stats["ready_in"] = ready_in
         logger.info(f"Healing sequence complete. Completed: {stats['completed']}, Failed: {stats['failed']}")
+
+    def heal_troops(self, times: int = 1) -> dict:
+        """
+        Execute the full troop healing sequence.
+
+        Args:
+            times: Number of times to repeat the healing sequence
+
+        Between iterations, when the healing timer can be read, the bot
+        sleeps until the queue is free instead of retrying straight away,
+        reading the timer again before trusting it for long (see
+        wait_for_timer()).
+
+        Returns:
+            Dictionary with execution statistics, plus 'ready_in' (seconds
+            until the queue is free) when the last timer read succeeded
+        """
+        logger.info(f"Starting troop healing sequence (iterations: {times})")
+        self.profiler.reset()
+
+        # Activate game window
+        if not self.window_manager.activate_window():
+            logger.error("Failed to activate game window")
+            return {"success": False, "completed": 0, "failed": times}
+
+        self.screen.settle(Settings.DELAY_MEDIUM)
+
+        stats = {"success": True, "completed": 0, "failed": 0}
+        self.profiler.begin_iteration()
+        for seconds in self.healing_steps(times, stats):
+            if seconds:
+                self.profiler.sleep(seconds)
+            else:
+                self.profiler.begin_iteration()
+
+        if self.profiler.enabled:
+            stats["timings"] = self.profiler.summary()
         return stats
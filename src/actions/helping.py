@@ -1,10 +1,11 @@
 """Helping-related actions for the bot."""
 
-import time
+from typing import Iterator, Optional
 
 from config.settings import Settings
 from src.logger import get_logger
 from src.utils import ScreenDetector, WindowManager
+from src.utils.screen import Box
 
 
 logger = get_logger(__name__)
@@ -23,43 +24,82 @@ class HelpingActions:
         """
         self.window_manager = window_manager
         self.screen = screen_detector
+        self.profiler = screen_detector.profiler
 
-    def complete_helps(self, times: int = 1) -> dict:
+    def click_help_icons(self) -> int:
         """
-        Click the help all button to help alliance members.
-
-        Args:
-            times: Number of times to click the help button
+        Click every individual help icon visible in one frame.
 
         Returns:
-            Dictionary with execution statistics
+            Number of help icons clicked
         """
-        logger.info(f"Starting help sequence (clicks: {times})")
+        logger.debug("Looking for individual help icons")
+        icons = self.screen.find_all(
+            Settings.IMAGE_HELP1,
+            confidence=Settings.HELP_ICON_CONFIDENCE
+        )
 
-        # Activate game window
-        if not self.window_manager.activate_window():
-            logger.error("Failed to activate game window")
-            return {"success": False, "completed": 0, "failed": times}
+        for icon in icons:
+            self.screen.click_position(icon.box.left, icon.box.top)
+            self.screen.settle(Settings.DELAY_SHORT)
 
-        time.sleep(Settings.DELAY_MEDIUM)
+        if icons:
+            logger.info(f"Clicked {len(icons)} help icons")
+        return len(icons)
 
-        stats = {"success": True, "completed": 0, "failed": 0}
+    def find_help_button(self) -> Optional[Box]:
+        """
+        Look up the help all button.
 
-        # Find the help all button
-        help_full = self.screen.find_on_window(
+        Returns:
+            Box of the button, or None if it is not lit up
+        """
+        return self.screen.find_on_window(
             Settings.IMAGE_HELP_FULL,
             confidence=Settings.HELP_FULL_CONFIDENCE
         )
 
+    def help_steps(self, times: int, stats: dict) -> Iterator[float]:
+        """
+        Click the help all button up to `times` times, pausing between clicks.
+
+        Each click is followed by its settle before the generator is
+        suspended, and the button is looked up again after every pause, so
+        nothing is clicked from a frame taken before another action used
+        the window (see TrainingActions.training_steps()).
+
+        Args:
+            times: Number of times to click the help button
+            stats: Statistics dictionary to update
+
+        Yields:
+            0 as each click after the first starts
+        """
+        help_full = self.find_help_button()
+
         if not help_full:
+            # Fall back to the individual help icons, all taken from one frame
+            clicked = self.click_help_icons()
+            if clicked:
+                logger.info("Help all button not found, clicked individual help icons instead")
+                stats["completed"] = clicked
+                return
+
             logger.error("Help all button not found")
-            return {"success": False, "completed": 0, "failed": times}
+            stats.update(success=False, failed=times)
+            return
 
         logger.info(f"Help all button found at {help_full}")
 
         # Click the help button multiple times
         try:
             for click_num in range(times):
+                if click_num:
+                    yield 0.0
+                    help_full = self.find_help_button()
+                    if not help_full:
+                        logger.info(f"Help all button went out after {click_num} clicks")
+                        break
                 logger.debug(f"Help click {click_num + 1}/{times}")
                 self.screen.click_position(
                     help_full.left,
@@ -68,7 +108,7 @@ class HelpingActions:
                     interval=Settings.DELAY_SHORT
                 )
                 stats["completed"] += 1
-                time.sleep(Settings.DELAY_SHORT)
+                self.screen.settle(Settings.DELAY_SHORT)
 
             logger.info(f"Completed help sequence: {stats['completed']} clicks")
 
@@ -77,4 +117,47 @@ class HelpingActions:
             stats["failed"] = times - stats["completed"]
             stats["success"] = False
 
+    def click_lit_help_button(self) -> bool:
+        """
+        Click the help all button once if it is lit up.
+
+        Returns:
+            True if the button was found and clicked
+        """
+        help_full = self.find_help_button()
+        if not help_full:
+            return False
+
+        self.screen.click_position(help_full.left, help_full.top)
+        logger.info("Help all button lit up, clicked it")
+        self.screen.settle(Settings.DELAY_SHORT)
+        return True
+
+    def complete_helps(self, times: int = 1) -> dict:
+        """
+        Click the help all button to help alliance members.
+
+        Args:
+            times: Number of times to click the help button
+
+        Returns:
+            Dictionary with execution statistics
+        """
+        logger.info(f"Starting help sequence (clicks: {times})")
+        self.profiler.reset()
+
+        # Activate game window
+        if not self.window_manager.activate_window():
+            logger.error("Failed to activate game window")
+            return {"success": False, "completed": 0, "failed": times}
+
+        self.screen.settle(Settings.DELAY_MEDIUM)
+
+        stats = {"success": True, "completed": 0, "failed": 0}
+        self.profiler.begin_iteration()
+        for _ in self.help_steps(times, stats):
+            self.profiler.begin_iteration()
+
+        if self.profiler.enabled:
+            stats["timings"] = self.profiler.summary()
         return stats
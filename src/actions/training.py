@@ -1,11 +1,12 @@
 """Training-related actions for the bot."""
 
-import time
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 
 from config.settings import Settings
 from src.logger import get_logger
-from src.utils import ScreenDetector, WindowManager
+from src.utils import Match, SceneClassifier, ScreenDetector, WindowManager
+from src.utils.ocr import create_reader, read_duration, wait_for_timer
+from src.utils.screen import Box
 
 
 logger = get_logger(__name__)
@@ -24,6 +25,9 @@ class TrainingActions:
         """
         self.window_manager = window_manager
         self.screen = screen_detector
+        self.profiler = screen_detector.profiler
+        self.scenes = SceneClassifier(screen_detector)
+        self.ocr = create_reader(screen_detector)
 
     def click_train_button(self) -> bool:
         """
@@ -77,43 +81,92 @@ class TrainingActions:
             logger.warning("Confirm button not found")
             return False
 
-    def handle_confirm_dialog(self) -> bool:
+    def probe_training_panel(self) -> Dict[str, Match]:
+        """
+        Check which training panel elements are visible, in one frame.
+
+        The scene is classified first, and elements it rules out are not
+        searched for.
+
+        Returns:
+            Dictionary with 'cancel_confirm' and/or 'speedup' hits
+        """
+        confidence = {
+            'cancel_confirm': Settings.CONFIDENCE_MEDIUM,
+            'speedup': Settings.SPEEDUP_CONFIDENCE,
+        }
+        with self.screen.snapshot():
+            scene = self.scenes.classify()
+            images = {
+                name: image
+                for name, image in (
+                    ('cancel_confirm', Settings.IMAGE_CANCEL_CONFIRM),
+                    ('speedup', Settings.IMAGE_SPEEDUP),
+                )
+                if scene.may_show(image, confidence[name])
+            }
+            if not images:
+                logger.debug(f"Scene '{scene.name}' shows neither the confirm dialog nor the speedup button")
+                return {}
+            return self.screen.find_many(images, confidence=confidence)
+
+    def handle_confirm_dialog(self, visible: Optional[Dict[str, Match]] = None) -> bool:
         """
         Handle the cancel/confirm dialog if it appears.
 
+        Args:
+            visible: Result of probe_training_panel() to reuse instead of
+                searching for the dialog again
+
         Returns:
             True if dialog was handled, False if no dialog found
         """
         logger.debug("Checking for confirm dialog")
-        cancel_confirm = self.screen.find_on_window(
-            Settings.IMAGE_CANCEL_CONFIRM,
-            confidence=Settings.CONFIDENCE_MEDIUM
-        )
+        if visible is not None:
+            hit = visible.get('cancel_confirm')
+            cancel_confirm = hit.box if hit else None
+        else:
+            cancel_confirm = self.screen.find_on_window(
+                Settings.IMAGE_CANCEL_CONFIRM,
+                confidence=Settings.CONFIDENCE_MEDIUM
+            )
 
         if cancel_confirm:
             logger.info("Confirm dialog detected")
-            time.sleep(Settings.DELAY_SHORT)
+            self.screen.settle(Settings.DELAY_SHORT)
             if self.click_confirm(cancel_confirm):
-                time.sleep(Settings.DELAY_SHORT)
+                self.screen.settle(
+                    Settings.DELAY_SHORT,
+                    expect=Settings.IMAGE_TRAIN,
+                    confidence=Settings.TRAIN_TROOPS_CONFIDENCE
+                )
                 self.click_train_button()
                 return True
 
         return False
 
-    def apply_speedup(self) -> bool:
+    def apply_speedup(self, visible: Optional[Dict[str, Match]] = None) -> bool:
         """
         Apply training speedup if available.
 
+        Args:
+            visible: Result of probe_training_panel() to reuse instead of
+                searching for the speedup button again
+
         Returns:
             True if speedup was successfully applied, False otherwise
         """
         logger.info("Attempting to apply speedup")
 
         # Click speedup button
-        speedup_location = self.screen.find_on_window(
-            Settings.IMAGE_SPEEDUP,
-            confidence=Settings.SPEEDUP_CONFIDENCE
-        )
+        if visible is not None:
+            hit = visible.get('speedup')
+            speedup_location = hit.box if hit else None
+        else:
+            speedup_location = self.screen.find_on_window(
+                Settings.IMAGE_SPEEDUP,
+                confidence=Settings.SPEEDUP_CONFIDENCE
+            )
 
         if not speedup_location:
             logger.warning("Speedup button not found")
@@ -121,7 +174,11 @@ class TrainingActions:
 
         self.screen.click_position(speedup_location.left, speedup_location.top)
         logger.info("Clicked speedup button")
-        time.sleep(Settings.DELAY_SHORT)
+        self.screen.settle(
+            Settings.DELAY_SHORT,
+            expect=Settings.IMAGE_AUTO_SPEEDUP,
+            confidence=Settings.AUTO_SPEEDUP_CONFIDENCE
+        )
 
         # Click auto speedup
         auto_speedup = self.screen.find_on_window(
@@ -135,37 +192,88 @@ class TrainingActions:
 
         self.screen.click_position(auto_speedup.left, auto_speedup.top)
         logger.info("Clicked auto speedup button")
-        time.sleep(Settings.DELAY_SHORT)
-
-        # Handle confirmbox with checkbox
-        confirmbox = self.screen.find_on_window(
-            Settings.IMAGE_CONFIRMBOX,
+        self.screen.settle(
+            Settings.DELAY_SHORT,
+            expect=Settings.IMAGE_CONFIRMBOX,
             confidence=Settings.CONFIRMBOX_CONFIDENCE
         )
 
+        # Handle confirmbox with checkbox
+        confirmbox, checkbox = self.find_confirmbox()
+
         if confirmbox:
             logger.info("Confirmbox detected")
             # Click checkbox
-            checkbox = self.screen.find_on_screen(
-                Settings.IMAGE_CHECKBOX,
-                confidence=Settings.CHECKBOX_CONFIDENCE,
-                region=(confirmbox.left, confirmbox.top, confirmbox.width, confirmbox.height)
-            )
-
             if checkbox:
                 self.screen.click_position(checkbox.left, checkbox.top)
                 logger.info("Clicked checkbox")
-                time.sleep(Settings.DELAY_SHORT)
+                self.screen.settle(Settings.DELAY_SHORT)
 
             # Click confirm in confirmbox
             self.click_confirm(confirmbox)
-            time.sleep(Settings.DELAY_SHORT)
+            self.screen.settle(
+                Settings.DELAY_SHORT,
+                expect=Settings.IMAGE_FIVE_MIN,
+                confidence=Settings.FIVE_MIN_CONFIDENCE
+            )
 
         # Use 5-minute speedup if available
         self.use_five_minute_speedup()
 
         return True
 
+    def find_confirmbox(self) -> Tuple[Optional[Box], Optional[Box]]:
+        """
+        Look up the speedup confirmbox and its checkbox in the same frame.
+
+        Returns:
+            Tuple of (confirmbox, checkbox) boxes, None where not found
+        """
+        with self.screen.snapshot():
+            scene = self.scenes.classify()
+            if not scene.may_show(Settings.IMAGE_CONFIRMBOX, Settings.CONFIRMBOX_CONFIDENCE):
+                logger.debug(f"Scene '{scene.name}' has no confirmbox")
+                return None, None
+
+            confirmbox = self.screen.find_on_window(
+                Settings.IMAGE_CONFIRMBOX,
+                confidence=Settings.CONFIRMBOX_CONFIDENCE
+            )
+
+            checkbox = None
+            if confirmbox:
+                checkbox = self.screen.find_on_screen(
+                    Settings.IMAGE_CHECKBOX,
+                    confidence=Settings.CHECKBOX_CONFIDENCE,
+                    region=(confirmbox.left, confirmbox.top, confirmbox.width, confirmbox.height)
+                )
+
+        return confirmbox, checkbox
+
+    def find_five_minute_speedup(self) -> Tuple[Optional[Box], Optional[Box]]:
+        """
+        Look up the 5-minute speedup item and its 'Use' button in the same frame.
+
+        Returns:
+            Tuple of (item, use button) boxes, None where not found
+        """
+        with self.screen.snapshot():
+            fivemin = self.screen.find_on_window(
+                Settings.IMAGE_FIVE_MIN,
+                confidence=Settings.FIVE_MIN_CONFIDENCE
+            )
+
+            use_button = None
+            if fivemin:
+                # Look for 'Use' button within the fivemin area
+                use_button = self.screen.find_on_screen(
+                    Settings.IMAGE_USE,
+                    confidence=Settings.USE_BUTTON_CONFIDENCE,
+                    region=(fivemin.left, fivemin.top, fivemin.width, fivemin.height)
+                )
+
+        return fivemin, use_button
+
     def use_five_minute_speedup(self) -> bool:
         """
         Use 5-minute speedup item if available.
@@ -174,20 +282,10 @@ class TrainingActions:
             True if 5-minute speedup was used, False otherwise
         """
         logger.debug("Checking for 5-minute speedup")
-        fivemin = self.screen.find_on_window(
-            Settings.IMAGE_FIVE_MIN,
-            confidence=Settings.FIVE_MIN_CONFIDENCE
-        )
+        fivemin, use_button = self.find_five_minute_speedup()
 
         if fivemin:
             logger.info("5-minute speedup found")
-            # Look for 'Use' button within the fivemin area
-            use_button = self.screen.find_on_screen(
-                Settings.IMAGE_USE,
-                confidence=Settings.USE_BUTTON_CONFIDENCE,
-                region=(fivemin.left, fivemin.top, fivemin.width, fivemin.height)
-            )
-
             if use_button:
                 self.screen.click_position(use_button.left, use_button.top)
                 logger.info("Used 5-minute speedup")
@@ -195,28 +293,40 @@ class TrainingActions:
 
         return False
 
-    def train_troops(self, times: int = 1) -> dict:
+    def training_time_left(self) -> Optional[int]:
         """
-        Execute the full troop training sequence.
-
-        Args:
-            times: Number of times to repeat the training sequence
+        Read the remaining time of the training queue.
 
         Returns:
-            Dictionary with execution statistics
+            Remaining seconds, or None if the timer could not be read
         """
-        logger.info(f"Starting troop training sequence (iterations: {times})")
+        return read_duration(self.ocr, "training_timer")
 
-        # Activate game window
-        if not self.window_manager.activate_window():
-            logger.error("Failed to activate game window")
-            return {"success": False, "completed": 0, "failed": times}
+    def training_steps(self, times: int, stats: dict) -> Iterator[float]:
+        """
+        Run the training iterations, pausing between them.
 
-        time.sleep(Settings.DELAY_MEDIUM)
+        The code between two yields is one step: every click in it is
+        followed by its settle, so the UI is idle whenever the generator is
+        suspended. train_troops() drives it on the calling thread; the
+        asyncio runtime lets other actions use the window between steps.
 
-        stats = {"success": True, "completed": 0, "failed": 0}
+        Args:
+            times: Number of times to repeat the training sequence
+            stats: Statistics dictionary to update ('completed', 'failed',
+                and 'ready_in' when the last timer read succeeded)
+
+        Yields:
+            Seconds to wait while the queue is busy, then 0 as the next
+            iteration starts
+        """
+        ready_in = None
 
         for iteration in range(times):
+            if iteration:
+                if ready_in:
+                    ready_in = yield from wait_for_timer(self.training_time_left, ready_in)
+                yield 0.0
             logger.info(f"Training iteration {iteration + 1}/{times}")
 
             try:
@@ -226,22 +336,81 @@ class TrainingActions:
                     stats["failed"] += 1
                     continue
 
-                time.sleep(Settings.DELAY_SHORT)
+                self.screen.settle(
+                    Settings.DELAY_SHORT,
+                    expect=(Settings.IMAGE_CANCEL_CONFIRM, Settings.IMAGE_SPEEDUP)
+                )
+
+                # Look for the confirm dialog and the speedup button together
+                visible = self.probe_training_panel()
 
                 # Handle confirm dialog if present
-                self.handle_confirm_dialog()
-                time.sleep(Settings.DELAY_SHORT)
+                if self.handle_confirm_dialog(visible):
+                    # The dialog changed the screen, so search for speedup again
+                    visible = None
+                    self.screen.settle(
+                        Settings.DELAY_SHORT,
+                        expect=Settings.IMAGE_SPEEDUP,
+                        confidence=Settings.SPEEDUP_CONFIDENCE
+                    )
 
                 # Apply speedup
-                self.apply_speedup()
-                time.sleep(Settings.DELAY_SHORT)
+                self.apply_speedup(visible)
+                self.screen.settle(
+                    Settings.DELAY_SHORT,
+                    expect=Settings.IMAGE_TRAIN,
+                    confidence=Settings.TRAIN_TROOPS_CONFIDENCE
+                )
 
                 stats["completed"] += 1
                 logger.info(f"Completed training iteration {iteration + 1}/{times}")
 
+                ready_in = self.training_time_left()
+                if ready_in and iteration + 1 < times:
+                    logger.info(f"Training queue busy for {ready_in}s, waiting")
+
             except Exception as e:
                 logger.error(f"Error during training iteration {iteration + 1}: {e}")
                 stats["failed"] += 1
 
+        if ready_in is not None:
+            stats["ready_in"] = ready_in
         logger.info(f"Training sequence complete. Completed: {stats['completed']}, Failed: {stats['failed']}")
+
+    def train_troops(self, times: int = 1) -> dict:
+        """
+        Execute the full troop training sequence.
+
+        Args:
+            times: Number of times to repeat the training sequence
+
+        Between iterations, when the training timer can be read, the bot
+        sleeps until the queue is free instead of retrying straight away,
+        reading the timer again before trusting it for long (see
+        wait_for_timer()).
+
+        Returns:
+            Dictionary with execution statistics, plus 'ready_in' (seconds
+            until the queue is free) when the last timer read succeeded
+        """
+        logger.info(f"Starting troop training sequence (iterations: {times})")
+        self.profiler.reset()
+
+        # Activate game window
+        if not self.window_manager.activate_window():
+            logger.error("Failed to activate game window")
+            return {"success": False, "completed": 0, "failed": times}
+
+        self.screen.settle(Settings.DELAY_MEDIUM)
+
+        stats = {"success": True, "completed": 0, "failed": 0}
+        self.profiler.begin_iteration()
+        for seconds in self.training_steps(times, stats):
+            if seconds:
+                self.profiler.sleep(seconds)
+            else:
+                self.profiler.begin_iteration()
+
+        if self.profiler.enabled:
+            stats["timings"] = self.profiler.summary()
         return stats
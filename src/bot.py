@@ -1,9 +1,19 @@
 """Main bot class that coordinates all actions."""
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+import src.actions
 from config.settings import Settings
 from src.logger import get_logger, setup_logger
-from src.utils import WindowManager, ScreenDetector
-from src.actions import TrainingActions, HealingActions, HelpingActions, GatheringActions
+from src.utils import WindowManager, ScreenDetector, TemplateBank, CaptureBackend, create_capture_backend
+from src.utils.input import InputSink, PyAutoGUIInput
+from src.utils.profiling import create_profiler
+
+if TYPE_CHECKING:
+    from src.actions import GatheringActions, HealingActions, HelpingActions, TrainingActions
+    from src.utils.async_screen import AsyncScreen
+    from src.utils.scheduler import Job
 
 
 logger = get_logger(__name__)
@@ -12,13 +22,35 @@ logger = get_logger(__name__)
 class PuzzlesSurvivalBot:
     """Main bot class for Puzzles & Survival automation."""
 
-    def __init__(self, window_title: str = None, debug: bool = False):
+    def __init__(
+        self,
+        window_title: str = None,
+        debug: bool = False,
+        capture_backend: Union[str, CaptureBackend, None] = None,
+        window_manager: Optional[WindowManager] = None,
+        input_sink: Optional[InputSink] = None,
+        profile: Optional[bool] = None,
+        profile_file: Optional[str] = None,
+        windows: Optional[List[Union[str, WindowManager]]] = None
+    ):
         """
         Initialize the bot.
 
         Args:
             window_title: Title of the game window (defaults to Settings)
             debug: Enable debug logging
+            capture_backend: Screen capture backend or backend name (defaults
+                to Settings)
+            window_manager: Custom WindowManager (e.g. for replay), replaces
+                the one built from window_title
+            input_sink: Custom input sink (e.g. a recorder), defaults to real
+                pyautogui input
+            profile: Record per-phase timings (defaults to Settings.PROFILE_ENABLED)
+            profile_file: JSON-lines file for timing summaries (defaults to
+                Settings.PROFILE_FILE)
+            windows: Several game windows (titles or WindowManagers) to drive
+                from this process; the first one is used by the single-window
+                actions
         """
         # Setup logging
         log_level = "DEBUG" if debug else Settings.LOG_LEVEL
@@ -34,32 +66,90 @@ class PuzzlesSurvivalBot:
                 logger.error(f"  - {error}")
             raise RuntimeError("Bot initialization failed due to configuration errors")
 
-        # Initialize core components
-        self.window_manager = WindowManager(window_title)
-        self.screen_detector = ScreenDetector(self.window_manager)
+        # Decode every template once so lookups never touch the disk
+        self.templates = TemplateBank.from_settings()
 
-        # Initialize action modules
-        self.training = TrainingActions(self.window_manager, self.screen_detector)
-        self.healing = HealingActions(self.window_manager, self.screen_detector)
-        self.helping = HelpingActions(self.window_manager, self.screen_detector)
-        self.gathering = GatheringActions(self.window_manager, self.screen_detector)
+        # Initialize core components, shared by every game window
+        if isinstance(capture_backend, CaptureBackend):
+            self.capture_backend = capture_backend
+        else:
+            self.capture_backend = create_capture_backend(capture_backend)
+        self.profiler = create_profiler(profile, profile_file)
+        self.input = input_sink or PyAutoGUIInput()
+
+        # One detector per window: frame cache, hints and scale are per window
+        if windows:
+            self.window_managers = [
+                window if isinstance(window, WindowManager) else WindowManager(window)
+                for window in windows
+            ]
+        else:
+            self.window_managers = [window_manager or WindowManager(window_title)]
+        self.screen_detectors = [
+            ScreenDetector(manager, self.templates, self.capture_backend, self.input, self.profiler)
+            for manager in self.window_managers
+        ]
+        self.window_manager = self.window_managers[0]
+        self.screen_detector = self.screen_detectors[0]
+
+        # Action modules are imported and created on first use
+        self._actions: Dict[Tuple[str, int], object] = {}
 
         logger.info("Bot initialized successfully")
 
+    def _action(self, class_name: str, window: int = 0):
+        """
+        Get an action instance for a window, creating it on first use.
+
+        Args:
+            class_name: Action class exported by src.actions
+            window: Index of the window in window_managers
+
+        Returns:
+            The action instance
+        """
+        key = (class_name, window)
+        if key not in self._actions:
+            action_class = getattr(src.actions, class_name)
+            self._actions[key] = action_class(self.window_managers[window], self.screen_detectors[window])
+        return self._actions[key]
+
+    @property
+    def training(self) -> 'TrainingActions':
+        """Training actions of the first window."""
+        return self._action('TrainingActions')
+
+    @property
+    def healing(self) -> 'HealingActions':
+        """Healing actions of the first window."""
+        return self._action('HealingActions')
+
+    @property
+    def helping(self) -> 'HelpingActions':
+        """Helping actions of the first window."""
+        return self._action('HelpingActions')
+
+    @property
+    def gathering(self) -> 'GatheringActions':
+        """Gathering actions of the first window."""
+        return self._action('GatheringActions')
+
     def check_game_window(self) -> bool:
         """
-        Check if the game window is available.
+        Check if the game window (every one, when driving several) is available.
 
         Returns:
-            True if window is found, False otherwise
+            True if all windows are found, False otherwise
         """
-        window = self.window_manager.get_window()
-        if window:
-            logger.info(f"Game window found: {window.title}")
-            return True
-        else:
-            logger.error("Game window not found. Is the game running?")
-            return False
+        found = True
+        for window_manager in self.window_managers:
+            window = window_manager.get_window()
+            if window:
+                logger.info(f"Game window found: {window.title}")
+            else:
+                logger.error(f"Game window '{window_manager.name}' not found. Is the game running?")
+                found = False
+        return found
 
     def train_troops(self, times: int = 1) -> dict:
         """
@@ -72,7 +162,9 @@ class PuzzlesSurvivalBot:
             Dictionary with execution statistics
         """
         logger.info(f"Starting train troops action ({times} times)")
-        return self.training.train_troops(times)
+        results = self.training.train_troops(times)
+        self.profiler.dump("train")
+        return results
 
     def heal_troops(self, times: int = 1) -> dict:
         """
@@ -85,7 +177,9 @@ class PuzzlesSurvivalBot:
             Dictionary with execution statistics
         """
         logger.info(f"Starting heal troops action ({times} times)")
-        return self.healing.heal_troops(times)
+        results = self.healing.heal_troops(times)
+        self.profiler.dump("heal")
+        return results
 
     def help_alliance(self, times: int = 1) -> dict:
         """
@@ -98,7 +192,9 @@ class PuzzlesSurvivalBot:
             Dictionary with execution statistics
         """
         logger.info(f"Starting help alliance action ({times} times)")
-        return self.helping.complete_helps(times)
+        results = self.helping.complete_helps(times)
+        self.profiler.dump("help")
+        return results
 
     def gather_resources(self, times: int = 1) -> dict:
         """
@@ -111,7 +207,232 @@ class PuzzlesSurvivalBot:
             Dictionary with execution statistics
         """
         logger.info(f"Starting gather resources action ({times} times)")
-        return self.gathering.gather_food(times)
+        results = self.gathering.gather_food(times)
+        self.profiler.dump("gather")
+        return results
+
+    def run_daemon(self, jobs: List['Job'], duration: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Run recurring jobs until interrupted or `duration` seconds have passed.
+
+        Everything stays loaded between jobs: decoded templates, locked
+        template scale, location hints, the cached window rect and the
+        capture backend, so only the first run of each action pays for
+        warming them up. Before a job's `when` templates are checked (all
+        in one frame), its window is brought to the front and given time
+        to redraw. With several windows, every job is scheduled once per
+        window.
+
+        Args:
+            jobs: Jobs to run
+            duration: Optional run time limit in seconds
+
+        Returns:
+            Dictionary of job name (suffixed with the window name when
+            several windows are driven) to {'runs', 'skips', 'failures'}
+
+        Raises:
+            ValueError: If a job names an unknown action
+        """
+        from src.utils.scheduler import Job, JobScheduler
+
+        actions = {
+            'train': ('TrainingActions', 'train_troops'),
+            'heal': ('HealingActions', 'heal_troops'),
+            'help': ('HelpingActions', 'complete_helps'),
+            'gather': ('GatheringActions', 'gather_food'),
+        }
+        unknown = {job.action for job in jobs} - set(actions)
+        if unknown:
+            raise ValueError(f"Unknown job actions: {sorted(unknown)}")
+
+        # Job to the index of the window it runs in
+        targets: Dict[Job, int] = {}
+        for window, window_manager in enumerate(self.window_managers):
+            for job in jobs:
+                if len(self.window_managers) > 1:
+                    job = Job(
+                        job.action, job.every, job.times, job.priority, job.when,
+                        name=f"{job.name} @ {window_manager.name}"
+                    )
+                targets[job] = window
+
+        def ready(job: 'Job') -> bool:
+            if not job.when:
+                return True
+            window = targets[job]
+            if not self.window_managers[window].activate_window():
+                logger.warning(f"Could not activate the window of job '{job.name}' to check {list(job.when)}")
+                return False
+            detector = self.screen_detectors[window]
+            wanted = {name: name for name in job.when}
+            detector.settle(Settings.DELAY_SHORT, expect=job.when)
+            return len(detector.find_many(wanted)) == len(wanted)
+
+        def run(job: 'Job') -> dict:
+            class_name, method = actions[job.action]
+            logger.info(f"Starting {job.action} ({job.times} times) for job '{job.name}'")
+            results = getattr(self._action(class_name, targets[job]), method)(job.times)
+            self.profiler.dump(job.name)
+            return results
+
+        scheduler = JobScheduler(list(targets), run, ready)
+        try:
+            scheduler.run(duration)
+        except KeyboardInterrupt:
+            logger.info("Daemon stopped by user")
+        stats = scheduler.stats()
+        logger.info(f"Daemon job stats: {stats}")
+        return stats
+
+    def run_concurrently(self, actions: Dict[str, int], watch_help: bool = False) -> Dict[str, dict]:
+        """
+        Run several actions at once on an asyncio event loop.
+
+        Each action step (its lookups, clicks and the settles after them)
+        runs on one screen thread holding a shared input lock, so steps
+        never interleave; the waits between steps are plain awaits, so one
+        action works while another waits for its queue.
+
+        Args:
+            actions: Mapping of action name ('train', 'heal' or 'help') to
+                number of iterations
+            watch_help: Also click the help all button whenever it lights
+                up, until the other actions finish
+
+        Returns:
+            Dictionary of action name to execution statistics (plus
+            'help_watch' when watch_help is set)
+
+        Raises:
+            ValueError: If an action has no async variant
+        """
+        results = self._run_async(actions, watch_help, self.screen_detectors[:1], "concurrent")
+        return next(iter(results.values()))
+
+    def run_on_windows(self, actions: Dict[str, int], watch_help: bool = False) -> Dict[str, Dict[str, dict]]:
+        """
+        Run the same actions in every game window at once.
+
+        All windows share the templates, the capture backend and one screen
+        thread, and take turns through a single input lock, one action step
+        at a time. A window is brought to the front before a step only when
+        the previous step ran elsewhere. Windows must not overlap, since each one is
+        captured from its own screen rect.
+
+        Args:
+            actions: Mapping of action name ('train', 'heal' or 'help') to
+                number of iterations, run in each window
+            watch_help: Also watch the help all button in each window
+
+        Returns:
+            Dictionary of window name to that window's action statistics
+
+        Raises:
+            ValueError: If an action has no async variant
+        """
+        return self._run_async(actions, watch_help, self.screen_detectors, "windows")
+
+    def _run_async(
+        self,
+        actions: Dict[str, int],
+        watch_help: bool,
+        detectors: List[ScreenDetector],
+        label: str
+    ) -> Dict[str, Dict[str, dict]]:
+        """
+        Run actions in the given windows on a fresh event loop.
+
+        Args:
+            actions: Mapping of action name to number of iterations
+            watch_help: Also watch the help all button in each window
+            detectors: ScreenDetectors of the windows to run in
+            label: Label for the profile dump
+
+        Returns:
+            Dictionary of window name to that window's action statistics
+        """
+        import asyncio
+
+        unknown = set(actions) - {'train', 'heal', 'help'}
+        if unknown:
+            raise ValueError(f"No async variant for actions: {sorted(unknown)}")
+
+        logger.info(f"Starting {actions} in {len(detectors)} window(s) (watch help: {watch_help})")
+        self.profiler.reset()
+        executor = ThreadPoolExecutor(1, thread_name_prefix="screen")
+        try:
+            results = asyncio.run(self._run_windows(actions, watch_help, detectors, executor))
+        finally:
+            executor.shutdown()
+        self.profiler.dump(label)
+        return results
+
+    async def _run_windows(
+        self,
+        actions: Dict[str, int],
+        watch_help: bool,
+        detectors: List[ScreenDetector],
+        executor: ThreadPoolExecutor
+    ) -> Dict[str, Dict[str, dict]]:
+        """Event-loop body of _run_async(): one task per window."""
+        import asyncio
+        from src.utils.async_screen import AsyncScreen, InputLock
+
+        input_lock = InputLock()
+        screens = [AsyncScreen(detector, input_lock, executor) for detector in detectors]
+        outcomes = await asyncio.gather(*(self._run_window(screen, actions, watch_help) for screen in screens))
+
+        results = {}
+        for screen, outcome in zip(screens, outcomes):
+            name = screen.screen.window_manager.name
+            if name in results:
+                name = f"{name} #{len(results) + 1}"
+            results[name] = outcome
+        return results
+
+    async def _run_window(self, screen: 'AsyncScreen', actions: Dict[str, int], watch_help: bool) -> Dict[str, dict]:
+        """
+        Run the actions concurrently in one window.
+
+        Args:
+            screen: AsyncScreen of the window
+            actions: Mapping of action name to number of iterations
+            watch_help: Also watch the help all button
+
+        Returns:
+            Dictionary of action name to execution statistics
+        """
+        import asyncio
+        from src.actions.async_actions import AsyncHealingActions, AsyncHelpingActions, AsyncTrainingActions
+
+        window_manager = screen.screen.window_manager
+        helping = AsyncHelpingActions(window_manager, screen)
+        runners = {
+            'train': AsyncTrainingActions(window_manager, screen).train_troops,
+            'heal': AsyncHealingActions(window_manager, screen).heal_troops,
+            'help': helping.complete_helps,
+        }
+
+        async with screen.input_lock:
+            activated = await screen.run(window_manager.activate_window)
+            if activated:
+                screen.input_lock.focused = window_manager
+        if not activated:
+            logger.error(f"Failed to activate game window '{window_manager.name}'")
+            return {name: {"success": False, "completed": 0, "failed": times} for name, times in actions.items()}
+        await screen.settle(Settings.DELAY_MEDIUM)
+
+        stop = asyncio.Event()
+        watcher = asyncio.create_task(helping.watch_help_button(stop)) if watch_help else None
+        try:
+            outcomes = await asyncio.gather(*(runners[name](times) for name, times in actions.items()))
+        finally:
+            stop.set()
+        results = dict(zip(actions, outcomes))
+        if watcher:
+            results['help_watch'] = await watcher
+        return results
 
     def get_mouse_position(self):
         """Get current mouse position (useful for development/debugging)."""
@@ -130,4 +451,15 @@ class PuzzlesSurvivalBot:
     def shutdown(self):
         """Clean shutdown of the bot."""
         logger.info("Shutting down bot")
+        for detector in self.screen_detectors:
+            prefix = f"[{detector.window_manager.name}] " if len(self.screen_detectors) > 1 else ""
+            hint_stats = detector.get_hint_stats()["total"]
+            logger.info(f"{prefix}Location hints: {hint_stats['hits']} hits, {hint_stats['misses']} misses")
+            if detector.scale is not None:
+                logger.info(f"{prefix}Template scale: {detector.scale}")
+            if detector.prefilter is not None:
+                prefilter_stats = detector.prefilter.stats
+                logger.info(f"{prefix}Prefilter: {prefilter_stats['rejected']} of {prefilter_stats['checked']} searches skipped")
+            detector.close()
+        self.capture_backend.close()
         # Add any cleanup code here if needed
@@ -49,7 +49,8 @@ def setup_logger(
         log_file = Path(Settings.LOG_FILE)
         log_file.parent.mkdir(parents=True, exist_ok=True)
 
-        file_handler = logging.FileHandler(Settings.LOG_FILE, encoding='utf-8')
+        # Opened on the first record, so loggers cost nothing until used
+        file_handler = logging.FileHandler(Settings.LOG_FILE, encoding='utf-8', delay=True)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
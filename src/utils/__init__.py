@@ -1,6 +1,45 @@
-"""Utility modules for the bot."""
+"""
+Utility modules for the bot.
 
-from .window import WindowManager
-from .screen import ScreenDetector
+Names are imported from their modules on first access, so e.g. using
+WindowManager does not load OpenCV.
+"""
 
-__all__ = ['WindowManager', 'ScreenDetector']
+import importlib
+from typing import Dict
+
+# Exported name to the module defining it
+_MODULES: Dict[str, str] = {
+    'WindowManager': 'window',
+    'ScreenDetector': 'screen',
+    'Match': 'screen',
+    'Template': 'templates',
+    'TemplateBank': 'templates',
+    'PrefilterIndex': 'prefilter',
+    'CalibrationProfile': 'calibration',
+    'CaptureBackend': 'capture',
+    'create_capture_backend': 'capture',
+    'AsyncScreen': 'async_screen',
+    'InputLock': 'async_screen',
+    'OCRReader': 'ocr',
+    'Scene': 'scenes',
+    'SceneClassifier': 'scenes',
+    'Job': 'scheduler',
+    'JobScheduler': 'scheduler',
+    'load_jobs': 'scheduler',
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    """Import an exported name the first time it is used."""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(__all__)
@@ -0,0 +1,219 @@
+"""Awaitable screen detection for the asyncio action runtime."""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.logger import get_logger
+from src.utils.screen import Box, Match, ScreenDetector
+from src.utils.templates import Template
+from src.utils.window import WindowManager
+
+
+logger = get_logger(__name__)
+
+
+class InputLock:
+    """
+    The single mouse and foreground window, shared by every action and game window.
+
+    Holding the lock gives exclusive use of the mouse and of the game UI.
+    AsyncScreen.step() holds it for a whole action step, from its first
+    lookup to the settle after its last click, so another action's click
+    never lands between a step's lookup and its own click. The lock also
+    remembers which window was last brought to the front, so a step only
+    pays for activating a window when the previous one ran in another.
+    """
+
+    def __init__(self):
+        """Initialize the lock with no window focused."""
+        self._lock = asyncio.Lock()
+        self.focused: Optional[WindowManager] = None
+
+    async def __aenter__(self):
+        await self._lock.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self._lock.release()
+        return False
+
+
+class AsyncScreen:
+    """
+    Run a ScreenDetector's captures and matches off the event loop.
+
+    ScreenDetector keeps a frame cache and location hints that are not
+    thread-safe, and capture backends may not be either, so every call goes
+    through one worker thread (shared by all AsyncScreens given the same
+    executor). Anything that clicks runs as a step(), holding input_lock;
+    the lookups below are read-only. Coroutines waiting between steps in
+    sleep() do not hold the thread or the lock, which is what lets one
+    action work while another waits for its queue.
+    """
+
+    def __init__(
+        self,
+        screen: ScreenDetector,
+        input_lock: Optional[InputLock] = None,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        """
+        Initialize the async front end.
+
+        Args:
+            screen: ScreenDetector to drive
+            input_lock: Lock serializing mouse input (a new one by default;
+                share one between AsyncScreens that drive the same mouse)
+            executor: Single-thread executor screen calls run on (a new one
+                by default; share one between AsyncScreens that share a
+                capture backend)
+        """
+        self.screen = screen
+        self.profiler = screen.profiler
+        self.input_lock = input_lock or InputLock()
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(1, thread_name_prefix="screen")
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Call a function on the screen thread.
+
+        Args:
+            func: Callable to run (usually a ScreenDetector method)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def find_on_window(
+        self,
+        image: Union[str, Template],
+        confidence: float = None,
+        limit: Optional[Box] = None
+    ) -> Optional[Box]:
+        """Awaitable ScreenDetector.find_on_window()."""
+        return await self.run(self.screen.find_on_window, image, confidence, limit)
+
+    async def find_on_screen(
+        self,
+        image: Union[str, Template],
+        confidence: float = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False
+    ) -> Optional[Box]:
+        """Awaitable ScreenDetector.find_on_screen()."""
+        return await self.run(self.screen.find_on_screen, image, confidence, region, grayscale)
+
+    async def find_many(
+        self,
+        images: Dict[str, Union[str, Template]],
+        confidence: Union[float, Dict[str, float]] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False
+    ) -> Dict[str, Match]:
+        """Awaitable ScreenDetector.find_many()."""
+        return await self.run(self.screen.find_many, images, confidence, region, grayscale)
+
+    async def find_all(
+        self,
+        image: Union[str, Template],
+        confidence: float = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Match]:
+        """Awaitable ScreenDetector.find_all()."""
+        return await self.run(self.screen.find_all, image, confidence, region, grayscale, limit)
+
+    async def step(self, func, *args, **kwargs):
+        """
+        Run one action step on the screen thread, holding input_lock.
+
+        The detector's game window is activated first if the previous step
+        ran in a different window.
+
+        Args:
+            func: Callable that finds, clicks and settles
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Whatever func returns
+        """
+        async with self.input_lock:
+            window_manager = self.screen.window_manager
+            if window_manager is not None and self.input_lock.focused is not window_manager:
+                if await self.run(window_manager.activate_window):
+                    self.input_lock.focused = window_manager
+            return await self.run(func, *args, **kwargs)
+
+    async def run_steps(self, steps: Iterator[float]):
+        """
+        Drive an action's step generator (e.g. TrainingActions.training_steps()).
+
+        The code between two yields runs as one step(); the yielded wait is
+        slept with the lock released, so other actions can use the window.
+
+        Args:
+            steps: Generator yielding seconds to wait between steps
+        """
+        while True:
+            seconds = await self.step(next, steps, None)
+            if seconds is None:
+                return
+            if seconds:
+                await self.sleep(seconds)
+            else:
+                await asyncio.sleep(0)
+
+    async def settle(
+        self,
+        timeout: float,
+        expect: Union[str, Template, Sequence[Union[str, Template]], None] = None,
+        confidence: float = None,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[Box]:
+        """
+        Awaitable ScreenDetector.settle().
+
+        Each poll runs on the screen thread; the time between polls is an
+        asyncio sleep, so other actions can use the screen meanwhile.
+
+        Returns:
+            Box of the first expected template found, or None
+        """
+        start = time.perf_counter()
+        try:
+            settler = await self.run(self.screen.settler, timeout, expect, confidence, region)
+            if settler is None:
+                return None
+            while True:
+                done, box = await self.run(settler.poll)
+                if done:
+                    return box
+                await asyncio.sleep(settler.next_delay())
+        finally:
+            self.profiler.record("settle", time.perf_counter() - start)
+
+    async def sleep(self, seconds: float):
+        """
+        Sleep without blocking other actions, recorded as the 'sleep' phase.
+
+        Args:
+            seconds: Time to sleep in seconds
+        """
+        start = time.perf_counter()
+        await asyncio.sleep(seconds)
+        self.profiler.record("sleep", time.perf_counter() - start)
+
+    def close(self):
+        """Shut down the screen thread, unless it was passed in."""
+        if self._owns_executor:
+            self._executor.shutdown()
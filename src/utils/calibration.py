@@ -0,0 +1,275 @@
+"""Per-template search regions and confidences derived from recorded frames."""
+
+import json
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config.settings import Settings
+from src.logger import get_logger
+from src.utils.templates import Template, TemplateBank
+
+
+logger = get_logger(__name__)
+
+Region = Tuple[int, int, int, int]
+
+
+class Calibration(NamedTuple):
+    """Calibrated search settings of one template."""
+
+    region: Optional[Region]  # Window-relative, at the scale the images were captured at
+    confidence: Optional[float]  # None if true and false hits could not be separated
+
+
+def profile_key(template: Template) -> str:
+    """
+    Get the key a template is stored under in a calibration profile.
+
+    Args:
+        template: Template at any scale
+
+    Returns:
+        Image path relative to Settings.IMAGES_DIR (the full path for
+        images outside it), so the key does not depend on template names
+    """
+    path = Path(template.path)
+    try:
+        return path.resolve().relative_to(Path(Settings.IMAGES_DIR).resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+class CalibrationProfile:
+    """
+    Search regions and confidences per template, as written by calibrate().
+
+    ScreenDetector loads Settings.CALIBRATION_PROFILE when it exists and
+    searches a calibrated template inside its region (the whole requested
+    region only after Settings.CALIBRATION_FALLBACK_MISSES misses in a row),
+    with its confidence as a floor under the one a color lookup asked for.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, dict]] = None, scale: float = 1.0, frames: int = 0):
+        """
+        Initialize the profile.
+
+        Args:
+            entries: Mapping of profile_key() to entry dictionaries with
+                'region', 'confidence' and the statistics they came from
+            scale: Template scale the recorded frames were drawn at
+            frames: Number of frames the profile was computed from
+        """
+        self.entries = entries or {}
+        self.scale = scale
+        self.frames = frames
+        self._lookups: Dict[str, Optional[Calibration]] = {}
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> Optional['CalibrationProfile']:
+        """
+        Load a profile from a JSON file.
+
+        Args:
+            path: Profile file (defaults to Settings.CALIBRATION_PROFILE)
+
+        Returns:
+            CalibrationProfile, or None if the file does not exist or cannot
+            be read
+        """
+        path = Path(path or Settings.CALIBRATION_PROFILE)
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            profile = cls(data["templates"], data.get("scale", 1.0), data.get("frames", 0))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring calibration profile '{path}': {e}")
+            return None
+
+        logger.info(f"Loaded calibration for {len(profile)} templates from '{path}'")
+        return profile
+
+    def save(self, path: Optional[str] = None):
+        """
+        Write the profile as JSON.
+
+        Args:
+            path: Profile file (defaults to Settings.CALIBRATION_PROFILE)
+        """
+        path = Path(path or Settings.CALIBRATION_PROFILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"scale": self.scale, "frames": self.frames, "templates": self.entries}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        logger.info(f"Wrote calibration for {len(self)} templates to '{path}'")
+
+    def get(self, template: Template) -> Optional[Calibration]:
+        """
+        Get the calibrated settings of a template.
+
+        Args:
+            template: Template at any scale
+
+        Returns:
+            Calibration, or None if the template was not calibrated
+        """
+        if template.path not in self._lookups:
+            entry = self.entries.get(profile_key(template))
+            calibration = None
+            if entry is not None:
+                region = entry.get("region")
+                calibration = Calibration(tuple(region) if region else None, entry.get("confidence"))
+            self._lookups[template.path] = calibration
+        return self._lookups[template.path]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def recorded_window(directory: Path, width: int, height: int) -> Tuple[str, Region]:
+    """
+    Get the window rect the frames of a directory were recorded with.
+
+    Args:
+        directory: Frames directory, optionally with a replay script.json
+        width: Width of the first frame
+        height: Height of the first frame
+
+    Returns:
+        Tuple of (title, (left, top, width, height)); without a script the
+        whole frame is the window
+    """
+    window = {}
+    script_path = directory / "script.json"
+    if script_path.exists():
+        with open(script_path, encoding="utf-8") as f:
+            window = json.load(f).get("window", {})
+    rect = (window.get("left", 0), window.get("top", 0), window.get("width", width), window.get("height", height))
+    return window.get("title", "Calibration"), rect
+
+
+def calibrate(directory: str, templates: Optional[TemplateBank] = None) -> Tuple[CalibrationProfile, List[dict]]:
+    """
+    Derive a search region and confidence for every template from recorded frames.
+
+    Every template is matched over the whole window of every frame. Peaks
+    scoring at least Settings.CALIBRATION_HIT_SCORE are true hits, unless
+    the directory has a labels.json ({"frame": ["template name", ...]}),
+    in which case the best peak of a listed template is a true hit too and
+    an unlisted template has none in that frame. Templates with fewer than
+    Settings.CALIBRATION_MIN_HITS true hits are left uncalibrated. The
+    region is the smallest box around all true hits plus
+    Settings.CALIBRATION_MARGIN, and the confidence lies halfway between
+    the weakest true hit and the best false one.
+
+    Args:
+        directory: Directory of PNG frames (a replay directory works)
+        templates: Templates to calibrate (defaults to every Settings image)
+
+    Returns:
+        Tuple of (profile, report rows with name, hits, true_min,
+        false_max, confidence and area, the region's share of the window)
+
+    Raises:
+        FileNotFoundError: If the directory holds no readable frames
+    """
+    # Imported here: screen.py loads profiles from this module
+    from src.utils.capture import ReplayCapture
+    from src.utils.input import RecordingInput
+    from src.utils.replay import ReplayWindow, ReplayWindowManager
+    from src.utils.screen import ScreenDetector, match_all
+
+    directory = Path(directory)
+    capture = ReplayCapture(str(directory))
+    bank = templates or TemplateBank.from_settings()
+    labels = {}
+    labels_path = directory / "labels.json"
+    if labels_path.exists():
+        with open(labels_path, encoding="utf-8") as f:
+            labels = json.load(f)
+
+    first = capture.frames[capture.names[0]]
+    title, rect = recorded_window(directory, first.shape[1], first.shape[0])
+    detector = ScreenDetector(
+        window_manager=ReplayWindowManager(ReplayWindow(title, *rect)),
+        templates=bank,
+        capture_backend=capture,
+        input_sink=RecordingInput()
+    )
+    detector.calibration = None
+
+    # Lock the scale the frames were drawn at, probing frames until one shows it
+    for name in capture.names:
+        if detector.scale is not None or not Settings.MULTI_SCALE_ENABLED:
+            break
+        capture.show(name)
+        detector.invalidate()
+        detector.reset_scale()
+        detector.detect_scale()
+    scale = detector.scale or 1.0
+    if detector.scale is None and Settings.MULTI_SCALE_ENABLED:
+        logger.warning("No template matched confidently enough to detect the scale, assuming 1.0")
+
+    entries = {}
+    report = []
+    for template in bank:
+        scaled = template.scaled(scale)
+        true_scores: List[float] = []
+        false_max = 0.0
+        bounds = None
+        for name in capture.names:
+            capture.show(name)
+            detector.invalidate()
+            haystack, offset_x, offset_y = detector.get_frame().crop(rect)
+            peaks = match_all(haystack, scaled, 0.0)
+            listed = template.name in labels[name] if name in labels else None
+            for index, (score, x, y) in enumerate(peaks):
+                if (score >= Settings.CALIBRATION_HIT_SCORE and listed is not False) or (listed and index == 0):
+                    true_scores.append(score)
+                    left, top = offset_x + x - rect[0], offset_y + y - rect[1]
+                    box = (left, top, left + scaled.width, top + scaled.height)
+                    bounds = box if bounds is None else (
+                        min(bounds[0], box[0]), min(bounds[1], box[1]), max(bounds[2], box[2]), max(bounds[3], box[3])
+                    )
+                else:
+                    false_max = max(false_max, score)
+
+        row = {"name": template.name, "hits": len(true_scores), "false_max": round(false_max, 3)}
+        if len(true_scores) < Settings.CALIBRATION_MIN_HITS:
+            logger.warning(
+                f"'{template.name}' was seen {len(true_scores)} times, fewer than "
+                f"{Settings.CALIBRATION_MIN_HITS}; leaving it uncalibrated"
+            )
+            report.append(row)
+            continue
+
+        true_min = min(true_scores)
+        confidence = round((true_min + false_max) / 2, 3) if true_min > false_max else None
+        if confidence is None:
+            logger.warning(
+                f"'{template.name}': a false hit ({false_max:.2f}) scores as high as a true one ({true_min:.2f})"
+            )
+
+        # Stored at the scale the images were captured at, like every Settings region
+        margin = Settings.CALIBRATION_MARGIN * scale
+        left, top = max(bounds[0] - margin, 0), max(bounds[1] - margin, 0)
+        right, bottom = min(bounds[2] + margin, rect[2]), min(bounds[3] + margin, rect[3])
+        region = [int(left / scale), int(top / scale), int(round((right - left) / scale)), int(round((bottom - top) / scale))]
+
+        entries[profile_key(template)] = {
+            "region": region,
+            "confidence": confidence,
+            "hits": len(true_scores),
+            "true_min": round(true_min, 3),
+            "false_max": round(false_max, 3),
+        }
+        row.update(
+            true_min=round(true_min, 3),
+            confidence=confidence,
+            area=(right - left) * (bottom - top) / (rect[2] * rect[3])
+        )
+        report.append(row)
+
+    detector.close()
+    return CalibrationProfile(entries, scale, len(capture.names)), report
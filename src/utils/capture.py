@@ -0,0 +1,395 @@
+"""Screen capture backends."""
+
+import ctypes
+import ctypes.util
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Type
+
+import cv2
+import numpy as np
+
+from config.settings import Settings
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+Region = Tuple[int, int, int, int]
+
+
+class CaptureBackend:
+    """
+    Base class for screen capture backends.
+
+    grab() returns a NumPy array in BGR or BGRA channel order. Backends
+    that own their pixel buffers hand out views over them and reuse them on
+    later grabs, so a grabbed array is only guaranteed to stay valid until
+    the grab after next.
+    """
+
+    name = "base"
+
+    def grab(self, region: Optional[Region] = None) -> Tuple[np.ndarray, int, int]:
+        """
+        Capture the screen.
+
+        Args:
+            region: Region to capture (x, y, width, height), or None for the
+                primary screen
+
+        Returns:
+            Tuple of (pixels, screen x, screen y) of the captured area
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class PyAutoGUICapture(CaptureBackend):
+    """Capture through pyautogui/pyscreeze (portable, but copies via PIL)."""
+
+    name = "pyautogui"
+
+    def grab(self, region: Optional[Region] = None) -> Tuple[np.ndarray, int, int]:
+        """Capture the screen with pyautogui.screenshot()."""
+        import pyautogui
+
+        screenshot = pyautogui.screenshot(region=region)
+        image = cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
+        left, top = (region[0], region[1]) if region else (0, 0)
+        return image, left, top
+
+
+class MSSCapture(CaptureBackend):
+    """Capture through the mss library (fast on Windows, macOS and X11)."""
+
+    name = "mss"
+
+    def __init__(self):
+        """
+        Initialize the mss capture backend.
+
+        Raises:
+            ImportError: If mss is not installed
+        """
+        import mss
+
+        self._mss = mss.mss()
+
+    def grab(self, region: Optional[Region] = None) -> Tuple[np.ndarray, int, int]:
+        """Capture the screen with mss, returning a BGRA view of its buffer."""
+        if region:
+            monitor = {"left": region[0], "top": region[1], "width": region[2], "height": region[3]}
+        else:
+            monitor = self._mss.monitors[1]
+
+        shot = self._mss.grab(monitor)
+        image = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return image, monitor["left"], monitor["top"]
+
+    def close(self):
+        """Close the mss handle."""
+        self._mss.close()
+
+
+class _XImage(ctypes.Structure):
+    """Prefix of Xlib's XImage struct, up to the fields we read."""
+
+    _fields_ = [
+        ("width", ctypes.c_int),
+        ("height", ctypes.c_int),
+        ("xoffset", ctypes.c_int),
+        ("format", ctypes.c_int),
+        ("data", ctypes.c_void_p),
+        ("byte_order", ctypes.c_int),
+        ("bitmap_unit", ctypes.c_int),
+        ("bitmap_bit_order", ctypes.c_int),
+        ("bitmap_pad", ctypes.c_int),
+        ("depth", ctypes.c_int),
+        ("bytes_per_line", ctypes.c_int),
+        ("bits_per_pixel", ctypes.c_int),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    """Xlib's XShmSegmentInfo struct."""
+
+    _fields_ = [
+        ("shmseg", ctypes.c_ulong),
+        ("shmid", ctypes.c_int),
+        ("shmaddr", ctypes.c_void_p),
+        ("readOnly", ctypes.c_int),
+    ]
+
+
+class XShmCapture(CaptureBackend):
+    """
+    Capture an X11 display through the MIT shared-memory extension.
+
+    The X server writes pixels straight into shared memory segments that
+    are allocated once per capture size, and grab() returns a NumPy view
+    over them, so no pixel data is copied on our side. Two segments are
+    used alternately so the previous frame stays readable while the next
+    one is captured.
+    """
+
+    name = "xshm"
+
+    _ZPIXMAP = 2
+    _IPC_PRIVATE = 0
+    _IPC_CREAT = 0o1000
+    _IPC_RMID = 0
+    _ALL_PLANES = ctypes.c_ulong(-1)
+
+    def __init__(self, display: Optional[str] = None):
+        """
+        Open the X display and check for the shared-memory extension.
+
+        Args:
+            display: X display name (defaults to $DISPLAY)
+
+        Raises:
+            OSError: If Xlib/Xext cannot be loaded, the display cannot be
+                opened or it lacks the MIT-SHM extension
+        """
+        self._xlib = self._load_library("X11")
+        self._xext = self._load_library("Xext")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._declare_functions()
+
+        self._display = self._xlib.XOpenDisplay(display.encode() if display else None)
+        if not self._display:
+            raise OSError(f"Cannot open X display {display or '$DISPLAY'}")
+        if not self._xext.XShmQueryExtension(self._display):
+            self._xlib.XCloseDisplay(self._display)
+            raise OSError("X server does not support the MIT-SHM extension")
+
+        screen = self._xlib.XDefaultScreen(self._display)
+        self._root = self._xlib.XRootWindow(self._display, screen)
+        self._visual = self._xlib.XDefaultVisual(self._display, screen)
+        self._depth = self._xlib.XDefaultDepth(self._display, screen)
+        self._screen_size = (
+            self._xlib.XDisplayWidth(self._display, screen),
+            self._xlib.XDisplayHeight(self._display, screen),
+        )
+        self._images: Dict[Tuple[int, int], List[tuple]] = {}
+        self._turn = 0
+
+    @staticmethod
+    def _load_library(name: str) -> ctypes.CDLL:
+        """Load a shared library by short name."""
+        path = ctypes.util.find_library(name)
+        if not path:
+            raise OSError(f"Library lib{name} not found")
+        return ctypes.CDLL(path)
+
+    def _declare_functions(self):
+        """Declare the argument and return types of the X functions we call."""
+        xlib, xext, libc = self._xlib, self._xext, self._libc
+        xlib.XOpenDisplay.restype = ctypes.c_void_p
+        xlib.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        xlib.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        xlib.XDefaultScreen.argtypes = [ctypes.c_void_p]
+        xlib.XRootWindow.restype = ctypes.c_ulong
+        xlib.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultVisual.restype = ctypes.c_void_p
+        xlib.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        xlib.XDestroyImage.argtypes = [ctypes.POINTER(_XImage)]
+
+        xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int,
+            ctypes.c_char_p, ctypes.POINTER(_XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint,
+        ]
+        xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XImage),
+            ctypes.c_int, ctypes.c_int, ctypes.c_ulong,
+        ]
+
+        libc.shmget.restype = ctypes.c_int
+        libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+        libc.shmat.restype = ctypes.c_void_p
+        libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+        libc.shmdt.argtypes = [ctypes.c_void_p]
+        libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+
+    def _create_image(self, width: int, height: int) -> tuple:
+        """
+        Allocate a shared-memory XImage and a NumPy view over its pixels.
+
+        Args:
+            width: Image width in pixels
+            height: Image height in pixels
+
+        Returns:
+            Tuple of (XImage pointer, segment info, BGRA array view)
+        """
+        info = _XShmSegmentInfo()
+        image = self._xext.XShmCreateImage(
+            self._display, self._visual, self._depth, self._ZPIXMAP, None, ctypes.byref(info), width, height
+        )
+        if not image:
+            raise OSError("XShmCreateImage failed")
+        if image.contents.bits_per_pixel != 32:
+            self._xlib.XDestroyImage(image)
+            raise OSError(f"Unsupported X visual: {image.contents.bits_per_pixel} bits per pixel")
+
+        stride = image.contents.bytes_per_line
+        size = stride * height
+        info.shmid = self._libc.shmget(self._IPC_PRIVATE, size, self._IPC_CREAT | 0o600)
+        if info.shmid < 0:
+            self._xlib.XDestroyImage(image)
+            raise OSError(ctypes.get_errno(), "shmget failed")
+
+        address = self._libc.shmat(info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            self._libc.shmctl(info.shmid, self._IPC_RMID, None)
+            self._xlib.XDestroyImage(image)
+            raise OSError(ctypes.get_errno(), "shmat failed")
+
+        info.shmaddr = address
+        info.readOnly = 0
+        image.contents.data = address
+        self._xext.XShmAttach(self._display, ctypes.byref(info))
+        self._xlib.XSync(self._display, 0)
+        # Mark for removal now; the segment lives until the last detach
+        self._libc.shmctl(info.shmid, self._IPC_RMID, None)
+
+        buffer = (ctypes.c_uint8 * size).from_address(address)
+        view = np.frombuffer(buffer, dtype=np.uint8).reshape(height, stride // 4, 4)[:, :width]
+        return image, info, view
+
+    def grab(self, region: Optional[Region] = None) -> Tuple[np.ndarray, int, int]:
+        """
+        Capture the screen into shared memory and return a BGRA view of it.
+
+        The region is clipped to the screen first, since XShmGetImage fails
+        (through the X error handler) for areas outside the root window. A
+        region entirely off-screen captures the whole screen instead.
+        """
+        screen_width, screen_height = self._screen_size
+        left, top, width, height = region or (0, 0, screen_width, screen_height)
+        right, bottom = min(left + width, screen_width), min(top + height, screen_height)
+        left, top = max(left, 0), max(top, 0)
+        if right <= left or bottom <= top:
+            logger.debug(f"Region {region} is off-screen, capturing the whole screen")
+            left, top, right, bottom = 0, 0, screen_width, screen_height
+        width, height = right - left, bottom - top
+
+        key = (width, height)
+        if key not in self._images:
+            self._images[key] = [self._create_image(width, height) for _ in range(2)]
+
+        self._turn ^= 1
+        image, _, view = self._images[key][self._turn]
+        if not self._xext.XShmGetImage(self._display, self._root, image, left, top, self._ALL_PLANES):
+            raise OSError(f"XShmGetImage failed for region {(left, top, width, height)}")
+        return view, left, top
+
+    def close(self):
+        """Detach all shared memory segments and close the display."""
+        for images in self._images.values():
+            for image, info, _ in images:
+                self._xext.XShmDetach(self._display, ctypes.byref(info))
+                self._xlib.XDestroyImage(image)
+                self._libc.shmdt(info.shmaddr)
+        self._images.clear()
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            self._display = None
+
+
+class ReplayCapture(CaptureBackend):
+    """Serve previously recorded frames from image files instead of the screen."""
+
+    name = "replay"
+
+    def __init__(self, source: Optional[str] = None):
+        """
+        Load the recorded frames.
+
+        Args:
+            source: Image file or directory of PNG files (defaults to
+                Settings.CAPTURE_SOURCE). Frames are served in file name order.
+
+        Raises:
+            FileNotFoundError: If the source holds no readable images
+        """
+        source = source or Settings.CAPTURE_SOURCE
+        if not source:
+            raise FileNotFoundError("No replay source set (Settings.CAPTURE_SOURCE)")
+
+        source = Path(source)
+        paths = sorted(source.glob("*.png")) if source.is_dir() else [source]
+        self.frames: Dict[str, np.ndarray] = {}
+        for path in paths:
+            image = cv2.imdecode(np.fromfile(str(path), dtype=np.uint8), cv2.IMREAD_COLOR) if path.is_file() else None
+            if image is not None:
+                self.frames[path.stem] = image
+
+        if not self.frames:
+            raise FileNotFoundError(f"No replay frames found in '{source}'")
+
+        self.names = list(self.frames)
+        self.current = self.names[0]
+        logger.info(f"Loaded {len(self.frames)} replay frames from '{source}'")
+
+    def show(self, name: str):
+        """
+        Make a recorded frame the one returned by grab().
+
+        Args:
+            name: Frame name (file stem)
+        """
+        if name not in self.frames:
+            raise KeyError(f"Unknown replay frame: {name}")
+        self.current = name
+
+    def advance(self):
+        """Move to the next recorded frame, wrapping around at the end."""
+        index = self.names.index(self.current)
+        self.current = self.names[(index + 1) % len(self.names)]
+
+    def grab(self, region: Optional[Region] = None) -> Tuple[np.ndarray, int, int]:
+        """Return a view of the current recorded frame."""
+        image = self.frames[self.current]
+        if not region:
+            return image, 0, 0
+
+        left, top, width, height = region
+        return image[max(top, 0):top + height, max(left, 0):left + width], max(left, 0), max(top, 0)
+
+
+CAPTURE_BACKENDS: Dict[str, Type[CaptureBackend]] = {
+    backend.name: backend for backend in (PyAutoGUICapture, MSSCapture, XShmCapture, ReplayCapture)
+}
+
+
+def create_capture_backend(name: Optional[str] = None) -> CaptureBackend:
+    """
+    Create a capture backend by name.
+
+    Args:
+        name: Backend name (see CAPTURE_BACKENDS), defaults to
+            Settings.CAPTURE_BACKEND
+
+    Returns:
+        Ready-to-use CaptureBackend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = name or Settings.CAPTURE_BACKEND
+    if name not in CAPTURE_BACKENDS:
+        raise ValueError(f"Invalid capture backend: {name}. Must be one of {list(CAPTURE_BACKENDS)}")
+
+    logger.info(f"Using '{name}' capture backend")
+    return CAPTURE_BACKENDS[name]()
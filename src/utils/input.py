@@ -0,0 +1,125 @@
+"""Mouse input sinks."""
+
+import time
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from config.settings import Settings
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class InputSink:
+    """Base class for everything that can receive the bot's clicks."""
+
+    def click(self, x: int, y: int, clicks: int = 1, interval: float = 0.0, button: str = 'left'):
+        """
+        Click at a screen position.
+
+        Args:
+            x: X coordinate
+            y: Y coordinate
+            clicks: Number of clicks
+            interval: Interval between clicks
+            button: Mouse button to click ('left', 'right', 'middle')
+        """
+        raise NotImplementedError
+
+    def drag(self, start: Tuple[int, int], end: Tuple[int, int], duration: float = 0.3):
+        """
+        Press the left button at one position and release it at another.
+
+        Args:
+            start: Screen (x, y) where the button is pressed
+            end: Screen (x, y) where it is released
+            duration: Seconds the movement takes
+        """
+        raise NotImplementedError
+
+    def position(self) -> Tuple[int, int]:
+        """
+        Get the current mouse position.
+
+        Returns:
+            Tuple of (x, y) coordinates
+        """
+        raise NotImplementedError
+
+
+class PyAutoGUIInput(InputSink):
+    """Send real mouse input through pyautogui."""
+
+    def __init__(self):
+        """Initialize pyautogui with the safety settings from Settings."""
+        import pyautogui
+
+        self._pyautogui = pyautogui
+        pyautogui.FAILSAFE = Settings.FAILSAFE
+        pyautogui.PAUSE = Settings.PAUSE
+
+    def click(self, x: int, y: int, clicks: int = 1, interval: float = 0.0, button: str = 'left'):
+        """Click with pyautogui.click()."""
+        self._pyautogui.click(x, y, clicks=clicks, interval=interval, button=button)
+
+    def drag(self, start: Tuple[int, int], end: Tuple[int, int], duration: float = 0.3):
+        """Drag with pyautogui.moveTo() and dragTo()."""
+        self._pyautogui.moveTo(*start)
+        self._pyautogui.dragTo(*end, duration=duration, button='left')
+
+    def position(self) -> Tuple[int, int]:
+        """Get the mouse position from pyautogui."""
+        return tuple(self._pyautogui.position())
+
+
+class RecordedClick(NamedTuple):
+    """A click captured by RecordingInput."""
+
+    time: float
+    x: int
+    y: int
+    clicks: int
+    button: str
+
+
+class RecordedDrag(NamedTuple):
+    """A drag captured by RecordingInput."""
+
+    time: float
+    start: Tuple[int, int]
+    end: Tuple[int, int]
+
+
+class RecordingInput(InputSink):
+    """Record clicks instead of moving the real mouse."""
+
+    def __init__(self, on_click: Optional[Callable[[int, int], None]] = None):
+        """
+        Initialize the recording sink.
+
+        Args:
+            on_click: Optional callback invoked with (x, y) after each click
+        """
+        self.clicks: List[RecordedClick] = []
+        self.drags: List[RecordedDrag] = []
+        self.on_click = on_click
+        self._started = time.monotonic()
+        self._position = (0, 0)
+
+    def click(self, x: int, y: int, clicks: int = 1, interval: float = 0.0, button: str = 'left'):
+        """Record the click and notify the callback."""
+        self.clicks.append(RecordedClick(time.monotonic() - self._started, int(x), int(y), clicks, button))
+        self._position = (int(x), int(y))
+        logger.debug(f"Recorded click at ({x}, {y})")
+        if self.on_click:
+            self.on_click(int(x), int(y))
+
+    def drag(self, start: Tuple[int, int], end: Tuple[int, int], duration: float = 0.3):
+        """Record the drag."""
+        self.drags.append(RecordedDrag(time.monotonic() - self._started, tuple(start), tuple(end)))
+        self._position = tuple(end)
+        logger.debug(f"Recorded drag from {start} to {end}")
+
+    def position(self) -> Tuple[int, int]:
+        """Get the position of the last recorded click or drag."""
+        return self._position
@@ -0,0 +1,358 @@
+"""Text recognition of named screen regions with pytesseract."""
+
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import Settings
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+Region = Tuple[int, int, int, int]
+
+_TIMER = re.compile(r"(?:(\d+)\s*d\s*)?(\d{1,2}):([0-5]\d):([0-5]\d)")
+_warned_missing = False
+
+
+def preprocess(pixels: np.ndarray, upscale: Optional[int] = None) -> np.ndarray:
+    """
+    Turn a grayscale crop into black text on white for tesseract.
+
+    Args:
+        pixels: Grayscale region pixels
+        upscale: Enlargement factor (defaults to Settings.OCR_UPSCALE)
+
+    Returns:
+        Binarized, enlarged image with a white border
+    """
+    upscale = upscale or Settings.OCR_UPSCALE
+    enlarged = cv2.resize(pixels, None, fx=upscale, fy=upscale, interpolation=cv2.INTER_CUBIC)
+    _, binary = cv2.threshold(enlarged, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    # Game text is mostly light on dark; tesseract wants the background white
+    if np.count_nonzero(binary) < binary.size / 2:
+        binary = cv2.bitwise_not(binary)
+    return cv2.copyMakeBorder(binary, 8, 8, 8, 8, cv2.BORDER_CONSTANT, value=255)
+
+
+def parse_timer(text: str) -> Optional[int]:
+    """
+    Parse a game countdown: 'HH:MM:SS', optionally after days ('1d 02:03:04').
+
+    OCR noise that merely consists of timer characters ('1:2', '12:345',
+    '0:75:00') is rejected.
+
+    Args:
+        text: Recognized text
+
+    Returns:
+        Duration in seconds, or None if the text is not a countdown
+    """
+    match = _TIMER.fullmatch(text.strip().lower())
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return days * 86400 + hours * 3600 + minutes * 60 + seconds
+
+
+class OCRReader:
+    """
+    Reads text from named screen regions of a ScreenDetector's frames.
+
+    Regions come from Settings.OCR_REGIONS. Every crop is binarized and
+    enlarged, then looked up by a hash of its pixels: text is only
+    recognized for regions whose pixels changed since they were last read.
+    Regions that do need recognition and share a character set are stacked
+    into one image, so a whole batch costs a single tesseract call.
+    """
+
+    def __init__(self, detector, regions: Optional[Dict[str, dict]] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            detector: ScreenDetector whose frames are read
+            regions: Named region definitions (defaults to Settings.OCR_REGIONS)
+
+        Raises:
+            ImportError: If pytesseract is not installed
+        """
+        import pytesseract
+
+        if Settings.TESSERACT_CMD:
+            pytesseract.pytesseract.tesseract_cmd = Settings.TESSERACT_CMD
+        self._tesseract = pytesseract
+        self.detector = detector
+        self.regions = regions if regions is not None else Settings.OCR_REGIONS
+        self._cache: 'OrderedDict[Tuple[bytes, str], str]' = OrderedDict()
+        self.stats = {"reads": 0, "cached": 0, "calls": 0}
+
+    def locate(self, name: str) -> Optional[Region]:
+        """
+        Get the screen region of a named OCR region.
+
+        Args:
+            name: Key of Settings.OCR_REGIONS
+
+        Returns:
+            Region in screen coordinates, or None if its anchor template is
+            not on screen
+
+        Raises:
+            KeyError: If the name is not configured
+        """
+        spec = self.regions[name]
+        if "anchor" not in spec:
+            return self.detector.window_region(spec["region"])
+
+        anchor = self.detector.find_on_window(spec["anchor"])
+        if anchor is None:
+            return None
+        scale = self.detector.scale or 1.0
+        dx, dy, width, height = (int(round(value * scale)) for value in spec["offset"])
+        return (anchor.left + dx, anchor.top + dy, width, height)
+
+    def read(self, *names: str) -> Dict[str, Optional[str]]:
+        """
+        Read named regions from the current frame.
+
+        Args:
+            *names: Keys of Settings.OCR_REGIONS
+
+        Returns:
+            Dictionary of name to recognized text (None if the region's
+            anchor was not found)
+        """
+        with self.detector.snapshot():
+            located = {name: self.locate(name) for name in names}
+            texts = self.read_regions(
+                {name: region for name, region in located.items() if region is not None},
+                {name: self.regions[name].get("chars", "") for name in names}
+            )
+        return {name: texts.get(name) for name in names}
+
+    def read_regions(self, regions: Dict[str, Region], chars: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Read arbitrary screen regions from the current frame.
+
+        Args:
+            regions: Mapping of name to region in screen coordinates
+            chars: Optional mapping of name to allowed characters
+
+        Returns:
+            Dictionary of name to recognized text (stripped)
+        """
+        chars = chars or {}
+        frame = self.detector.get_frame()
+        results = {}
+        # Regions still to recognize, by character set and pixel hash
+        pending: Dict[str, Dict[Tuple[bytes, str], Tuple[np.ndarray, List[str]]]] = {}
+        for name, region in regions.items():
+            pixels, _, _ = frame.crop(region, grayscale=True)
+            if pixels.size == 0:
+                results[name] = ""
+                continue
+
+            allowed = chars.get(name, "")
+            key = (hashlib.blake2b(pixels.tobytes() + str(pixels.shape).encode(), digest_size=16).digest(), allowed)
+            self.stats["reads"] += 1
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                results[name] = self._cache[key]
+                self.stats["cached"] += 1
+                continue
+            batch = pending.setdefault(allowed, {})
+            if key in batch:
+                batch[key][1].append(name)
+            else:
+                batch[key] = (preprocess(pixels), [name])
+
+        for allowed, batch in pending.items():
+            texts = self._recognize([image for image, _ in batch.values()], allowed)
+            for (key, (_, names)), text in zip(batch.items(), texts):
+                for name in names:
+                    results[name] = text
+                self._cache[key] = text
+                if len(self._cache) > Settings.OCR_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return results
+
+    def _recognize(self, images: List[np.ndarray], allowed: str) -> List[str]:
+        """
+        Recognize several preprocessed regions with one tesseract call.
+
+        The images are stacked vertically with white gaps, and every
+        recognized word is assigned to the image its vertical center falls in.
+
+        Args:
+            images: Output of preprocess(), one per region
+            allowed: Characters tesseract may output ('' for any)
+
+        Returns:
+            Recognized text per image, in order
+        """
+        width = max(image.shape[1] for image in images)
+        bands = []
+        top = 0
+        rows = []
+        for image in images:
+            padded = cv2.copyMakeBorder(
+                image, 0, Settings.OCR_BATCH_GAP, 0, width - image.shape[1], cv2.BORDER_CONSTANT, value=255
+            )
+            rows.append(padded)
+            bands.append((top, top + image.shape[0]))
+            top += padded.shape[0]
+
+        config = "--psm 6"
+        if allowed:
+            config += f" -c tessedit_char_whitelist={allowed}"
+
+        start = time.perf_counter()
+        data = self._tesseract.image_to_data(
+            np.vstack(rows), config=config, output_type=self._tesseract.Output.DICT
+        )
+        self.stats["calls"] += 1
+        self.detector.profiler.record("ocr", time.perf_counter() - start)
+
+        words: List[List[Tuple[int, str]]] = [[] for _ in images]
+        for text, left, word_top, height in zip(data["text"], data["left"], data["top"], data["height"]):
+            text = text.strip()
+            if not text:
+                continue
+            center = word_top + height / 2
+            for index, (band_top, band_bottom) in enumerate(bands):
+                if band_top <= center < band_bottom + Settings.OCR_BATCH_GAP:
+                    words[index].append((left, text))
+                    break
+
+        texts = [" ".join(text for _, text in sorted(band)) for band in words]
+        logger.debug(f"Recognized {len(images)} regions in one call: {texts}")
+        return texts
+
+
+def create_reader(detector) -> Optional[OCRReader]:
+    """
+    Create an OCRReader, or None when pytesseract is not installed.
+
+    The missing dependency is logged once per process, so callers can treat
+    OCR as an optional speedup and fall back to their fixed behavior.
+
+    Args:
+        detector: ScreenDetector whose frames are read
+
+    Returns:
+        OCRReader or None
+    """
+    global _warned_missing
+    try:
+        return OCRReader(detector)
+    except ImportError:
+        if not _warned_missing:
+            logger.warning("pytesseract is not installed; timers will not be read")
+            _warned_missing = True
+        return None
+
+
+def timer_wait(seconds: float) -> float:
+    """
+    Get how long to wait on a single countdown reading.
+
+    One reading is not trusted for long, since OCR can misread a digit.
+
+    Args:
+        seconds: Remaining time read from the screen
+
+    Returns:
+        seconds plus Settings.TIMER_MARGIN, capped at Settings.TIMER_RECHECK
+    """
+    return min(seconds + Settings.TIMER_MARGIN, Settings.TIMER_RECHECK)
+
+
+def wait_for_timer(read: Callable[[], Optional[int]], seconds: int) -> Generator[float, None, Optional[int]]:
+    """
+    Wait for a countdown to run out, reading it again instead of sleeping blind.
+
+    The first reading is waited on for at most timer_wait(); then the timer
+    is read again. If the new reading agrees with the first (within
+    Settings.TIMER_TOLERANCE of what should be left), the rest of the
+    countdown is waited out in one go; if it is unreadable or disagrees,
+    the wait ends. No wait goes on longer than Settings.TIMER_MAX_WAIT in
+    total.
+
+    Args:
+        read: Reads the countdown from the screen (None if unreadable)
+        seconds: First reading
+
+    Yields:
+        Seconds to sleep, always positive
+
+    Returns:
+        Seconds left when the wait ended (0 once the countdown ran out), or
+        None if the readings could not be confirmed
+    """
+    waited = 0.0
+    confirmed = False
+    while seconds and waited < Settings.TIMER_MAX_WAIT:
+        full = seconds + Settings.TIMER_MARGIN
+        wait = min(full if confirmed else timer_wait(seconds), Settings.TIMER_MAX_WAIT - waited)
+        yield wait
+        waited += wait
+        if wait >= full:
+            return 0
+        if confirmed:
+            return seconds - wait
+
+        reading = read()
+        expected = seconds - wait
+        if reading is None:
+            logger.warning("Timer could not be read again, not waiting on it")
+            return None
+        if abs(reading - expected) > Settings.TIMER_TOLERANCE:
+            logger.warning(f"Timer re-read as {reading}s instead of about {expected:.0f}s, not waiting on it")
+            return None
+        logger.info(f"Timer confirmed: {reading}s left")
+        confirmed = True
+        seconds = reading
+    return seconds
+
+
+def read_duration(reader: Optional[OCRReader], name: str) -> Optional[int]:
+    """
+    Read a countdown from a named OCR region.
+
+    Readings that are not a parse_timer() countdown, or that exceed the
+    region's "max_seconds" (the longest the queue can plausibly take), are
+    rejected.
+
+    Args:
+        reader: OCRReader (None when OCR is unavailable)
+        name: Key of Settings.OCR_REGIONS
+
+    Returns:
+        Remaining seconds, or None if OCR is unavailable or the region is
+        missing, unreadable or implausible
+    """
+    if reader is None:
+        return None
+    try:
+        text = reader.read(name)[name]
+    except Exception as e:
+        logger.warning(f"Could not read '{name}': {e}")
+        return None
+    if not text:
+        logger.debug(f"Nothing to read in '{name}'")
+        return None
+
+    seconds = parse_timer(text)
+    limit = reader.regions[name].get("max_seconds")
+    if seconds is None or (limit is not None and seconds > limit):
+        logger.warning(f"Ignoring '{name}' reading {text!r}: not a plausible countdown")
+        return None
+    logger.debug(f"Read '{name}' as {text!r} ({seconds}s)")
+    return seconds
@@ -0,0 +1,173 @@
+"""Coarse prefilter that rules out absent templates before exact matching."""
+
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config.settings import Settings
+from src.logger import get_logger
+from src.utils.templates import Template
+
+
+logger = get_logger(__name__)
+
+
+def average_grid(pixels: np.ndarray, cell: int) -> np.ndarray:
+    """
+    Reduce a grayscale image to the mean gray level of each cell.
+
+    These are the values an average hash thresholds against their mean.
+    Pixels past the last whole cell are dropped.
+
+    Args:
+        pixels: Grayscale image
+        cell: Cell side in pixels
+
+    Returns:
+        Array with one value per cell
+    """
+    rows, cols = pixels.shape[0] // cell, pixels.shape[1] // cell
+    if rows == 0 or cols == 0:
+        return np.zeros((rows, cols), np.uint8)
+    return cv2.resize(pixels[:rows * cell, :cols * cell], (cols, rows), interpolation=cv2.INTER_AREA)
+
+
+class PrefilterIndex:
+    """
+    Average-grid fingerprints of every template, for rejecting absent ones.
+
+    A template's fingerprint is its average grid at Settings.PREFILTER_CELL
+    pixels per cell. The frame is reduced the same way once, at four
+    half-cell offsets so every position is within a quarter cell of a grid
+    cell, and each fingerprint is correlated against the grids covering the
+    search region. Exact matching only runs when the best coarse score
+    reaches Settings.PREFILTER_THRESHOLD.
+
+    The grids of the last frame are kept, so every lookup in a frame after
+    the first only pays for its own coarse correlation.
+    """
+
+    def __init__(self, cell: Optional[int] = None, threshold: Optional[float] = None):
+        """
+        Initialize the index.
+
+        Args:
+            cell: Cell side in pixels (defaults to Settings.PREFILTER_CELL)
+            threshold: Coarse score a template needs to be searched for
+                (defaults to Settings.PREFILTER_THRESHOLD)
+        """
+        self.cell = cell or Settings.PREFILTER_CELL
+        self.threshold = Settings.PREFILTER_THRESHOLD if threshold is None else threshold
+        self._fingerprints: Dict[Tuple[str, float], Optional[np.ndarray]] = {}
+        self._grids: List[Tuple[int, int, np.ndarray]] = []
+        self._grids_of = None
+        self._lock = threading.Lock()  # find_many() checks templates from worker threads
+        self.stats = {"checked": 0, "rejected": 0}
+
+    def fingerprint(self, template: Template) -> Optional[np.ndarray]:
+        """
+        Get a template's average grid.
+
+        Args:
+            template: Template (at the scale it will be searched at)
+
+        Returns:
+            Average grid, cached per template file and scale, or None when the
+            template is masked or has fewer than Settings.PREFILTER_MIN_CELLS
+            cells per side, in which case it is never rejected
+        """
+        key = (template.path, template.scale)
+        if key not in self._fingerprints:
+            grid = None
+            if template.mask is None:
+                grid = average_grid(template.gray, self.cell)
+                if min(grid.shape) < Settings.PREFILTER_MIN_CELLS or grid.std() == 0:
+                    grid = None
+            self._fingerprints[key] = grid
+        return self._fingerprints[key]
+
+    def _frame_grids(self, frame) -> List[Tuple[int, int, np.ndarray]]:
+        """
+        Get the average grids of a frame, computed once per frame.
+
+        Args:
+            frame: Frame to reduce
+
+        Returns:
+            List of (x offset, y offset, grid), offsets in frame pixels
+        """
+        with self._lock:
+            if self._grids_of is not frame:
+                half = self.cell // 2
+                self._grids = [
+                    (x, y, average_grid(frame.gray[y:, x:], self.cell))
+                    for y in (0, half)
+                    for x in (0, half)
+                ]
+                self._grids_of = frame
+            return self._grids
+
+    def score(self, frame, template: Template, region: Optional[Tuple[int, int, int, int]] = None) -> Optional[float]:
+        """
+        Get the best coarse correlation of a template inside a region.
+
+        Args:
+            frame: Frame to check
+            template: Template to look for
+            region: Region in screen coordinates (x, y, width, height), or
+                None for the whole frame
+
+        Returns:
+            Best coarse score (-1.0 if the template cannot fit), or None if
+            the template has no fingerprint
+        """
+        fingerprint = self.fingerprint(template)
+        if fingerprint is None:
+            return None
+
+        best = -1.0
+        for offset_x, offset_y, grid in self._frame_grids(frame):
+            if region is None:
+                cells = grid
+            else:
+                # Every cell the region touches, so edge positions are kept
+                x, y, width, height = region
+                left = max((x - frame.left - offset_x) // self.cell, 0)
+                top = max((y - frame.top - offset_y) // self.cell, 0)
+                right = math.ceil((x - frame.left - offset_x + width) / self.cell)
+                bottom = math.ceil((y - frame.top - offset_y + height) / self.cell)
+                cells = grid[top:bottom, left:right]
+
+            if cells.shape[0] < fingerprint.shape[0] or cells.shape[1] < fingerprint.shape[1]:
+                continue
+            result = cv2.matchTemplate(cells, fingerprint, cv2.TM_CCOEFF_NORMED)
+            best = max(best, cv2.minMaxLoc(result)[1])
+        return best
+
+    def may_contain(self, frame, template: Template, region: Optional[Tuple[int, int, int, int]] = None) -> bool:
+        """
+        Check whether an exact search for a template could succeed.
+
+        Args:
+            frame: Frame to check
+            template: Template to look for
+            region: Region in screen coordinates (x, y, width, height), or
+                None for the whole frame
+
+        Returns:
+            False if the template is ruled out, True otherwise
+        """
+        score = self.score(frame, template, region)
+        if score is None:
+            return True
+
+        rejected = score < self.threshold
+        with self._lock:
+            self.stats["checked"] += 1
+            self.stats["rejected"] += rejected
+        if rejected:
+            logger.debug(f"Prefilter ruled out '{template.name}' (coarse score {score:.2f})")
+        return not rejected
@@ -0,0 +1,206 @@
+"""Lightweight timing instrumentation for the bot's hot path."""
+
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.settings import Settings
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+_NULL_SPAN = nullcontext()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of a list of numbers.
+
+    Args:
+        values: Values to summarize (need not be sorted)
+        fraction: Percentile as a fraction (0.5 for the median)
+
+    Returns:
+        The percentile value, or 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+class _Span:
+    """Context manager that adds its duration to a Profiler phase."""
+
+    __slots__ = ("_profiler", "_phase", "_start")
+
+    def __init__(self, profiler: 'Profiler', phase: str):
+        self._profiler = profiler
+        self._phase = phase
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.record(self._phase, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    """
+    Records how long captures, matches, clicks and sleeps take.
+
+    When disabled, span() returns a shared no-op context manager and
+    nothing is recorded, so instrumented code pays one attribute check.
+    """
+
+    def __init__(self, enabled: bool = False, dump_path: Optional[str] = None):
+        """
+        Initialize the profiler.
+
+        Args:
+            enabled: Whether to record timings
+            dump_path: Optional JSON-lines file that dump() appends to
+        """
+        self.enabled = enabled
+        self.dump_path = dump_path
+        self._lock = threading.Lock()  # Parallel searches record from worker threads
+        self.reset()
+
+    def reset(self):
+        """Discard everything recorded so far."""
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._iterations: List[Dict[str, float]] = []
+        self._current: Optional[Dict[str, float]] = None
+
+    def span(self, phase: str):
+        """
+        Time a block of code as part of a phase.
+
+        Args:
+            phase: Phase name ('capture', 'match', 'click', 'sleep', ...)
+
+        Returns:
+            Context manager timing the block
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, phase)
+
+    def record(self, phase: str, seconds: float):
+        """
+        Add a measured duration to a phase.
+
+        Args:
+            phase: Phase name
+            seconds: Duration in seconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._samples[phase].append(seconds)
+            if self._current is not None:
+                self._current[phase] = self._current.get(phase, 0.0) + seconds
+
+    def sleep(self, seconds: float):
+        """
+        Sleep, recording the time as the 'sleep' phase.
+
+        Args:
+            seconds: Time to sleep in seconds
+        """
+        with self.span("sleep"):
+            time.sleep(seconds)
+
+    def begin_iteration(self):
+        """
+        Start a new action iteration, closing the previous one.
+
+        Everything recorded until the next begin_iteration() (or summary())
+        is attributed to this iteration.
+        """
+        if not self.enabled:
+            return
+        self._finish_iteration()
+        self._current = {}
+        self._iteration_start = time.perf_counter()
+
+    def _finish_iteration(self):
+        """Close the open iteration, if any."""
+        if self._current is not None:
+            self._current["total"] = time.perf_counter() - self._iteration_start
+            self._iterations.append(self._current)
+            self._current = None
+
+    def summary(self) -> dict:
+        """
+        Summarize the recorded timings.
+
+        Returns:
+            Dictionary with per-phase totals and percentiles (milliseconds)
+            and a per-iteration breakdown (seconds)
+        """
+        self._finish_iteration()
+        phases = {}
+        for phase, samples in self._samples.items():
+            phases[phase] = {
+                "count": len(samples),
+                "total_s": round(sum(samples), 4),
+                "p50_ms": round(percentile(samples, 0.5) * 1000, 2),
+                "p90_ms": round(percentile(samples, 0.9) * 1000, 2),
+                "p99_ms": round(percentile(samples, 0.99) * 1000, 2),
+                "max_ms": round(max(samples) * 1000, 2),
+            }
+
+        iterations = [
+            {phase: round(seconds, 4) for phase, seconds in iteration.items()}
+            for iteration in self._iterations
+        ]
+        totals = [iteration["total"] for iteration in self._iterations]
+        return {
+            "phases": phases,
+            "iterations": iterations,
+            "iteration_p50_s": round(percentile(totals, 0.5), 4),
+            "iteration_p90_s": round(percentile(totals, 0.9), 4),
+        }
+
+    def dump(self, label: str, path: Optional[str] = None):
+        """
+        Append the current summary to a JSON-lines file.
+
+        Args:
+            label: Label stored with the summary (e.g. the action name)
+            path: File to append to (defaults to dump_path)
+        """
+        path = path or self.dump_path
+        if not self.enabled or not path:
+            return
+
+        record = {"label": label, "time": time.time(), **self.summary()}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        logger.info(f"Timing profile for '{label}' written to {path}")
+
+
+def create_profiler(enabled: Optional[bool] = None, dump_path: Optional[str] = None) -> Profiler:
+    """
+    Create a profiler from Settings, with optional overrides.
+
+    Args:
+        enabled: Whether to record timings (defaults to Settings.PROFILE_ENABLED)
+        dump_path: JSON-lines output file (defaults to Settings.PROFILE_FILE)
+
+    Returns:
+        Configured Profiler
+    """
+    if enabled is None:
+        enabled = Settings.PROFILE_ENABLED
+    return Profiler(enabled, dump_path or Settings.PROFILE_FILE)
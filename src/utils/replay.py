@@ -0,0 +1,198 @@
+"""
+Offline replay: run actions against recorded frames instead of the game.
+
+A replay directory holds PNG screenshots plus a script.json describing how
+the screen moves between them:
+
+    {
+        "window": {"title": "Puzzles & Survival", "left": 0, "top": 0,
+                   "width": 1920, "height": 1080},
+        "start": "city",
+        "transitions": [
+            {"from": "city", "click": [1200, 900, 80, 80], "to": "training"},
+            {"from": "training", "click": null, "to": "speedup"},
+            {"from": "speedup", "after": 1.5, "to": "city"}
+        ]
+    }
+
+Frames are named after their file stem. A "click" transition fires when a
+click lands inside the (x, y, width, height) box, or on any click when the
+box is null. An "after" transition fires once the current frame has been
+shown for that many seconds. The first matching transition wins.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.logger import get_logger
+from src.utils.capture import ReplayCapture
+from src.utils.input import RecordingInput
+from src.utils.window import WindowManager
+
+
+logger = get_logger(__name__)
+
+
+class ReplayWindow:
+    """Stand-in for a pygetwindow window with a fixed rect."""
+
+    def __init__(self, title: str, left: int, top: int, width: int, height: int):
+        """
+        Initialize the replay window.
+
+        Args:
+            title: Window title
+            left: Screen X coordinate of the window
+            top: Screen Y coordinate of the window
+            width: Window width
+            height: Window height
+        """
+        self.title = title
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+
+    def activate(self):
+        """Activating a recorded window is a no-op."""
+
+
+class ReplayWindowManager(WindowManager):
+    """WindowManager that always finds the recorded window."""
+
+    def __init__(self, window: ReplayWindow):
+        """
+        Initialize the replay window manager.
+
+        Args:
+            window: Recorded window to report
+        """
+        super().__init__(window.title)
+        self._window = window
+
+    def get_window(self, retry: int = 3) -> Optional[ReplayWindow]:
+        """Return the recorded window."""
+        return self._window
+
+    def activate_window(self) -> bool:
+        """Pretend to activate the recorded window."""
+        return True
+
+    def is_window_active(self) -> bool:
+        """The recorded window is always active."""
+        return True
+
+    def get_all_window_titles(self) -> list:
+        """Only the recorded window exists."""
+        return [self._window.title]
+
+
+class ReplayScript:
+    """State machine that moves between recorded frames on clicks and timeouts."""
+
+    def __init__(self, capture: ReplayCapture, start: str, transitions: List[dict]):
+        """
+        Initialize the script.
+
+        Args:
+            capture: Capture backend serving the frames
+            start: Name of the first frame to show
+            transitions: Transition rules (see module docstring)
+        """
+        self.capture = capture
+        self.transitions = transitions
+        self.history: List[Tuple[float, str]] = []
+        self._started = time.monotonic()
+        self._enter(start)
+
+    def _enter(self, name: str):
+        """Show a frame and note when it appeared."""
+        self.capture.show(name)
+        self._entered = time.monotonic()
+        self.history.append((self._entered - self._started, name))
+        logger.debug(f"Replay frame: {name}")
+
+    def on_click(self, x: int, y: int):
+        """
+        Apply the first click transition that matches the current frame.
+
+        Args:
+            x: Clicked X coordinate
+            y: Clicked Y coordinate
+        """
+        for rule in self.transitions:
+            if rule.get("from") != self.capture.current or "click" not in rule:
+                continue
+            box = rule["click"]
+            if box is None or (box[0] <= x < box[0] + box[2] and box[1] <= y < box[1] + box[3]):
+                self._enter(rule["to"])
+                return
+
+    def tick(self):
+        """Apply the first timed transition whose delay has elapsed."""
+        elapsed = time.monotonic() - self._entered
+        for rule in self.transitions:
+            if rule.get("from") == self.capture.current and "after" in rule and elapsed >= rule["after"]:
+                self._enter(rule["to"])
+                return
+
+
+class ScriptedReplayCapture(ReplayCapture):
+    """ReplayCapture that lets a ReplayScript advance frames over time."""
+
+    script: Optional[ReplayScript] = None
+
+    def grab(self, region=None) -> Tuple[np.ndarray, int, int]:
+        """Apply due timed transitions, then return the current frame."""
+        if self.script:
+            self.script.tick()
+        return super().grab(region)
+
+
+class ReplaySession:
+    """Everything needed to run the bot against a replay directory."""
+
+    def __init__(self, directory: str):
+        """
+        Load a replay directory.
+
+        Args:
+            directory: Directory with PNG frames and script.json
+
+        Raises:
+            FileNotFoundError: If the directory has no frames or no script
+        """
+        directory = Path(directory)
+        script_path = directory / "script.json"
+        if not script_path.exists():
+            raise FileNotFoundError(f"Replay script not found: {script_path}")
+
+        with open(script_path, encoding="utf-8") as f:
+            script = json.load(f)
+
+        self.capture = ScriptedReplayCapture(str(directory))
+        first = self.capture.frames[self.capture.names[0]]
+        window = script.get("window", {})
+        self.window_manager = ReplayWindowManager(ReplayWindow(
+            window.get("title", "Replay"),
+            window.get("left", 0),
+            window.get("top", 0),
+            window.get("width", first.shape[1]),
+            window.get("height", first.shape[0]),
+        ))
+        self.script = ReplayScript(self.capture, script.get("start", self.capture.names[0]), script.get("transitions", []))
+        self.capture.script = self.script
+        self.input = RecordingInput(on_click=self.script.on_click)
+
+    def click_trace(self) -> List[dict]:
+        """
+        Get the recorded clicks.
+
+        Returns:
+            List of dictionaries with time, x, y, clicks and button
+        """
+        return [click._asdict() for click in self.input.clicks]
@@ -0,0 +1,197 @@
+"""Single-pass classification of which game screen is showing."""
+
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from config.settings import Settings
+from src.logger import get_logger
+from src.utils.templates import Template
+
+
+logger = get_logger(__name__)
+
+
+class Scene(NamedTuple):
+    """Result of SceneClassifier.classify()."""
+
+    name: Optional[str]  # Scene label, or None if no marker was seen
+    scores: Dict[str, float]  # Fingerprint score of every marker, by image path
+    score: float = 0.0  # Best marker score of the named scene
+    markers: Tuple[str, ...] = ()  # Marker paths of the named scene
+
+    def may_show(self, image: Union[str, Template], confidence: Optional[float] = None) -> bool:
+        """
+        Check whether a template is worth an exact search in this frame.
+
+        Only a marker of another scene can be ruled out, and only when that
+        scene was recognized with at least Settings.SCENE_RULE_OUT_SCORE
+        and the marker's own fingerprint scored more than
+        Settings.SCENE_MARGIN below the confidence of the lookup. For any
+        other image, or when the scene was not recognized, the answer is
+        always True.
+
+        Args:
+            image: Template or image file path
+            confidence: Confidence the exact search will use (defaults to
+                Settings.SCENE_CONFIDENCE)
+
+        Returns:
+            False if a strongly recognized, different scene rules it out
+        """
+        path = image.path if isinstance(image, Template) else str(image)
+        score = self.scores.get(path)
+        if self.name is None or score is None or path in self.markers:
+            return True
+        if self.score < Settings.SCENE_RULE_OUT_SCORE:
+            return True
+        confidence = Settings.SCENE_CONFIDENCE if confidence is None else confidence
+        return score >= confidence - Settings.SCENE_MARGIN
+
+
+def phase_fingerprints(pixels: np.ndarray, factor: int) -> List[np.ndarray]:
+    """
+    Shrink a grayscale template once per sub-cell phase.
+
+    A template drawn at x pixels into the frame lines up with the
+    thumbnail's cells only when x is a multiple of factor; the fingerprint
+    of phase (dx, dy) skips the template's first dx columns and dy rows, so
+    one of them always lines up.
+
+    Args:
+        pixels: Grayscale template pixels
+        factor: Downscale factor
+
+    Returns:
+        factor * factor fingerprints, phase (0, 0) first
+    """
+    fingerprints = []
+    for dy in range(factor):
+        for dx in range(factor):
+            shifted = pixels[dy:, dx:]
+            rows, cols = shifted.shape[0] // factor, shifted.shape[1] // factor
+            fingerprints.append(
+                cv2.resize(shifted[:rows * factor, :cols * factor], (cols, rows), interpolation=cv2.INTER_AREA)
+            )
+    return fingerprints
+
+
+class SceneClassifier:
+    """
+    Labels the current screen from one downsampled frame.
+
+    Every marker in Settings.SCENES is shrunk to small grayscale
+    fingerprints, one per sub-cell phase, and matched against one grayscale
+    copy of the window reduced by Settings.SCENE_FACTOR. That costs about
+    as much as a single exact search, so actions can check which screen is
+    up before paying for exact searches of buttons that cannot be there.
+    """
+
+    def __init__(self, detector, scenes: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize the classifier.
+
+        Args:
+            detector: ScreenDetector whose frames, templates and scale are used
+            scenes: Mapping of scene name to marker image paths, in priority
+                order (defaults to Settings.SCENES)
+        """
+        self.detector = detector
+        self.scenes = scenes if scenes is not None else Settings.SCENES
+        self._fingerprints: Dict[float, List[Tuple[str, List[np.ndarray]]]] = {}
+
+    def fingerprints(self, scale: float) -> List[Tuple[str, List[np.ndarray]]]:
+        """
+        Get the marker fingerprints for a window scale.
+
+        Args:
+            scale: Template scale the window is drawn at
+
+        Returns:
+            List of (image path, phase_fingerprints()), cached per scale
+        """
+        if scale not in self._fingerprints:
+            factor = Settings.SCENE_FACTOR
+            fingerprints = []
+            for paths in self.scenes.values():
+                for path in paths:
+                    try:
+                        template = self.detector.templates.resolve(path)
+                    except FileNotFoundError as e:
+                        logger.warning(f"Skipping scene marker: {e}")
+                        continue
+                    if template.mask is not None:
+                        continue
+                    phases = phase_fingerprints(template.scaled(scale).gray, factor)
+                    if min(min(pixels.shape) for pixels in phases) >= Settings.SCENE_MIN_SIDE:
+                        fingerprints.append((str(path), phases))
+            self._fingerprints[scale] = fingerprints
+        return self._fingerprints[scale]
+
+    @staticmethod
+    def _score(thumbnail: np.ndarray, phases: List[np.ndarray]) -> float:
+        """
+        Score a marker in a thumbnail, whatever its sub-cell offset.
+
+        The phase (0, 0) fingerprint is matched over the whole thumbnail,
+        then every phase is matched in a window one cell larger than the
+        marker around the best position, so the shift-tolerant score costs
+        little more than a single match.
+
+        Args:
+            thumbnail: Downscaled grayscale window
+            phases: phase_fingerprints() of the marker
+
+        Returns:
+            Best score over all phases
+        """
+        pixels = phases[0]
+        result = cv2.matchTemplate(thumbnail, pixels, cv2.TM_CCOEFF_NORMED)
+        _, best, _, (x, y) = cv2.minMaxLoc(result)
+        window = thumbnail[max(y - 1, 0):y + pixels.shape[0] + 1, max(x - 1, 0):x + pixels.shape[1] + 1]
+        for pixels in phases[1:]:
+            if pixels.shape[0] <= window.shape[0] and pixels.shape[1] <= window.shape[1]:
+                result = cv2.matchTemplate(window, pixels, cv2.TM_CCOEFF_NORMED)
+                best = max(best, cv2.minMaxLoc(result)[1])
+        return best
+
+    def classify(self) -> Scene:
+        """
+        Label the screen in the detector's current frame.
+
+        Returns:
+            Scene with the first matching scene name (None if no marker was
+            seen) and every marker's fingerprint score. While the detector
+            cannot detect the template scale the scene is always unknown,
+            since fingerprints at the wrong scale would miss markers that are
+            there.
+        """
+        scale = self.detector.detect_scale() if Settings.MULTI_SCALE_ENABLED else 1.0
+        if scale is None:
+            return Scene(None, {})
+
+        start = time.perf_counter()
+        frame = self.detector.get_frame()
+        window_manager = self.detector.window_manager
+        region = window_manager.rect if window_manager is not None else None
+        thumbnail = frame.thumbnail(region, Settings.SCENE_FACTOR)
+
+        scores = {}
+        for path, phases in self.fingerprints(scale):
+            if phases[0].shape[0] > thumbnail.shape[0] or phases[0].shape[1] > thumbnail.shape[1]:
+                continue
+            scores[path] = self._score(thumbnail, phases)
+
+        scene = Scene(None, scores)
+        for name, paths in self.scenes.items():
+            markers = tuple(str(path) for path in paths)
+            score = max(scores.get(path, 0.0) for path in markers)
+            if score >= Settings.SCENE_CONFIDENCE:
+                scene = Scene(name, scores, score, markers)
+                break
+
+        self.detector.profiler.record("classify", time.perf_counter() - start)
+        logger.debug(f"Scene: {scene.name} ({scene.score:.2f})")
+        return scene
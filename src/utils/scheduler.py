@@ -0,0 +1,237 @@
+"""Recurring job scheduler for daemon mode."""
+
+import heapq
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.settings import Settings
+from src.logger import get_logger
+from src.utils.ocr import timer_wait
+
+
+logger = get_logger(__name__)
+
+
+class Job:
+    """A recurring action, as configured in Settings.DAEMON_JOBS."""
+
+    FIELDS = ("action", "every", "times", "priority", "when", "name")
+
+    def __init__(
+        self,
+        action: str,
+        every: float,
+        times: int = 1,
+        priority: int = 10,
+        when: Sequence[str] = (),
+        name: Optional[str] = None
+    ):
+        """
+        Initialize a job.
+
+        Args:
+            action: Action to run ('train', 'heal', 'help', 'gather')
+            every: Seconds between runs (also between checks of `when`)
+            times: Iterations passed to the action
+            priority: Lower runs first when several jobs are due together
+            when: Template names that must all be visible for the job to
+                run; an empty list always runs
+            name: Label for logs (defaults to the action)
+        """
+        if every <= 0:
+            raise ValueError(f"Job '{name or action}' needs a positive interval, got {every}")
+        self.action = action
+        self.every = every
+        self.times = times
+        self.priority = priority
+        self.when = (when,) if isinstance(when, str) else tuple(when)
+        self.name = name or action
+        self.runs = 0
+        self.skips = 0
+        self.failures = 0
+
+    @classmethod
+    def from_dict(cls, config: dict) -> 'Job':
+        """
+        Build a job from its declarative form.
+
+        Args:
+            config: Dictionary with the keys in Job.FIELDS
+
+        Returns:
+            Configured Job
+
+        Raises:
+            ValueError: On unknown keys or a missing action/interval
+        """
+        unknown = set(config) - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job settings {sorted(unknown)} in {config}")
+        if "action" not in config or "every" not in config:
+            raise ValueError(f"Job needs 'action' and 'every': {config}")
+        return cls(**config)
+
+    def __repr__(self) -> str:
+        return f"Job({self.name!r}, every={self.every}s, priority={self.priority})"
+
+
+def load_jobs(path: Optional[str] = None) -> List[Job]:
+    """
+    Load the daemon's jobs.
+
+    Args:
+        path: JSON file with a list of job dictionaries (defaults to
+            Settings.DAEMON_JOBS)
+
+    Returns:
+        List of Jobs
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If a job is invalid
+    """
+    if path:
+        if not Path(path).exists():
+            raise FileNotFoundError(f"Job file not found: {path}")
+        with open(path, encoding="utf-8") as f:
+            configs = json.load(f)
+    else:
+        configs = Settings.DAEMON_JOBS
+    return [Job.from_dict(config) for config in configs]
+
+
+class JobScheduler:
+    """
+    Runs jobs at their intervals from a heap ordered by due time.
+
+    Whenever jobs are due, the one with the lowest priority value runs
+    first and the rest stay queued, so a slow action delays lower-priority
+    jobs rather than piling them up. A job whose result carries 'ready_in'
+    (its queue's countdown, read from the screen) is requeued for when that
+    countdown runs out instead of after 'every'. Between jobs the scheduler
+    sleeps until the next due time.
+    """
+
+    def __init__(
+        self,
+        jobs: List[Job],
+        run: Callable[[Job], Optional[dict]],
+        ready: Callable[[Job], bool] = lambda job: True,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            jobs: Jobs to run
+            run: Runs a job and returns its result dictionary
+            ready: Checks a job's `when` condition
+            clock: Monotonic time source
+            sleep: Sleep function
+        """
+        self.jobs = jobs
+        self._run = run
+        self._ready = ready
+        self._clock = clock
+        self._sleep = sleep
+        self._counter = itertools.count()
+        self._heap: List[Tuple[float, int, int, Job]] = []
+        now = clock()
+        for job in jobs:
+            self._push(job, now)
+
+    def _push(self, job: Job, due: float):
+        """Queue a job to run at `due`."""
+        heapq.heappush(self._heap, (due, job.priority, next(self._counter), job))
+
+    def _pop_due(self, now: float) -> Optional[Job]:
+        """
+        Take the highest-priority job that is due, if any.
+
+        Args:
+            now: Current clock time
+
+        Returns:
+            Job to run, or None if nothing is due yet
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+        if not due:
+            return None
+
+        due.sort(key=lambda entry: (entry[1], entry[0], entry[2]))
+        for entry in due[1:]:
+            heapq.heappush(self._heap, entry)
+        return due[0][3]
+
+    def run_pending(self) -> Optional[Tuple[Job, Optional[dict]]]:
+        """
+        Run the highest-priority due job, if any, and requeue it.
+
+        Returns:
+            Tuple of (job, result) for the job that ran (result is None when
+            its condition was not met or it raised), or None if nothing was due
+        """
+        now = self._clock()
+        job = self._pop_due(now)
+        if job is None:
+            return None
+
+        result = None
+        try:
+            if self._ready(job):
+                logger.info(f"Running job '{job.name}'")
+                result = self._run(job)
+                job.runs += 1
+            else:
+                logger.debug(f"Skipping job '{job.name}': {list(job.when)} not visible")
+                job.skips += 1
+        except Exception as e:
+            logger.error(f"Job '{job.name}' failed: {e}", exc_info=True)
+            job.failures += 1
+
+        # A job that read its queue's countdown comes back when the queue frees up
+        delay = job.every
+        if result and result.get("ready_in"):
+            delay = timer_wait(result["ready_in"])
+            logger.info(f"Job '{job.name}' next due in {delay:.0f}s (queue timer)")
+        self._push(job, self._clock() + delay)
+        return job, result
+
+    def next_due_in(self) -> float:
+        """
+        Get the time until the next job is due.
+
+        Returns:
+            Seconds until the earliest queued job (0 if one is already due)
+        """
+        if not self._heap:
+            return float("inf")
+        return max(self._heap[0][0] - self._clock(), 0.0)
+
+    def run(self, duration: Optional[float] = None):
+        """
+        Run jobs until interrupted or `duration` seconds have passed.
+
+        Args:
+            duration: Optional run time limit in seconds
+        """
+        deadline = self._clock() + duration if duration else float("inf")
+        logger.info(f"Scheduler started with {len(self.jobs)} jobs: {self.jobs}")
+        while self._heap and self._clock() < deadline:
+            if self.run_pending() is None:
+                self._sleep(min(self.next_due_in(), max(deadline - self._clock(), 0.0)))
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get how often each job ran, was skipped or failed.
+
+        Returns:
+            Dictionary of job name to {'runs', 'skips', 'failures'}
+        """
+        return {job.name: {"runs": job.runs, "skips": job.skips, "failures": job.failures} for job in self.jobs}
@@ -1,36 +1,1163 @@
 """Screen detection and image recognition utilities."""
 
+import threading
 import time
-from typing import Optional, Tuple, Union
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
 
-import pyautogui
-from pyautogui import Box
+import cv2
+import numpy as np
 
 from config.settings import Settings
 from src.logger import get_logger
+from src.utils.calibration import CalibrationProfile
+from src.utils.capture import CaptureBackend, create_capture_backend
+from src.utils.input import InputSink, PyAutoGUIInput
+from src.utils.prefilter import PrefilterIndex
+from src.utils.profiling import Profiler, create_profiler
+from src.utils.templates import Template, TemplateBank
 
 
 logger = get_logger(__name__)
 
+# Same fields as pyscreeze.Box
+Box = namedtuple('Box', 'left top width height')
+
+
+class Match(NamedTuple):
+    """A template hit together with its correlation score."""
+
+    box: Box
+    score: float
+
+
+def match_full(haystack: np.ndarray, template: Template, grayscale: bool = False) -> Tuple[float, int, int]:
+    """
+    Find the best position of a template with an exhaustive full-scale search.
+
+    Args:
+        haystack: Image to search (BGR, or grayscale when grayscale=True)
+        template: Template to find
+        grayscale: Whether to use the grayscale template pixels
+
+    Returns:
+        Tuple of (score, x, y) of the best match in haystack coordinates.
+        The score is -1.0 when the template does not fit in the haystack.
+    """
+    if haystack.shape[0] < template.height or haystack.shape[1] < template.width:
+        return -1.0, 0, 0
+
+    result = cv2.matchTemplate(
+        haystack,
+        template.pixels(grayscale),
+        cv2.TM_CCOEFF_NORMED,
+        mask=template.mask
+    )
+    if template.mask is not None:
+        # Masked correlation is undefined over flat patches
+        result = np.nan_to_num(result, nan=0.0, posinf=0.0, neginf=0.0)
+    _, score, _, (x, y) = cv2.minMaxLoc(result)
+    return score, x, y
+
+
+def pyramid_factor(template: Template) -> int:
+    """
+    Pick the coarse-level downscale factor for a template.
+
+    Args:
+        template: Template to be matched
+
+    Returns:
+        Largest factor in Settings.PYRAMID_FACTORS that keeps the template's
+        short side at least Settings.PYRAMID_MIN_SIDE pixels, or 1 if the
+        template is too small (or masked) to benefit from a pyramid search
+    """
+    if template.mask is not None or template.width * template.height < Settings.PYRAMID_MIN_AREA:
+        return 1
+
+    short_side = min(template.width, template.height)
+    for factor in sorted(Settings.PYRAMID_FACTORS, reverse=True):
+        if short_side // factor >= Settings.PYRAMID_MIN_SIDE:
+            return factor
+    return 1
+
+
+def _coarse_candidates(result: np.ndarray, count: int, spacing: int) -> List[Tuple[int, int]]:
+    """
+    Pick the highest-scoring, mutually distant positions from a match map.
+
+    Args:
+        result: Correlation map from cv2.matchTemplate
+        count: Maximum number of positions to return
+        spacing: Minimum distance between returned positions
+
+    Returns:
+        List of (x, y) positions, best first
+    """
+    result = result.copy()
+    candidates = []
+    for _ in range(count):
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if score <= -1.0:
+            break
+        candidates.append((x, y))
+        result[max(y - spacing, 0):y + spacing + 1, max(x - spacing, 0):x + spacing + 1] = -1.0
+    return candidates
+
+
+def match_pyramid(
+    haystack: np.ndarray,
+    template: Template,
+    grayscale: bool = False,
+    factor: int = 4
+) -> Tuple[float, int, int]:
+    """
+    Find the best position of a template with a coarse-to-fine search.
+
+    The haystack and template are shrunk by `factor` and matched to find a
+    few candidate positions. Each candidate is then refined with a
+    full-scale match over a small window around it, so the full-resolution
+    work is proportional to the number of candidates rather than the
+    haystack area.
+
+    Args:
+        haystack: Image to search (BGR, or grayscale when grayscale=True)
+        template: Template to find
+        grayscale: Whether to use the grayscale template pixels
+        factor: Coarse-level downscale factor
+
+    Returns:
+        Tuple of (score, x, y) of the best refined match in haystack
+        coordinates, same convention as match_full()
+    """
+    height, width = haystack.shape[:2]
+    if height < template.height or width < template.width:
+        return -1.0, 0, 0
+
+    small_haystack = cv2.resize(haystack, (width // factor, height // factor), interpolation=cv2.INTER_AREA)
+    small_template = template.downscaled(factor, grayscale)
+    if small_haystack.shape[0] < small_template.shape[0] or small_haystack.shape[1] < small_template.shape[1]:
+        return match_full(haystack, template, grayscale)
+
+    coarse = cv2.matchTemplate(small_haystack, small_template, cv2.TM_CCOEFF_NORMED)
+    candidates = _coarse_candidates(
+        coarse,
+        Settings.PYRAMID_CANDIDATES,
+        max(min(small_template.shape[:2]) // 2, 1)
+    )
+
+    best = (-1.0, 0, 0)
+    pad = factor * 2
+    needle = template.pixels(grayscale)
+    for coarse_x, coarse_y in candidates:
+        x0 = max(coarse_x * factor - pad, 0)
+        y0 = max(coarse_y * factor - pad, 0)
+        x1 = min(coarse_x * factor + template.width + pad, width)
+        y1 = min(coarse_y * factor + template.height + pad, height)
+        window = haystack[y0:y1, x0:x1]
+        if window.shape[0] < template.height or window.shape[1] < template.width:
+            continue
+
+        result = cv2.matchTemplate(window, needle, cv2.TM_CCOEFF_NORMED)
+        _, score, _, (x, y) = cv2.minMaxLoc(result)
+        if score > best[0]:
+            best = (score, x0 + x, y0 + y)
+
+    return best
+
+
+def search_factor(haystack: np.ndarray, template: Template, grayscale: bool = False) -> int:
+    """
+    Pick the pyramid factor match_template() searches an image with.
+
+    Args:
+        haystack: Image about to be searched
+        template: Template about to be matched
+        grayscale: Whether the grayscale template pixels will be used
+
+    Returns:
+        Coarse-level factor for match_pyramid(), or 1 for match_full()
+    """
+    factor = pyramid_factor(template) if Settings.PYRAMID_ENABLED else 1
+    # Small search areas (e.g. around a location hint) are cheaper to scan directly
+    if factor > 1 and haystack.size >= 4 * template.pixels(grayscale).size:
+        return factor
+    return 1
+
+
+def match_template(haystack: np.ndarray, template: Template, grayscale: bool = False) -> Tuple[float, int, int]:
+    """
+    Find the best position of a template inside an image.
+
+    Large templates go through match_pyramid() when Settings.PYRAMID_ENABLED
+    is set; everything else uses the exhaustive match_full().
+
+    Args:
+        haystack: Image to search (BGR, or grayscale when grayscale=True)
+        template: Template to find
+        grayscale: Whether to use the grayscale template pixels
+
+    Returns:
+        Tuple of (score, x, y) of the best match in haystack coordinates.
+        The score is -1.0 when the template does not fit in the haystack.
+    """
+    factor = search_factor(haystack, template, grayscale)
+    if factor > 1:
+        return match_pyramid(haystack, template, grayscale, factor)
+    return match_full(haystack, template, grayscale)
+
+
+def split_bands(height: int, template_height: int, count: int) -> List[Tuple[int, int]]:
+    """
+    Split an image into horizontal bands that together cover every placement.
+
+    Neighbouring bands overlap by template_height - 1 rows, so each position
+    a template can occupy lies entirely inside at least one band.
+
+    Args:
+        height: Image height in pixels
+        template_height: Height of the template that will be matched
+        count: Number of bands
+
+    Returns:
+        List of (top, bottom) row ranges
+    """
+    step = -(-(height - template_height + 1) // count)
+    bands = []
+    for top in range(0, height - template_height + 1, step):
+        bands.append((top, min(top + step + template_height - 1, height)))
+    return bands
+
+
+def match_tiled(
+    haystack: np.ndarray,
+    template: Template,
+    grayscale: bool,
+    executor: Optional[Executor],
+    tiles: int
+) -> Tuple[float, int, int]:
+    """
+    Run match_full() over horizontal bands of an image.
+
+    OpenCV releases the GIL while matching, so bands searched on a thread
+    pool use several cores. Scores depend slightly on the size of the image
+    OpenCV correlates, so the bands are the same with or without a pool and
+    only the pool decides whether they run concurrently; the result is then
+    identical either way. Ties are broken towards the first position in
+    row-major order, like cv2.minMaxLoc does for a single search.
+
+    Args:
+        haystack: Image to search (BGR, or grayscale when grayscale=True)
+        template: Template to find
+        grayscale: Whether to use the grayscale template pixels
+        executor: Pool the bands are matched on, or None to match them in turn
+        tiles: Number of bands
+
+    Returns:
+        Tuple of (score, x, y) of the best match, same convention as
+        match_full()
+    """
+    if haystack.shape[0] < template.height or haystack.shape[1] < template.width:
+        return -1.0, 0, 0
+
+    bands = split_bands(haystack.shape[0], template.height, tiles)
+    if executor is None:
+        matches = [match_full(haystack[top:bottom], template, grayscale) for top, bottom in bands]
+    else:
+        futures = [executor.submit(match_full, haystack[top:bottom], template, grayscale) for top, bottom in bands]
+        matches = [future.result() for future in futures]
+    results = [(score, x, top + y) for (top, _), (score, x, y) in zip(bands, matches)]
+    return max(results, key=lambda result: (result[0], -result[2], -result[1]))
+
+
+def match_all(
+    haystack: np.ndarray,
+    template: Template,
+    confidence: float,
+    grayscale: bool = False,
+    limit: Optional[int] = None
+) -> List[Tuple[float, int, int]]:
+    """
+    Find every non-overlapping position of a template inside an image.
+
+    Positions scoring at least `confidence` are reduced to local maxima and
+    then greedily suppressed: a candidate is dropped when it overlaps an
+    already kept, higher-scoring one by more than Settings.NMS_OVERLAP
+    (intersection over union).
+
+    Args:
+        haystack: Image to search (BGR, or grayscale when grayscale=True)
+        template: Template to find
+        confidence: Minimum correlation score to accept
+        grayscale: Whether to use the grayscale template pixels
+        limit: Maximum number of results (defaults to Settings.FIND_ALL_LIMIT)
+
+    Returns:
+        List of (score, x, y) in haystack coordinates, best first
+    """
+    if haystack.shape[0] < template.height or haystack.shape[1] < template.width:
+        return []
+
+    limit = limit or Settings.FIND_ALL_LIMIT
+    result = cv2.matchTemplate(haystack, template.pixels(grayscale), cv2.TM_CCOEFF_NORMED, mask=template.mask)
+    if template.mask is not None:
+        result = np.nan_to_num(result, nan=0.0, posinf=0.0, neginf=0.0)
+
+    # Keep only local maxima so each hit's plateau yields one candidate
+    kernel = np.ones((max(template.height // 2, 1), max(template.width // 2, 1)), np.uint8)
+    peaks = (result >= confidence) & (result >= cv2.dilate(result, kernel))
+    ys, xs = np.nonzero(peaks)
+    order = np.argsort(-result[ys, xs], kind="stable")
+
+    kept: List[Tuple[float, int, int]] = []
+    area = template.width * template.height
+    for index in order:
+        x, y = int(xs[index]), int(ys[index])
+        overlaps = False
+        for _, kept_x, kept_y in kept:
+            overlap_w = template.width - abs(x - kept_x)
+            overlap_h = template.height - abs(y - kept_y)
+            if overlap_w > 0 and overlap_h > 0:
+                intersection = overlap_w * overlap_h
+                if intersection / (2 * area - intersection) > Settings.NMS_OVERLAP:
+                    overlaps = True
+                    break
+        if not overlaps:
+            kept.append((float(result[y, x]), x, y))
+            if len(kept) >= limit:
+                break
+
+    return kept
+
+
+def intersect_regions(
+    first: Tuple[int, int, int, int],
+    second: Optional[Tuple[int, int, int, int]]
+) -> Optional[Tuple[int, int, int, int]]:
+    """
+    Intersect two (x, y, width, height) regions.
+
+    Args:
+        first: First region
+        second: Second region, or None for no limit
+
+    Returns:
+        Overlapping region, or None if the regions do not overlap
+    """
+    if second is None:
+        return first
+
+    left = max(first[0], second[0])
+    top = max(first[1], second[1])
+    right = min(first[0] + first[2], second[0] + second[2])
+    bottom = min(first[1] + first[3], second[1] + second[3])
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right - left, bottom - top)
+
+
+class Frame:
+    """A single captured screen image shared by several template lookups."""
+
+    def __init__(self, image: np.ndarray, left: int = 0, top: int = 0):
+        """
+        Initialize a frame.
+
+        Args:
+            image: Captured pixels as a BGR or BGRA array (may be a view over
+                a capture backend's buffer)
+            left: Screen X coordinate of the image's top-left corner
+            top: Screen Y coordinate of the image's top-left corner
+        """
+        self.raw = image
+        self.left = left
+        self.top = top
+        self.captured_at = time.monotonic()
+        self._image = image if image.ndim == 3 and image.shape[2] == 3 else None
+        self._gray = None
+
+    @property
+    def image(self) -> np.ndarray:
+        """BGR version of the frame, converted on first use."""
+        if self._image is None:
+            self._image = cv2.cvtColor(self.raw, cv2.COLOR_BGRA2BGR)
+        return self._image
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale version of the frame, converted on first use."""
+        if self._gray is None:
+            code = cv2.COLOR_BGRA2GRAY if self.raw.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            self._gray = cv2.cvtColor(self.raw, code)
+        return self._gray
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the frame was captured."""
+        return time.monotonic() - self.captured_at
+
+    def crop(
+        self,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False
+    ) -> Tuple[np.ndarray, int, int]:
+        """
+        Get the pixels of a screen region without copying.
+
+        Args:
+            region: Region in screen coordinates (x, y, width, height), or
+                None for the whole frame
+            grayscale: Whether to return grayscale pixels
+
+        Returns:
+            Tuple of (pixels, screen x offset, screen y offset)
+        """
+        pixels = self.gray if grayscale else self.image
+        if region is None:
+            return pixels, self.left, self.top
+
+        x, y, width, height = region
+        height_px, width_px = pixels.shape[:2]
+        x0 = min(max(x - self.left, 0), width_px)
+        y0 = min(max(y - self.top, 0), height_px)
+        x1 = min(max(x - self.left + width, 0), width_px)
+        y1 = min(max(y - self.top + height, 0), height_px)
+        return pixels[y0:y1, x0:x1], x0 + self.left, y0 + self.top
+
+    def thumbnail(
+        self,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        factor: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Get a small grayscale copy of a region for cheap change detection.
+
+        Args:
+            region: Region in screen coordinates (x, y, width, height), or
+                None for the whole frame
+            factor: Downscale factor (defaults to Settings.CHANGE_THUMBNAIL_FACTOR)
+
+        Returns:
+            Grayscale array downscaled by factor
+        """
+        pixels, _, _ = self.crop(region, grayscale=True)
+        factor = factor or Settings.CHANGE_THUMBNAIL_FACTOR
+        size = (max(pixels.shape[1] // factor, 1), max(pixels.shape[0] // factor, 1))
+        return cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+
+
+def thumbnails_differ(previous: np.ndarray, current: np.ndarray) -> bool:
+    """
+    Check whether two thumbnails from Frame.thumbnail() show a real change.
+
+    Args:
+        previous: Earlier thumbnail
+        current: Later thumbnail of the same region
+
+    Returns:
+        True if at least Settings.CHANGE_MIN_PIXELS pixels moved by more than
+        Settings.CHANGE_PIXEL_DELTA (or the region size changed)
+    """
+    if previous.shape != current.shape:
+        return True
+    changed = cv2.absdiff(previous, current) > Settings.CHANGE_PIXEL_DELTA
+    return int(np.count_nonzero(changed)) >= Settings.CHANGE_MIN_PIXELS
+
+
+class Settler:
+    """Progress of one ScreenDetector.settle() wait, advanced by poll()."""
+
+    def __init__(
+        self,
+        detector: 'ScreenDetector',
+        timeout: float,
+        templates: List[Template],
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]]
+    ):
+        """
+        Initialize the wait.
+
+        Args:
+            detector: ScreenDetector to capture and match with
+            timeout: Maximum time to wait in seconds
+            templates: Templates that end the wait as soon as one appears
+            confidence: Confidence level for the templates
+            region: Region to watch (x, y, width, height)
+        """
+        self.detector = detector
+        self.timeout = timeout
+        self.templates = templates
+        self.confidence = confidence
+        self.region = region
+        self.start_time = time.monotonic()
+        self.deadline = self.start_time + timeout
+        self._previous = None
+        self._matched_thumbnail = None
+        self._last_match_time = float("-inf")
+        self._stable_since = self.start_time
+        self._changed = False
+
+    def poll(self) -> Tuple[bool, Optional[Box]]:
+        """
+        Capture a fresh frame and check whether the wait is over.
+
+        Returns:
+            Tuple of (done, box): box is where an expected template was
+            found, or None when the screen settled or the timeout passed
+        """
+        detector = self.detector
+        detector.invalidate()
+        thumbnail = detector.get_frame().thumbnail(self.region)
+        now = time.monotonic()
+
+        if self._previous is not None and thumbnails_differ(self._previous, thumbnail):
+            self._changed = True
+            self._stable_since = now
+        self._previous = thumbnail
+
+        if self.templates and now - self._last_match_time >= Settings.CHANGE_MIN_MATCH_INTERVAL and (
+            self._matched_thumbnail is None or thumbnails_differ(self._matched_thumbnail, thumbnail)
+        ):
+            for template in self.templates:
+                match = detector._search(template, self.confidence, self.region, grayscale=False)
+                if match:
+                    logger.debug(f"Settled on '{template.name}' after {now - self.start_time:.2f}s")
+                    return True, match.box
+            self._matched_thumbnail = thumbnail
+            self._last_match_time = now
+
+        quiet = now - self._stable_since
+        if quiet >= (Settings.SETTLE_STABLE_TIME if self._changed else Settings.SETTLE_QUIET_TIME):
+            logger.debug(f"Screen settled after {now - self.start_time:.2f}s")
+            return True, None
+
+        if now >= self.deadline:
+            logger.debug(f"Screen still changing after {self.timeout}s")
+            return True, None
+
+        return False, None
+
+    def next_delay(self) -> float:
+        """
+        Get how long to wait before the next poll().
+
+        Returns:
+            Seconds until the next poll, never past the deadline
+        """
+        return min(Settings.CHANGE_POLL_INTERVAL, max(self.deadline - time.monotonic(), 0))
+
 
 class ScreenDetector:
     """Handles screen detection and image recognition operations."""
 
-    def __init__(self, window_manager=None):
+    def __init__(
+        self,
+        window_manager=None,
+        templates: Optional[TemplateBank] = None,
+        capture_backend: Optional[CaptureBackend] = None,
+        input_sink: Optional[InputSink] = None,
+        profiler: Optional[Profiler] = None,
+        search_workers: Optional[int] = None
+    ):
         """
         Initialize the screen detector.
 
         Args:
             window_manager: WindowManager instance for window-specific operations
+            templates: Preloaded TemplateBank (templates are loaded on first
+                use when omitted)
+            capture_backend: Screen capture backend (defaults to
+                Settings.CAPTURE_BACKEND)
+            input_sink: Where clicks are sent (defaults to real pyautogui input)
+            profiler: Timing profiler (defaults to one built from Settings)
+            search_workers: Threads used for parallel searches (defaults to
+                Settings.SEARCH_WORKERS, 0 searches serially)
         """
         self.window_manager = window_manager
-        # Set PyAutoGUI safety settings
-        pyautogui.FAILSAFE = Settings.FAILSAFE
-        pyautogui.PAUSE = Settings.PAUSE
+        self.templates = templates if templates is not None else TemplateBank()
+        self.capture_backend = capture_backend or create_capture_backend()
+        self.input = input_sink or PyAutoGUIInput()
+        self.profiler = profiler or create_profiler()
+        self._frame: Optional[Frame] = None
+        self._pinned = 0
+        self._hints: Dict[str, Deque[Box]] = defaultdict(lambda: deque(maxlen=Settings.HINT_HISTORY))
+        self.hint_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.scale: Optional[float] = None
+        self._probed_at: Optional[float] = None
+        self._probe_lock = threading.Lock()
+        self._window_rect: Optional[Tuple[int, int, int, int]] = None
+        self.search_workers = Settings.SEARCH_WORKERS if search_workers is None else search_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.prefilter = PrefilterIndex() if Settings.PREFILTER_ENABLED else None
+        self.calibration = CalibrationProfile.load() if Settings.CALIBRATION_ENABLED else None
+        self._calibration_misses: Dict[str, int] = defaultdict(int)
+
+    def capture(self) -> Frame:
+        """
+        Capture the game window (or the full screen) as a new frame.
+
+        With Settings.CAPTURE_WINDOW_ONLY only the window rect is grabbed;
+        without a window the whole screen is.
+
+        Returns:
+            Freshly captured Frame
+        """
+        region = self._window_region() if Settings.CAPTURE_WINDOW_ONLY else None
+        with self.profiler.span("capture"):
+            image, left, top = self.capture_backend.grab(region)
+        return Frame(image, left, top)
+
+    def get_frame(self) -> Frame:
+        """
+        Get the frame lookups should run against.
+
+        Inside a snapshot() block the pinned frame is always reused. Outside
+        of one, a frame younger than Settings.SNAPSHOT_TTL is reused and an
+        older one is replaced by a fresh capture.
+
+        Returns:
+            Current Frame
+        """
+        if self._frame is not None and (self._pinned or self._frame.age < Settings.SNAPSHOT_TTL):
+            return self._frame
+
+        self._frame = self.capture()
+        return self._frame
+
+    def invalidate(self):
+        """Drop the cached frame so the next lookup captures a new one."""
+        if not self._pinned:
+            self._frame = None
+
+    @contextmanager
+    def snapshot(self) -> Iterator[Frame]:
+        """
+        Run several lookups against one captured frame.
+
+        The current frame (or a fresh capture if it is older than
+        Settings.SNAPSHOT_TTL) is pinned until the block exits. Clicks made
+        inside the block do not refresh it, so only group lookups that
+        belong to the same UI state.
+
+        Yields:
+            The pinned Frame
+        """
+        self.get_frame()
+        self._pinned += 1
+        try:
+            yield self._frame
+        finally:
+            self._pinned -= 1
+            if not self._pinned:
+                self._frame = None
+
+    def _pool(self) -> Optional[ThreadPoolExecutor]:
+        """
+        Get the thread pool for parallel searches.
+
+        Returns:
+            The shared executor, or None when search_workers is 0
+        """
+        if self.search_workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.search_workers, thread_name_prefix="search")
+        return self._executor
+
+    def close(self):
+        """Shut down the search thread pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def _tile_count(haystack: np.ndarray, template: Template, grayscale: bool) -> int:
+        """
+        Decide how many bands a search should be split into.
+
+        The count does not depend on the thread pool, so serial and parallel
+        searches match the very same bands. Pyramid searches stay in one
+        piece: their coarse pass is cheap, and its grid would shift between
+        bands.
+
+        Args:
+            haystack: Image about to be searched
+            template: Template about to be matched
+            grayscale: Whether the grayscale template pixels will be used
+
+        Returns:
+            Number of bands (1 means search in one piece)
+        """
+        if haystack.shape[0] * haystack.shape[1] < Settings.SEARCH_TILE_MIN_AREA:
+            return 1
+        if search_factor(haystack, template, grayscale) > 1:
+            return 1
+        return max(min(Settings.SEARCH_TILES, haystack.shape[0] // (2 * template.height)), 1)
+
+    def _match_region(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        grayscale: bool,
+        frame: Optional[Frame] = None,
+        parallel: bool = True
+    ) -> Optional[Match]:
+        """
+        Match a template against one region of a frame.
+
+        Args:
+            template: Template to find
+            confidence: Minimum normalized correlation score to accept
+            region: Region to search in (x, y, width, height)
+            grayscale: Whether to match in grayscale
+            frame: Frame to search (defaults to the current frame)
+            parallel: Whether the bands of a large region may run on the
+                search thread pool (False when already running on it)
+
+        Returns:
+            Best Match or None if nothing scored high enough
+        """
+        if frame is None:
+            frame = self.get_frame()
+        haystack, offset_x, offset_y = frame.crop(region, grayscale)
+        tiles = self._tile_count(haystack, template, grayscale)
+        with self.profiler.span("match"):
+            if tiles > 1:
+                score, x, y = match_tiled(haystack, template, grayscale, self._pool() if parallel else None, tiles)
+            else:
+                score, x, y = match_template(haystack, template, grayscale)
+        if score < confidence:
+            return None
+
+        return Match(Box(offset_x + x, offset_y + y, template.width, template.height), score)
+
+    def _scales(self) -> Tuple[float, ...]:
+        """
+        Get the template scales a search should try.
+
+        Returns:
+            The locked scale, detected with detect_scale() on first use, or
+            1.0 while no scale could be detected
+        """
+        if self.scale is not None:
+            return (self.scale,)
+        if not Settings.MULTI_SCALE_ENABLED:
+            return (1.0,)
+        return (self.detect_scale() or 1.0,)
+
+    def detect_scale(self) -> Optional[float]:
+        """
+        Work out the scale the window is drawn at with one probe, and lock it.
+
+        Every Settings.SCALE_PROBE_IMAGES template (the Settings.SCENES
+        markers by default) is matched at every Settings.TEMPLATE_SCALES
+        factor against one grayscale copy of the window, downscaled by
+        Settings.SCALE_PROBE_FACTOR. The best of those is confirmed with one
+        exact match, and locked if it scores Settings.SCALE_LOCK_CONFIDENCE.
+        Searches never try several scales themselves, so a miss costs one
+        search and a low-confidence lookup gets one chance at a false hit.
+
+        Returns:
+            The locked scale, or None if nothing on screen confirmed one (the
+            probe is then repeated after Settings.SCALE_PROBE_RETRY seconds)
+        """
+        if self.scale is not None or not Settings.MULTI_SCALE_ENABLED:
+            return self.scale
+
+        with self._probe_lock:
+            now = time.monotonic()
+            if self.scale is not None or (
+                self._probed_at is not None and now - self._probed_at < Settings.SCALE_PROBE_RETRY
+            ):
+                return self.scale
+            self._probed_at = now
+
+            with self.profiler.span("probe"):
+                frame = self.get_frame()
+                region = self._window_region()
+                factor = Settings.SCALE_PROBE_FACTOR
+                thumbnail = frame.thumbnail(region, factor)
+                paths = Settings.SCALE_PROBE_IMAGES or [
+                    path for paths in Settings.SCENES.values() for path in paths
+                ]
+
+                best = (-1.0, None, None)
+                for path in paths:
+                    try:
+                        template = self.templates.resolve(path)
+                    except FileNotFoundError as e:
+                        logger.debug(f"Skipping scale probe image: {e}")
+                        continue
+                    for scale in Settings.TEMPLATE_SCALES:
+                        pixels = template.scaled(scale).downscaled(factor, grayscale=True)
+                        if pixels.shape[0] > thumbnail.shape[0] or pixels.shape[1] > thumbnail.shape[1]:
+                            continue
+                        _, score, _, _ = cv2.minMaxLoc(cv2.matchTemplate(thumbnail, pixels, cv2.TM_CCOEFF_NORMED))
+                        if score > best[0]:
+                            best = (score, template, scale)
+
+                _, template, scale = best
+                if template is not None:
+                    haystack, _, _ = frame.crop(region)
+                    score, _, _ = match_template(haystack, template.scaled(scale))
+                    if score >= Settings.SCALE_LOCK_CONFIDENCE:
+                        self.scale = scale
+                        logger.info(f"Locked template scale at {scale} ('{template.name}' scored {score:.2f})")
+                        return self.scale
+
+            logger.warning(
+                f"Could not detect the window scale, searching at 1.0 "
+                f"(probing again in {Settings.SCALE_PROBE_RETRY:.0f}s)"
+            )
+            return None
+
+    def _lock_scale(self, scale: float, score: float):
+        """
+        Keep searching at one scale once a match has shown which one fits.
+
+        Args:
+            scale: Scale of the template that matched
+            score: Score of the match
+        """
+        if self.scale is not None or not Settings.MULTI_SCALE_ENABLED:
+            return
+        if score >= Settings.SCALE_LOCK_CONFIDENCE:
+            self.scale = scale
+            logger.info(f"Locked template scale at {scale} (match score {score:.2f})")
+
+    def reset_scale(self):
+        """Forget the locked scale (e.g. after the window was resized)."""
+        self.scale = None
+        self._probed_at = None
+        self.clear_hints()
+
+    def _search(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        grayscale: bool,
+        frame: Optional[Frame] = None,
+        parallel: bool = True
+    ) -> Optional[Match]:
+        """
+        Match a template at the locked scale, or at each candidate scale.
+
+        The scale comes from _scales(); while it is not detected, a
+        confident hit at 1.0 locks 1.0. Calibrated templates are searched
+        with their calibrated confidence and region (see _calibrated());
+        after Settings.CALIBRATION_FALLBACK_MISSES misses in a row there, one
+        lookup also searches the whole requested region, without hints, in
+        case the layout moved.
+
+        Args:
+            template: Template to find (at its original scale)
+            confidence: Minimum normalized correlation score to accept
+            region: Region to search in (x, y, width, height)
+            grayscale: Whether to match in grayscale
+            frame: Frame to search (defaults to the current frame)
+            parallel: Whether the bands of large regions may run on the search
+                thread pool
+
+        Returns:
+            Best Match or None if nothing scored high enough
+        """
+        if frame is None:
+            frame = self.get_frame()
+        confidence, calibrated = self._calibrated(template, confidence, region, grayscale)
+        match = self._search_scales(template, confidence, calibrated, grayscale, frame, parallel)
+        if match or calibrated == region:
+            return match
+
+        self._calibration_misses[template.name] += 1
+        if self._calibration_misses[template.name] < Settings.CALIBRATION_FALLBACK_MISSES:
+            return None
+        self._calibration_misses[template.name] = 0
+        match = self._search_scales(template, confidence, region, grayscale, frame, parallel, hints=False)
+        if match:
+            logger.warning(f"'{template.name}' was found outside its calibrated region, recalibrate if the layout changed")
+        return match
+
+    def _search_scales(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        grayscale: bool,
+        frame: Frame,
+        parallel: bool,
+        hints: bool = True
+    ) -> Optional[Match]:
+        """
+        Match a template at each scale from _scales() until one hits.
+
+        Args:
+            template: Template to find (at its original scale)
+            confidence: Minimum normalized correlation score to accept
+            region: Region to search in (x, y, width, height)
+            grayscale: Whether to match in grayscale
+            frame: Frame to search
+            parallel: Whether the bands of large regions may run on the search
+                thread pool
+            hints: Whether to try remembered locations first
+
+        Returns:
+            Best Match or None if nothing scored high enough
+        """
+        for scale in self._scales():
+            match = self._search_scaled(template.scaled(scale), confidence, region, grayscale, frame, parallel, hints)
+            if match:
+                self._calibration_misses.pop(template.name, None)
+                self._lock_scale(scale, match.score)
+                return match
+        return None
+
+    def _calibrated(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        grayscale: bool
+    ) -> Tuple[float, Optional[Tuple[int, int, int, int]]]:
+        """
+        Apply a template's calibration profile entry to a lookup.
+
+        The calibrated confidence only ever raises the requested one, and
+        only for color lookups, since it was measured in color. The search
+        region is narrowed to the calibrated region once the scale is known
+        (a region measured at another scale could cut the template off); a
+        caller's region that does not overlap it is kept as is.
+
+        Args:
+            template: Template about to be searched for
+            confidence: Requested confidence
+            region: Requested region in screen coordinates, or None
+            grayscale: Whether the lookup matches in grayscale
+
+        Returns:
+            Tuple of (confidence, region) to search with; the region is the
+            requested one itself when it was not narrowed
+        """
+        calibration = self.calibration.get(template) if self.calibration else None
+        if calibration is None:
+            return confidence, region
+
+        if calibration.confidence is not None and not grayscale:
+            confidence = max(confidence, calibration.confidence)
+        if calibration.region is not None and (self.scale is not None or not Settings.MULTI_SCALE_ENABLED):
+            narrowed = intersect_regions(self.window_region(calibration.region), region)
+            if narrowed is not None:
+                region = narrowed
+        return confidence, region
+
+    def _search_scaled(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        grayscale: bool,
+        frame: Frame,
+        parallel: bool,
+        hints: bool = True
+    ) -> Optional[Match]:
+        """
+        Match a template, trying the places it was last found first.
+
+        Each remembered location is searched with Settings.HINT_PADDING
+        pixels of slack. Only when none of them matches is the whole region
+        searched. Outcomes are counted in hint_stats.
+
+        Args:
+            template: Template to find
+            confidence: Minimum normalized correlation score to accept
+            region: Region to search in (x, y, width, height)
+            grayscale: Whether to match in grayscale
+            frame: Frame to search
+            parallel: Whether the bands of large regions may run on the search
+                thread pool
+            hints: Whether to try remembered locations first
+
+        Returns:
+            Best Match or None if nothing scored high enough
+        """
+        hints = self._hints[template.name] if hints and Settings.HINTS_ENABLED else ()
+        pad = Settings.HINT_PADDING
+        for hint in reversed(hints):
+            hint_region = intersect_regions(
+                (hint.left - pad, hint.top - pad, hint.width + 2 * pad, hint.height + 2 * pad),
+                region
+            )
+            if hint_region is None:
+                continue
+
+            match = self._match_region(template, confidence, hint_region, grayscale, frame, parallel)
+            if match:
+                self.hint_stats[template.name]["hits"] += 1
+                self._remember(template, match.box)
+                return match
+
+        if hints:
+            self.hint_stats[template.name]["misses"] += 1
+
+        if not self._may_contain(template, confidence, region, frame):
+            return None
+
+        match = self._match_region(template, confidence, region, grayscale, frame, parallel)
+        if match:
+            self._remember(template, match.box)
+        return match
+
+    def _may_contain(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        frame: Frame
+    ) -> bool:
+        """
+        Ask the prefilter whether a full search for a template is worthwhile.
+
+        Args:
+            template: Template about to be searched for
+            confidence: Confidence of the lookup
+            region: Region about to be searched
+            frame: Frame about to be searched
+
+        Returns:
+            False if the prefilter ruled the template out, True otherwise
+        """
+        if self.prefilter is None or confidence < Settings.PREFILTER_MIN_CONFIDENCE:
+            return True
+        with self.profiler.span("prefilter"):
+            return self.prefilter.may_contain(frame, template, region)
+
+    def _remember(self, template: Template, box: Box):
+        """
+        Record where a template was found, most recent last.
+
+        Args:
+            template: Template that was found
+            box: Where it was found
+        """
+        hints = self._hints[template.name]
+        pad = Settings.HINT_PADDING
+        for index, hint in enumerate(hints):
+            if abs(hint.left - box.left) <= pad and abs(hint.top - box.top) <= pad:
+                del hints[index]
+                break
+        hints.append(box)
+
+    def _locate(
+        self,
+        template: Template,
+        confidence: float,
+        region: Optional[Tuple[int, int, int, int]],
+        grayscale: bool
+    ) -> Optional[Box]:
+        """
+        Match a template against the current frame.
+
+        Args:
+            template: Template to find
+            confidence: Minimum normalized correlation score to accept
+            region: Region to search in (x, y, width, height)
+            grayscale: Whether to match in grayscale
+
+        Returns:
+            Box of the best match or None if nothing scored high enough
+        """
+        match = self._search(template, confidence, region, grayscale)
+        return match.box if match else None
+
+    def clear_hints(self):
+        """Forget all remembered template locations (e.g. after the window moved)."""
+        self._hints.clear()
+
+    def get_hint_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get how often location hints avoided a full search.
+
+        Returns:
+            Dictionary of template name to {'hits', 'misses'} counts, plus a
+            'total' entry summing all templates
+        """
+        stats = {name: dict(counts) for name, counts in self.hint_stats.items()}
+        stats["total"] = {
+            "hits": sum(counts["hits"] for counts in self.hint_stats.values()),
+            "misses": sum(counts["misses"] for counts in self.hint_stats.values()),
+        }
+        return stats
+
+    def _window_region(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get the game window rect as a search region.
+
+        Remembered locations are dropped when the window moved, and the
+        locked scale as well when it was resized.
+
+        Returns:
+            Region (x, y, width, height) or None if no window is available
+        """
+        if not self.window_manager:
+            return None
+
+        rect = self.window_manager.rect
+        if rect is None:
+            return None
+
+        previous = self._window_rect
+        if previous is not None and rect != previous:
+            if rect[2:] != previous[2:]:
+                logger.info(f"Window resized from {previous[2:]} to {rect[2:]}")
+                self.reset_scale()
+            else:
+                logger.debug(f"Window moved to {rect[:2]}")
+                self.clear_hints()
+        self._window_rect = rect
+        return rect
+
+    def window_point(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        Convert a window-relative point to screen coordinates.
+
+        Offsets are measured at the scale the images were captured at and
+        are stretched by the locked template scale.
+
+        Args:
+            x: X offset from the window's left edge
+            y: Y offset from the window's top edge
+
+        Returns:
+            Tuple of (x, y) screen coordinates
+        """
+        scale = self.scale or 1.0
+        x, y = int(round(x * scale)), int(round(y * scale))
+        if not self.window_manager:
+            return x, y
+        return self.window_manager.to_screen(x, y)
+
+    def window_region(self, region: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """
+        Convert a window-relative region to screen coordinates.
+
+        Args:
+            region: Region (x, y, width, height) relative to the window, at
+                the scale the images were captured at
+
+        Returns:
+            Region in screen coordinates
+        """
+        scale = self.scale or 1.0
+        x, y = self.window_point(region[0], region[1])
+        return (x, y, int(round(region[2] * scale)), int(round(region[3] * scale)))
 
     def find_on_screen(
         self,
-        image_path: str,
+        image: Union[str, Template],
         confidence: float = None,
         region: Optional[Tuple[int, int, int, int]] = None,
         grayscale: bool = False
@@ -39,7 +1166,7 @@ class ScreenDetector:
         Find an image on the screen.
 
         Args:
-            image_path: Path to the image file to find
+            image: Template, template name or image file path to find
             confidence: Confidence level for image matching (0.0 to 1.0)
             region: Region to search in (x, y, width, height)
             grayscale: Whether to use grayscale for faster searching
@@ -50,27 +1177,23 @@ class ScreenDetector:
         confidence = confidence or Settings.CONFIDENCE_MEDIUM
 
         try:
-            location = pyautogui.locateOnScreen(
-                image_path,
-                confidence=confidence,
-                region=region,
-                grayscale=grayscale
-            )
+            template = self.templates.resolve(image)
+            location = self._locate(template, confidence, region, grayscale)
 
             if location:
-                logger.debug(f"Found image '{image_path}' at {location}")
+                logger.debug(f"Found image '{template.name}' at {location}")
             else:
-                logger.debug(f"Image '{image_path}' not found on screen")
+                logger.debug(f"Image '{template.name}' not found on screen")
 
             return location
 
         except Exception as e:
-            logger.error(f"Error finding image '{image_path}': {e}")
+            logger.error(f"Error finding image '{image}': {e}")
             return None
 
     def find_on_window(
         self,
-        image_path: str,
+        image: Union[str, Template],
         confidence: float = None,
         limit: Optional[Box] = None
     ) -> Optional[Box]:
@@ -78,49 +1201,169 @@ class ScreenDetector:
         Find an image within the game window.
 
         Args:
-            image_path: Path to the image file to find
+            image: Template, template name or image file path to find
             confidence: Confidence level for image matching
             limit: Bounding box to limit search area
 
         Returns:
             Box object with image location or None if not found
         """
-        if not self.window_manager or not self.window_manager.window:
-            logger.warning("Window manager not set, falling back to screen search")
-            return self.find_on_screen(image_path, confidence)
+        if self._window_region() is None:
+            logger.warning("Game window not available, falling back to screen search")
+            return self.find_on_screen(image, confidence)
 
         confidence = confidence or Settings.CONFIDENCE_MEDIUM
 
         try:
+            template = self.templates.resolve(image)
             if limit:
                 # Search within a limited region
-                location = pyautogui.locateOnScreen(
-                    image_path,
-                    region=(limit.left, limit.top, limit.width, limit.height),
-                    confidence=confidence
-                )
+                region = (limit.left, limit.top, limit.width, limit.height)
             else:
                 # Search within the window
-                location = pyautogui.locateOnWindow(
-                    image_path,
-                    title=self.window_manager.window.title,
-                    confidence=confidence
-                )
+                region = self._window_region()
+
+            location = self._locate(template, confidence, region, grayscale=False)
 
             if location:
-                logger.debug(f"Found image '{image_path}' in window at {location}")
+                logger.debug(f"Found image '{template.name}' in window at {location}")
             else:
-                logger.debug(f"Image '{image_path}' not found in window")
+                logger.debug(f"Image '{template.name}' not found in window")
 
             return location
 
         except Exception as e:
-            logger.error(f"Error finding image '{image_path}' in window: {e}")
+            logger.error(f"Error finding image '{image}' in window: {e}")
             return None
 
+    def find_many(
+        self,
+        images: Dict[str, Union[str, Template]],
+        confidence: Union[float, Dict[str, float]] = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False
+    ) -> Dict[str, Match]:
+        """
+        Find several images in one frame.
+
+        The frame is captured, cropped and color-converted once and every
+        template is matched against that same buffer, so asking which of N
+        dialogs is visible costs one capture instead of N. With search
+        workers configured and the template scale locked, the templates are
+        matched concurrently; the result is the same as a serial search.
+
+        Args:
+            images: Mapping of result name to template, template name or path
+            confidence: Confidence for all templates, or a mapping of result
+                name to confidence (missing names use CONFIDENCE_MEDIUM)
+            region: Region to search in (x, y, width, height), defaults to
+                the game window (or the whole screen without one)
+            grayscale: Whether to match in grayscale
+
+        Returns:
+            Dictionary of result name to Match for every image that was found
+        """
+        if region is None:
+            region = self._window_region()
+
+        hits = {}
+        try:
+            with self.snapshot() as frame:
+                lookups = []
+                for name, image in images.items():
+                    template = self.templates.resolve(image)
+                    if isinstance(confidence, dict):
+                        threshold = confidence.get(name) or Settings.CONFIDENCE_MEDIUM
+                    else:
+                        threshold = confidence or Settings.CONFIDENCE_MEDIUM
+                    lookups.append((name, template, threshold))
+
+                pool = self._pool()
+                names = {template.name for _, template, _ in lookups}
+                # Until the scale is locked, an earlier hit changes which scales
+                # later templates are tried at, so only then is order-free
+                if pool and len(lookups) > 1 and len(names) == len(lookups) and len(self._scales()) == 1:
+                    for template_name in names:
+                        # Create per-template state here, not on the worker threads
+                        self._hints[template_name]
+                        self.hint_stats[template_name]
+                    futures = [
+                        (name, pool.submit(self._search, template, threshold, region, grayscale, frame, False))
+                        for name, template, threshold in lookups
+                    ]
+                    results = [(name, future.result()) for name, future in futures]
+                else:
+                    results = [
+                        (name, self._search(template, threshold, region, grayscale, frame))
+                        for name, template, threshold in lookups
+                    ]
+
+                for name, match in results:
+                    if match:
+                        hits[name] = match
+
+            logger.debug(f"find_many found {sorted(hits)} of {sorted(images)}")
+
+        except Exception as e:
+            logger.error(f"Error finding images {sorted(images)}: {e}")
+
+        return hits
+
+    def find_all(
+        self,
+        image: Union[str, Template],
+        confidence: float = None,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        grayscale: bool = False,
+        limit: Optional[int] = None
+    ) -> List[Match]:
+        """
+        Find every non-overlapping occurrence of an image in one frame.
+
+        Args:
+            image: Template, template name or image file path to find
+            confidence: Confidence level for image matching
+            region: Region to search in (x, y, width, height), defaults to
+                the game window (or the whole screen without one)
+            grayscale: Whether to match in grayscale
+            limit: Maximum number of matches (defaults to Settings.FIND_ALL_LIMIT)
+
+        Returns:
+            List of Match objects ranked by score, best first (empty if none)
+        """
+        confidence = confidence or Settings.CONFIDENCE_MEDIUM
+        if region is None:
+            region = self._window_region()
+
+        try:
+            template = self.templates.resolve(image)
+            frame = self.get_frame()
+            haystack, offset_x, offset_y = frame.crop(region, grayscale)
+            hits = []
+            for scale in self._scales():
+                scaled = template.scaled(scale)
+                if not self._may_contain(scaled, confidence, region, frame):
+                    continue
+                with self.profiler.span("match"):
+                    hits = match_all(haystack, scaled, confidence, grayscale, limit)
+                if hits:
+                    self._lock_scale(scale, hits[0][0])
+                    break
+
+            matches = [
+                Match(Box(offset_x + x, offset_y + y, scaled.width, scaled.height), score)
+                for score, x, y in hits
+            ]
+            logger.debug(f"Found {len(matches)} occurrences of '{template.name}'")
+            return matches
+
+        except Exception as e:
+            logger.error(f"Error finding all occurrences of '{image}': {e}")
+            return []
+
     def click_image(
         self,
-        image_path: str,
+        image: Union[str, Template],
         confidence: float = None,
         clicks: int = 1,
         interval: float = 0.0,
@@ -131,7 +1374,7 @@ class ScreenDetector:
         Find and click an image.
 
         Args:
-            image_path: Path to the image file to click
+            image: Template, template name or image file path to click
             confidence: Confidence level for image matching
             clicks: Number of clicks
             interval: Interval between clicks
@@ -143,20 +1386,24 @@ class ScreenDetector:
         """
         try:
             if on_window:
-                location = self.find_on_window(image_path, confidence)
+                location = self.find_on_window(image, confidence)
             else:
-                location = self.find_on_screen(image_path, confidence)
+                location = self.find_on_screen(image, confidence)
 
             if location:
-                pyautogui.click(location, clicks=clicks, interval=interval, button=button)
-                logger.info(f"Clicked image '{image_path}' at {location}")
+                center_x = location.left + location.width // 2
+                center_y = location.top + location.height // 2
+                with self.profiler.span("click"):
+                    self.input.click(center_x, center_y, clicks=clicks, interval=interval, button=button)
+                self.invalidate()
+                logger.info(f"Clicked image '{image}' at {location}")
                 return True
             else:
-                logger.warning(f"Could not click '{image_path}' - image not found")
+                logger.warning(f"Could not click '{image}' - image not found")
                 return False
 
         except Exception as e:
-            logger.error(f"Error clicking image '{image_path}': {e}")
+            logger.error(f"Error clicking image '{image}': {e}")
             return False
 
     def click_position(
@@ -181,45 +1428,212 @@ class ScreenDetector:
             True if successful, False otherwise
         """
         try:
-            pyautogui.click(x, y, clicks=clicks, interval=interval, button=button)
+            with self.profiler.span("click"):
+                self.input.click(x, y, clicks=clicks, interval=interval, button=button)
+            self.invalidate()
             logger.debug(f"Clicked position ({x}, {y})")
             return True
         except Exception as e:
             logger.error(f"Error clicking position ({x}, {y}): {e}")
             return False
 
+    def drag(self, start: Tuple[int, int], end: Tuple[int, int], duration: float = 0.3) -> bool:
+        """
+        Drag the mouse between two screen positions (e.g. to pan the map).
+
+        Args:
+            start: Screen (x, y) where the button is pressed
+            end: Screen (x, y) where it is released
+            duration: Seconds the movement takes
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            with self.profiler.span("click"):
+                self.input.drag(start, end, duration)
+            self.invalidate()
+            logger.debug(f"Dragged from {start} to {end}")
+            return True
+        except Exception as e:
+            logger.error(f"Error dragging from {start} to {end}: {e}")
+            return False
+
     def wait_for_image(
         self,
-        image_path: str,
+        image: Union[str, Template],
         timeout: float = 10.0,
         confidence: float = None,
-        check_interval: float = 0.5
+        check_interval: float = 0.5,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        on_change: bool = True
     ) -> Optional[Box]:
         """
         Wait for an image to appear on screen.
 
+        By default the screen is sampled every Settings.CHANGE_POLL_INTERVAL
+        and the template match only re-runs when a downscaled copy of the
+        search region differs from the one last matched, so idle waits cost
+        a capture and a tiny diff per poll instead of a full match.
+
         Args:
-            image_path: Path to the image file to wait for
+            image: Template, template name or image file path to wait for
             timeout: Maximum time to wait in seconds
             confidence: Confidence level for image matching
-            check_interval: Time between checks in seconds
+            check_interval: Time between checks in seconds (fixed-interval
+                mode only)
+            region: Region to watch (x, y, width, height), defaults to the
+                game window
+            on_change: Whether to re-match only when the region changes;
+                False re-matches every check_interval
 
         Returns:
             Box object with image location or None if timeout
         """
-        logger.debug(f"Waiting for image '{image_path}' (timeout: {timeout}s)")
+        if on_change:
+            return self._wait_for_change(image, timeout, confidence, region)
+
+        logger.debug(f"Waiting for image '{image}' (timeout: {timeout}s)")
         start_time = time.time()
 
         while time.time() - start_time < timeout:
-            location = self.find_on_window(image_path, confidence)
+            location = self.find_on_window(image, confidence)
             if location:
-                logger.info(f"Image '{image_path}' appeared after {time.time() - start_time:.1f}s")
+                logger.info(f"Image '{image}' appeared after {time.time() - start_time:.1f}s")
                 return location
             time.sleep(check_interval)
 
-        logger.warning(f"Timeout waiting for image '{image_path}'")
+        logger.warning(f"Timeout waiting for image '{image}'")
+        return None
+
+    def _wait_for_change(
+        self,
+        image: Union[str, Template],
+        timeout: float,
+        confidence: Optional[float],
+        region: Optional[Tuple[int, int, int, int]]
+    ) -> Optional[Box]:
+        """
+        Change-driven implementation of wait_for_image().
+
+        Args:
+            image: Template, template name or image file path to wait for
+            timeout: Maximum time to wait in seconds
+            confidence: Confidence level for image matching
+            region: Region to watch, defaults to the game window
+
+        Returns:
+            Box object with image location or None if timeout
+        """
+        logger.debug(f"Waiting for image '{image}' on screen changes (timeout: {timeout}s)")
+        confidence = confidence or Settings.CONFIDENCE_MEDIUM
+        if region is None:
+            region = self._window_region()
+
+        try:
+            template = self.templates.resolve(image)
+        except Exception as e:
+            logger.error(f"Error waiting for image '{image}': {e}")
+            return None
+
+        start_time = time.monotonic()
+        deadline = start_time + timeout
+        matched_thumbnail = None
+        last_match_time = float("-inf")
+
+        while True:
+            frame = self.get_frame()
+            thumbnail = frame.thumbnail(region)
+            now = time.monotonic()
+
+            changed = matched_thumbnail is None or thumbnails_differ(matched_thumbnail, thumbnail)
+            if changed and now - last_match_time >= Settings.CHANGE_MIN_MATCH_INTERVAL:
+                match = self._search(template, confidence, region, grayscale=False)
+                if match:
+                    logger.info(f"Image '{template.name}' appeared after {now - start_time:.1f}s")
+                    return match.box
+                matched_thumbnail = thumbnail
+                last_match_time = now
+
+            if now >= deadline:
+                break
+
+            time.sleep(min(Settings.CHANGE_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+            self.invalidate()
+
+        logger.warning(f"Timeout waiting for image '{template.name}'")
         return None
 
+    def settle(
+        self,
+        timeout: float,
+        expect: Union[str, Template, Sequence[Union[str, Template]], None] = None,
+        confidence: float = None,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[Box]:
+        """
+        Wait for the UI to finish reacting to the last click.
+
+        Returns as soon as one of the expected templates is visible, or once
+        the watched region has stopped changing: unchanged for
+        Settings.SETTLE_STABLE_TIME after it changed, or for
+        Settings.SETTLE_QUIET_TIME if it never changed at all. The timeout
+        is only an upper bound, so a fixed delay can be swapped for
+        settle(delay) without ever waiting longer than before.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+            expect: Template(s), name(s) or path(s) that end the wait as soon
+                as any of them appears
+            confidence: Confidence level for the expected templates
+            region: Region to watch (x, y, width, height), defaults to the
+                game window
+
+        Returns:
+            Box of the first expected template found, or None if the screen
+            settled (or the timeout passed) without it
+        """
+        with self.profiler.span("settle"):
+            settler = self.settler(timeout, expect, confidence, region)
+            if settler is None:
+                return None
+            while True:
+                done, box = settler.poll()
+                if done:
+                    return box
+                time.sleep(settler.next_delay())
+
+    def settler(
+        self,
+        timeout: float,
+        expect: Union[str, Template, Sequence[Union[str, Template]], None] = None,
+        confidence: float = None,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional['Settler']:
+        """
+        Start a settle() wait that the caller polls itself.
+
+        Lets callers that must not block (e.g. the asyncio runtime) sleep
+        between polls their own way. Arguments are the same as settle().
+
+        Returns:
+            Settler to poll, or None if an expected template cannot be loaded
+        """
+        confidence = confidence or Settings.CONFIDENCE_MEDIUM
+        if region is None:
+            region = self._window_region()
+        if expect is None:
+            expect = ()
+        elif isinstance(expect, (str, Template)):
+            expect = (expect,)
+
+        try:
+            templates = [self.templates.resolve(image) for image in expect]
+        except Exception as e:
+            logger.error(f"Error settling on {expect}: {e}")
+            return None
+        return Settler(self, timeout, templates, confidence, region)
+
     def get_mouse_position(self) -> Tuple[int, int]:
         """
         Get current mouse position.
@@ -227,4 +1641,4 @@ class ScreenDetector:
         Returns:
             Tuple of (x, y) coordinates
         """
-        return pyautogui.position()
+        return self.input.position()
@@ -0,0 +1,246 @@
+"""Preloaded template images for screen detection."""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+
+from config.settings import Settings
+from src.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class Template:
+    """A template image decoded once and kept in memory."""
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        color: np.ndarray,
+        mask: Optional[np.ndarray] = None,
+        scale: float = 1.0
+    ):
+        """
+        Initialize a template.
+
+        Args:
+            name: Short name of the template (e.g. 'train')
+            path: Path of the image file the template was loaded from
+            color: Template pixels as a BGR array
+            mask: Optional single-channel mask (non-zero = pixel is matched)
+            scale: Size relative to the image file (1.0 for the original)
+        """
+        self.name = name
+        self.path = path
+        self.color = color
+        self.gray = cv2.cvtColor(color, cv2.COLOR_BGR2GRAY)
+        self.mask = mask
+        self.scale = scale
+        self.height, self.width = color.shape[:2]
+        self._downscaled: Dict[Tuple[int, bool], np.ndarray] = {}
+        self._scaled: Dict[float, 'Template'] = {1.0: self} if scale == 1.0 else {}
+
+    @classmethod
+    def from_file(cls, path: str, name: Optional[str] = None) -> 'Template':
+        """
+        Load and decode a template from an image file.
+
+        A mask is only kept when the file has an alpha channel that is not
+        fully opaque, since masked matching is slower than plain matching.
+
+        Args:
+            path: Path to the image file
+            name: Short name of the template (defaults to the file stem)
+
+        Returns:
+            Loaded Template
+
+        Raises:
+            FileNotFoundError: If the file does not exist or cannot be decoded
+        """
+        # imdecode instead of imread so non-ASCII paths work on Windows
+        data = np.fromfile(path, dtype=np.uint8) if Path(path).exists() else None
+        image = cv2.imdecode(data, cv2.IMREAD_UNCHANGED) if data is not None else None
+        if image is None:
+            raise FileNotFoundError(f"Could not read image file: {path}")
+
+        mask = None
+        if image.ndim == 2:
+            color = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        elif image.shape[2] == 4:
+            color = np.ascontiguousarray(image[:, :, :3])
+            alpha = image[:, :, 3]
+            if alpha.min() < 255:
+                mask = np.where(alpha > 0, 255, 0).astype(np.uint8)
+        else:
+            color = image
+
+        return cls(name or Path(path).stem, str(path), color, mask)
+
+    def pixels(self, grayscale: bool = False) -> np.ndarray:
+        """
+        Get the template pixels.
+
+        Args:
+            grayscale: Whether to return the grayscale version
+
+        Returns:
+            Template pixel array
+        """
+        return self.gray if grayscale else self.color
+
+    def downscaled(self, factor: int, grayscale: bool = False) -> np.ndarray:
+        """
+        Get the template pixels shrunk by an integer factor.
+
+        Args:
+            factor: Downscale factor (e.g. 4 for quarter size)
+            grayscale: Whether to return the grayscale version
+
+        Returns:
+            Downscaled template pixel array, cached after the first call
+        """
+        key = (factor, grayscale)
+        if key not in self._downscaled:
+            size = (max(self.width // factor, 1), max(self.height // factor, 1))
+            self._downscaled[key] = cv2.resize(self.pixels(grayscale), size, interpolation=cv2.INTER_AREA)
+        return self._downscaled[key]
+
+    def scaled(self, scale: float) -> 'Template':
+        """
+        Get this template resized for a window drawn at a different scale.
+
+        Args:
+            scale: Size relative to the original image (e.g. 1.25 for a
+                window at 125% DPI scaling)
+
+        Returns:
+            Rescaled Template with the same name, cached after the first call
+        """
+        if scale not in self._scaled:
+            size = (max(int(round(self.width * scale)), 1), max(int(round(self.height * scale)), 1))
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            color = cv2.resize(self.color, size, interpolation=interpolation)
+            mask = None
+            if self.mask is not None:
+                mask = cv2.resize(self.mask, size, interpolation=cv2.INTER_NEAREST)
+            self._scaled[scale] = Template(self.name, self.path, color, mask, scale)
+        return self._scaled[scale]
+
+    def __repr__(self) -> str:
+        if self.scale != 1.0:
+            return f"Template({self.name!r}, {self.width}x{self.height}, scale={self.scale})"
+        return f"Template({self.name!r}, {self.width}x{self.height})"
+
+
+class TemplateBank:
+    """Registry of decoded templates, looked up by name or file path."""
+
+    def __init__(self):
+        """Initialize an empty template bank."""
+        self._by_name: Dict[str, Template] = {}
+        self._by_path: Dict[str, Template] = {}
+
+    @classmethod
+    def from_settings(cls) -> 'TemplateBank':
+        """
+        Build a bank holding every Settings.IMAGE_* template.
+
+        Templates are named after their setting, e.g. IMAGE_FIVE_MIN
+        becomes 'five_min'. Missing files are logged and skipped. With
+        Settings.MULTI_SCALE_ENABLED, every Settings.TEMPLATE_SCALES variant
+        is built up front so the first searches do not pay for resizing.
+
+        Returns:
+            Populated TemplateBank
+        """
+        bank = cls()
+        for attr in dir(Settings):
+            if not attr.startswith("IMAGE_"):
+                continue
+            name = attr[len("IMAGE_"):].lower()
+            try:
+                bank.load(getattr(Settings, attr), name)
+            except FileNotFoundError as e:
+                logger.warning(f"Skipping template '{name}': {e}")
+
+        logger.info(f"Loaded {len(bank)} templates")
+        if Settings.MULTI_SCALE_ENABLED:
+            bank.build_scales(Settings.TEMPLATE_SCALES)
+        return bank
+
+    def build_scales(self, scales: Iterable[float]):
+        """
+        Precompute rescaled variants of every registered template.
+
+        Args:
+            scales: Scale factors to build (relative to the image files)
+        """
+        scales = tuple(scales)
+        for template in self:
+            for scale in scales:
+                template.scaled(scale)
+        logger.debug(f"Built {len(scales)} scales for {len(self)} templates")
+
+    def load(self, path: str, name: Optional[str] = None) -> Template:
+        """
+        Load a template from disk and register it.
+
+        Args:
+            path: Path to the image file
+            name: Short name of the template (defaults to the file stem)
+
+        Returns:
+            Loaded Template
+        """
+        template = Template.from_file(path, name)
+        self._by_name[template.name] = template
+        self._by_path[str(path)] = template
+        logger.debug(f"Loaded template {template} from '{path}'")
+        return template
+
+    def get(self, key: str) -> Optional[Template]:
+        """
+        Get a registered template by name or path.
+
+        Args:
+            key: Template name or image file path
+
+        Returns:
+            Template or None if not registered
+        """
+        return self._by_name.get(key) or self._by_path.get(str(key))
+
+    def resolve(self, image: Union[str, Template]) -> Template:
+        """
+        Turn a template, name or file path into a Template.
+
+        Paths that are not registered yet are loaded and kept, so each file
+        is decoded at most once.
+
+        Args:
+            image: Template instance, template name or image file path
+
+        Returns:
+            Matching Template
+        """
+        if isinstance(image, Template):
+            return image
+
+        template = self.get(image)
+        if template is None:
+            template = self.load(image)
+        return template
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __iter__(self) -> Iterator[Template]:
+        return iter(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
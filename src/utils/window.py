@@ -1,13 +1,14 @@
 """Window management utilities."""
 
 import time
-from typing import Optional
-
-import pygetwindow as gw
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from config.settings import Settings
 from src.logger import get_logger
 
+if TYPE_CHECKING:
+    import pygetwindow
+
 
 logger = get_logger(__name__)
 
@@ -15,17 +16,23 @@ logger = get_logger(__name__)
 class WindowManager:
     """Manages game window operations."""
 
-    def __init__(self, window_title: str = None):
+    def __init__(self, window_title: str = None, handle: Optional[int] = None):
         """
         Initialize the window manager.
 
         Args:
             window_title: Title of the game window to manage
+            handle: Native window handle, to tell apart several windows
+                with the same title
         """
         self.window_title = window_title or Settings.GAME_WINDOW_TITLE
+        self.handle = handle
+        self.name = self.window_title if handle is None else f"{self.window_title} [{handle}]"
         self._window = None
+        self._rect: Optional[Tuple[int, int, int, int]] = None
+        self._rect_read_at = 0.0
 
-    def get_window(self, retry: int = 3) -> Optional[gw.Win32Window]:
+    def get_window(self, retry: int = 3) -> Optional['pygetwindow.Win32Window']:
         """
         Get the game window.
 
@@ -35,15 +42,20 @@ class WindowManager:
         Returns:
             Game window object or None if not found
         """
+        import pygetwindow as gw
+
         for attempt in range(retry):
             try:
                 windows = gw.getWindowsWithTitle(self.window_title)
+                if self.handle is not None:
+                    windows = [window for window in windows if getattr(window, '_hWnd', None) == self.handle]
                 if windows:
                     self._window = windows[0]
-                    logger.info(f"Found game window: {self.window_title}")
+                    self.invalidate()
+                    logger.info(f"Found game window: {self.name}")
                     return self._window
                 else:
-                    logger.warning(f"Window '{self.window_title}' not found (attempt {attempt + 1}/{retry})")
+                    logger.warning(f"Window '{self.name}' not found (attempt {attempt + 1}/{retry})")
                     if attempt < retry - 1:
                         time.sleep(Settings.DELAY_SHORT)
             except Exception as e:
@@ -51,9 +63,31 @@ class WindowManager:
                 if attempt < retry - 1:
                     time.sleep(Settings.DELAY_SHORT)
 
-        logger.error(f"Could not find window '{self.window_title}' after {retry} attempts")
+        logger.error(f"Could not find window '{self.name}' after {retry} attempts")
         return None
 
+    @classmethod
+    def for_all_windows(cls, window_title: str = None) -> List['WindowManager']:
+        """
+        Create one manager per open window with the given title.
+
+        Args:
+            window_title: Window title to look for (defaults to Settings)
+
+        Returns:
+            List of WindowManagers, one per matching window (by handle)
+        """
+        import pygetwindow as gw
+
+        window_title = window_title or Settings.GAME_WINDOW_TITLE
+        managers = []
+        for window in gw.getWindowsWithTitle(window_title):
+            manager = cls(window_title, getattr(window, '_hWnd', None))
+            manager._window = window
+            managers.append(manager)
+        logger.info(f"Found {len(managers)} windows titled '{window_title}'")
+        return managers
+
     def activate_window(self) -> bool:
         """
         Bring the game window to the foreground.
@@ -72,6 +106,7 @@ class WindowManager:
             self._window.activate()
             logger.debug("Window activated successfully")
             time.sleep(0.5)  # Give window time to activate
+            self.invalidate()  # Activation may restore or move the window
             return True
         except Exception as e:
             logger.error(f"Failed to activate window: {e}")
@@ -85,6 +120,7 @@ class WindowManager:
             True if window is active, False otherwise
         """
         try:
+            import pygetwindow as gw
             active_window = gw.getActiveWindow()
             if active_window and self.window_title in active_window.title:
                 return True
@@ -100,6 +136,7 @@ class WindowManager:
             List of window titles
         """
         try:
+            import pygetwindow as gw
             return gw.getAllTitles()
         except Exception as e:
             logger.error(f"Error getting window titles: {e}")
@@ -111,3 +148,54 @@ class WindowManager:
         if not self._window:
             self._window = self.get_window()
         return self._window
+
+    def invalidate(self):
+        """Forget the cached window rect so the next access re-reads it."""
+        self._rect = None
+
+    @property
+    def rect(self) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Get the window rect, re-read at most every Settings.WINDOW_RECT_TTL seconds.
+
+        Returns:
+            Window rect (x, y, width, height) in screen coordinates, or None
+            if the window is not found or minimized
+        """
+        if self._rect is not None and time.monotonic() - self._rect_read_at < Settings.WINDOW_RECT_TTL:
+            return self._rect
+
+        window = self.window
+        if not window:
+            return None
+        try:
+            rect = (window.left, window.top, window.width, window.height)
+        except Exception as e:
+            logger.error(f"Error reading window geometry: {e}")
+            self._window = None
+            self._rect = None
+            return None
+
+        if rect[2] <= 0 or rect[3] <= 0:
+            logger.debug("Window has no visible area (minimized?)")
+            return None
+
+        self._rect = rect
+        self._rect_read_at = time.monotonic()
+        return self._rect
+
+    def to_screen(self, x: int, y: int) -> Tuple[int, int]:
+        """
+        Convert a window-relative point to screen coordinates.
+
+        Args:
+            x: X offset from the window's left edge
+            y: Y offset from the window's top edge
+
+        Returns:
+            Tuple of (x, y) screen coordinates (unchanged if no window)
+        """
+        rect = self.rect
+        if rect is None:
+            return x, y
+        return rect[0] + x, rect[1] + y